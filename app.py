@@ -52,13 +52,18 @@
 
 # app.py (Recommended)
 from flask import Flask
+from werkzeug.middleware.proxy_fix import ProxyFix
 import webbrowser
 import threading
 import time
 import os
 from config import Config
-from models.data_loader import EnhancedDataLoader
+from models.dataset_registry import DatasetRegistry
 from routes.main_routes import MainRoutes
+from routes.json_provider import FastJSONProvider
+from routes.compression import ResponseCompressor
+from routes.profiler import RequestProfiler
+from services.service_container import ServiceContainer
 
 def open_browser():
     """Open browser after delay, only in main process"""
@@ -74,15 +79,49 @@ def open_browser():
 def create_app():
     app = Flask(__name__)
     app.config.from_object(Config)
+    if app.config['PROXY_FIX_X_FOR']:
+        # remote_addr becomes the client address the trusted proxies forwarded
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=app.config['PROXY_FIX_X_FOR'])
+    # numpy/pandas values are serialized directly, no conversion pass needed before jsonify
+    app.json = FastJSONProvider(app)
     
-    # Initialize data loader
-    data_loader = EnhancedDataLoader()
+    # Initialize the dataset registry; datasets load on first access
+    datasets = DatasetRegistry()
+    app.extensions['datasets'] = datasets
+    
+    # One instance of each service per dataset version, shared across requests
+    services = ServiceContainer.with_defaults()
+    app.extensions['services'] = services
     
     # Setup routes
-    main_routes = MainRoutes(app, data_loader)
+    main_routes = MainRoutes(app, datasets, services)
+    
+    # gzip/brotli for large dynamic responses, precompressed copies for static files
+    ResponseCompressor(app)
+    
+    # Opt-in cProfile/sampling profiles of single requests, listed at /profiles
+    if app.config['PROFILING_ENABLED']:
+        app.extensions['profiler'] = RequestProfiler(app)
+    
+    # Load the default dataset and its precomputed structures up front
+    app.extensions['warmed_up'] = False
+    warm_up(app)
     
     return app
 
+def warm_up(app):
+    """Build everything the first requests would otherwise build; /ready passes once this is done"""
+    dataset = app.extensions['datasets'].get(app.config['DEFAULT_DATASET'])
+    snapshot = dataset.loader.get_snapshot()
+    snapshot.get_store()
+    snapshot.memory_bytes()
+    # Models, leaderboard tables and indexes of every service, not just the data
+    app.extensions['services'].prebuild(dataset)
+    report_cache = dataset.extensions.get('report_cache')
+    if report_cache is not None:
+        report_cache.wait()
+    app.extensions['warmed_up'] = True
+
 if __name__ == "__main__":
     app = create_app()
     
@@ -4,5 +4,55 @@ import os
 class Config:
     BASE_DIR = os.path.dirname(os.path.abspath(__file__))
     DATA_PATH = os.path.join(BASE_DIR, "data", "enhanced_boxing_data.csv")
+    MODEL_DIR = os.path.join(BASE_DIR, "model_cache")
     SECRET_KEY = 'your-secret-key-here'
-    DEBUG = True
\ No newline at end of file
+    DEBUG = True
+    REPORT_CACHE_WORKERS = 4
+    TOURNAMENT_MAX_SIMULATIONS = 1000000
+    TOURNAMENT_MAX_WORKERS = 4
+    DATA_WATCH_ENABLED = True
+    DATA_WATCH_INTERVAL = 2.0
+    RESULTS_LOG_PATH = os.path.join(BASE_DIR, "data", "results_log.jsonl")
+    BOUTS_DIR = os.path.join(BASE_DIR, "data", "bouts")
+    # 'pandas' keeps filtering in memory; 'sqlite' pushes filters and gym/boxer aggregations down to SQLite
+    STORAGE_BACKEND = 'pandas'
+    SQLITE_DIR = os.path.join(BASE_DIR, "sqlite_cache")
+    SQLITE_POOL_SIZE = 4
+    # Extra datasets by name; the default one uses DATA_PATH and the paths above
+    DATASETS = {}
+    DEFAULT_DATASET = 'default'
+    DATASET_CACHE_SIZE = 4
+    DATASET_CACHE_MAX_BYTES = 512 * 1024 * 1024
+    CSV_CHUNK_SIZE = 50000
+    # Workers map the published frame of the current data version instead of each parsing the CSV
+    SHARED_DATA_ENABLED = False
+    SHARED_DATA_DIR = os.path.join(BASE_DIR, "shared_cache")
+    # serve.py: preloaded master forking threaded workers
+    SERVE_HOST = '127.0.0.1'
+    SERVE_PORT = 5000
+    SERVE_WORKERS = 4
+    SERVE_BACKLOG = 2048
+    SERVE_GRACEFUL_TIMEOUT = 30
+    SERVE_READY_TIMEOUT = 60
+    # Identical concurrent dashboard/analysis requests share one computation
+    COALESCE_REQUESTS = True
+    # Rows encoded per chunk of a streamed /export_csv response
+    EXPORT_CHUNK_ROWS = 10000
+    # Encoded JSON responses kept by ETag (route, params, data version); 0 keeps the ETags and 304s only
+    RESPONSE_CACHE_MAX_BYTES = 32 * 1024 * 1024
+    # Dynamic responses at least this large are gzip/brotli encoded when the client accepts it
+    COMPRESS_MIN_SIZE = 1024
+    COMPRESS_GZIP_LEVEL = 6
+    COMPRESS_BROTLI_QUALITY = 5
+    # Reverse proxies in front of the app whose X-Forwarded-For is trusted (werkzeug ProxyFix); 0 trusts none
+    PROXY_FIX_X_FOR = 0
+    # Per-stage latency histograms and cache counters at /metrics; when off, spans are shared no-ops
+    METRICS_ENABLED = True
+    # Per-request profiling: ?profile=1|sample or the header below, only from the allowed addresses
+    PROFILING_ENABLED = False
+    PROFILE_HEADER = 'X-Profile'
+    # Matched against the client address; behind a reverse proxy set PROXY_FIX_X_FOR, or this sees the proxy
+    PROFILE_ALLOWED_ADDRESSES = ['127.0.0.1', '::1']
+    PROFILE_DIR = os.path.join(BASE_DIR, "profiles")
+    PROFILE_MAX_FILES = 50
+    PROFILE_SAMPLE_INTERVAL = 0.005
\ No newline at end of file
@@ -0,0 +1,123 @@
+# models/anomaly_detector.py
+import numpy as np
+import pandas as pd
+
+class AnomalyDetector:
+    """Flag underperforming boxers and gyms with robust z-scores against their peers"""
+    
+    # 0.6745 rescales the MAD so the score is comparable to a standard z-score
+    MAD_SCALE = 0.6745
+    Z_THRESHOLD = -1.5
+    MIN_PEER_GROUP = 5
+    # Floor on the MAD so tightly clustered peer groups do not flag tiny dips
+    MIN_MAD = 0.05
+    
+    def __init__(self, data):
+        self.data = data
+        self.boxer_scores = pd.DataFrame()
+        self.gym_scores = pd.DataFrame()
+        
+        if data.empty:
+            return
+        
+        self.boxer_scores = self._score_boxers()
+        self.gym_scores = self._score_gyms()
+    
+    @classmethod
+    def _robust_z(cls, values, groups):
+        """Robust (median/MAD) z-score of each value within its group"""
+        grouped = values.groupby(groups)
+        median = grouped.transform('median')
+        mad = (values - median).abs().groupby(groups).transform('median')
+        size = grouped.transform('size')
+        z = cls.MAD_SCALE * (values - median) / mad.clip(lower=cls.MIN_MAD)
+        return z, size
+    
+    def _score_boxers(self):
+        """One pass over the boxer rollup, scored within weight class and location"""
+        boxers = self.data.groupby('Boxer_Name', sort=False).agg(
+            gym=('Gym', 'first'),
+            location=('Location', 'first'),
+            gender=('Gender', 'first'),
+            weight_class=('Weight_Class', 'first'),
+            wins=('Wins', 'sum'),
+            losses=('Losses', 'sum')
+        )
+        boxers['total_fights'] = boxers['wins'] + boxers['losses']
+        boxers['win_ratio'] = (boxers['wins'] / boxers['total_fights'].where(boxers['total_fights'] > 0)).fillna(0)
+        
+        local_z, local_size = self._robust_z(boxers['win_ratio'], [boxers['weight_class'], boxers['location']])
+        class_z, _ = self._robust_z(boxers['win_ratio'], boxers['weight_class'])
+        
+        # Small (weight class, location) groups fall back to the whole weight class as peers
+        use_local = local_size >= self.MIN_PEER_GROUP
+        boxers['z_score'] = np.where(use_local, local_z, class_z)
+        boxers['peer_group'] = np.where(
+            use_local, boxers['weight_class'] + ' / ' + boxers['location'], boxers['weight_class']
+        )
+        boxers['is_underperforming'] = boxers['z_score'] <= self.Z_THRESHOLD
+        return boxers.sort_values('z_score')
+    
+    def _score_gyms(self):
+        """One pass over the gym rollup, scored against the other gyms in the location"""
+        gyms = self.data.groupby(['Location', 'Gym'], sort=False).agg(
+            wins=('Wins', 'sum'),
+            losses=('Losses', 'sum'),
+            total_boxers=('Boxer_Name', 'nunique')
+        ).reset_index()
+        gyms['total_fights'] = gyms['wins'] + gyms['losses']
+        gyms['win_ratio'] = (gyms['wins'] / gyms['total_fights'].where(gyms['total_fights'] > 0)).fillna(0)
+        
+        gyms['z_score'], _ = self._robust_z(gyms['win_ratio'], gyms['Location'])
+        gyms['is_underperforming'] = gyms['z_score'] <= self.Z_THRESHOLD
+        return gyms.sort_values('z_score')
+    
+    def detect_underperforming_boxers(self):
+        """Boxers whose win ratio is well below their peer group, worst first"""
+        if self.boxer_scores.empty:
+            return []
+        
+        flagged = self.boxer_scores[self.boxer_scores['is_underperforming']]
+        return [{
+            'boxer_name': boxer_name,
+            'gym': row.gym,
+            'location': row.location,
+            'gender': row.gender,
+            'weight_class': row.weight_class,
+            'win_ratio': row.win_ratio,
+            'total_fights': int(row.total_fights),
+            'z_score': row.z_score,
+            'peer_group': row.peer_group
+        } for boxer_name, row in zip(flagged.index, flagged.itertuples(index=False))]
+    
+    def detect_underperforming_gyms(self):
+        """Gyms whose win ratio is well below the other gyms in their location, worst first"""
+        if self.gym_scores.empty:
+            return []
+        
+        flagged = self.gym_scores[self.gym_scores['is_underperforming']]
+        return [{
+            'gym': row.Gym,
+            'location': row.Location,
+            'win_ratio': row.win_ratio,
+            'total_fights': int(row.total_fights),
+            'total_boxers': int(row.total_boxers),
+            'z_score': row.z_score
+        } for row in flagged.itertuples(index=False)]
+    
+    def get_insights(self):
+        """Summary of the anomaly scores across the dataset"""
+        if self.boxer_scores.empty:
+            return {}
+        
+        flagged_boxers = self.boxer_scores[self.boxer_scores['is_underperforming']]
+        flagged_gyms = self.gym_scores[self.gym_scores['is_underperforming']]
+        
+        return {
+            'total_boxers_analyzed': len(self.boxer_scores),
+            'total_gyms_analyzed': len(self.gym_scores),
+            'underperforming_boxer_count': len(flagged_boxers),
+            'underperforming_gym_count': len(flagged_gyms),
+            'underperforming_boxers_by_location': flagged_boxers['location'].value_counts().to_dict(),
+            'underperforming_boxers_by_weight_class': flagged_boxers['weight_class'].value_counts().to_dict()
+        }
@@ -0,0 +1,160 @@
+# models/bout_store.py
+import fcntl
+import glob
+import os
+import threading
+from contextlib import contextmanager
+import numpy as np
+import pandas as pd
+
+class BoutStore:
+    """Per-bout results stored column by column in compressed .npz segments, one segment per appended batch"""
+    
+    COLUMNS = ['Date', 'Boxer_Name', 'Opponent', 'Result', 'Venue']
+    # String columns are dictionary-encoded on disk: sorted distinct values plus int32 codes
+    TEXT_COLUMNS = ['Boxer_Name', 'Opponent', 'Venue']
+    RESULT_CODES = {'win': 1, 'w': 1, 'loss': 0, 'l': 0}
+    
+    def __init__(self, directory):
+        self.directory = directory
+        self._lock = threading.Lock()
+    
+    @classmethod
+    def empty(cls):
+        return pd.DataFrame({
+            'Date': pd.Series(dtype='datetime64[ns]'),
+            'Boxer_Name': pd.Series(dtype=object),
+            'Opponent': pd.Series(dtype=object),
+            'Result': pd.Series(dtype='int8'),
+            'Venue': pd.Series(dtype=object)
+        })
+    
+    @classmethod
+    def normalize(cls, records):
+        """Validate bout records (one object or a list) into a frame of the store's columns"""
+        if isinstance(records, dict):
+            records = [records]
+        if not isinstance(records, list) or not records:
+            raise ValueError("Provide a bout object or a non-empty list of bouts")
+        if not all(isinstance(record, dict) for record in records):
+            raise ValueError("Every bout must be an object")
+        
+        bouts = pd.DataFrame.from_records(records)
+        for column in ['Date', 'Boxer_Name', 'Result']:
+            if column not in bouts or bouts[column].isna().any():
+                raise ValueError("Every bout needs Date, Boxer_Name and Result")
+        
+        dates = pd.to_datetime(bouts['Date'], errors='coerce')
+        if dates.isna().any():
+            raise ValueError("Date must be an ISO date")
+        results = bouts['Result'].astype(str).str.lower().map(cls.RESULT_CODES)
+        if results.isna().any():
+            raise ValueError("Result must be 'win' or 'loss'")
+        
+        normalized = pd.DataFrame({
+            'Date': dates.dt.normalize(),
+            'Boxer_Name': bouts['Boxer_Name'].astype(str),
+            'Opponent': bouts['Opponent'].fillna('').astype(str) if 'Opponent' in bouts else '',
+            'Result': results.astype('int8'),
+            'Venue': bouts['Venue'].fillna('').astype(str) if 'Venue' in bouts else ''
+        })
+        return normalized[cls.COLUMNS]
+    
+    @staticmethod
+    def aggregate(bouts):
+        """Boxer-year Wins/Losses rows, the shape the boxer-year frame is maintained from"""
+        counts = pd.DataFrame({
+            'Boxer_Name': bouts['Boxer_Name'],
+            'Year': bouts['Date'].dt.year.astype('int64'),
+            'Wins': (bouts['Result'] == 1).astype('int64'),
+            'Losses': (bouts['Result'] == 0).astype('int64')
+        })
+        return counts.groupby(['Boxer_Name', 'Year'], sort=False, as_index=False).sum()
+    
+    @contextmanager
+    def locked(self):
+        """Exclusive across worker processes, so segment numbers are never handed out twice"""
+        os.makedirs(self.directory, exist_ok=True)
+        with open(os.path.join(self.directory, '.lock'), 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+    
+    def append(self, bouts):
+        """Write a batch as a new segment; the rename makes it visible to readers all at once. Returns the segment count"""
+        if bouts.empty:
+            return self.segment_count()
+        
+        arrays = {
+            'Date': bouts['Date'].to_numpy(dtype='datetime64[D]'),
+            'Result': bouts['Result'].to_numpy(dtype='int8')
+        }
+        for column in self.TEXT_COLUMNS:
+            values, codes = np.unique(bouts[column].to_numpy(dtype=str), return_inverse=True)
+            arrays[f'{column}_values'] = values
+            arrays[f'{column}_codes'] = codes.astype('int32')
+        
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            count = len(self._segments()) + 1
+            path = os.path.join(self.directory, f"segment-{count:06d}.npz")
+            temp_path = path + '.tmp'
+            with open(temp_path, 'wb') as f:
+                np.savez_compressed(f, **arrays)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, path)
+            return count
+    
+    def read(self, start=0):
+        """Bouts of the segments after the first `start`, oldest first, and the segment count they end at"""
+        with self._lock:
+            segments = self._segments()[start:]
+        
+        frames = []
+        for path in segments:
+            with np.load(path, allow_pickle=False) as arrays:
+                frame = {
+                    'Date': arrays['Date'].astype('datetime64[ns]'),
+                    'Result': arrays['Result']
+                }
+                for column in self.TEXT_COLUMNS:
+                    frame[column] = arrays[f'{column}_values'][arrays[f'{column}_codes']].astype(object)
+            frames.append(pd.DataFrame(frame)[self.COLUMNS])
+        
+        end = start + len(segments)
+        if not frames:
+            return self.empty(), end
+        return pd.concat(frames, ignore_index=True), end
+    
+    def segment_count(self):
+        return len(self._segments())
+    
+    def _segments(self):
+        return sorted(glob.glob(os.path.join(self.directory, 'segment-*.npz')))
+    
+    @staticmethod
+    def opponent_summary(bouts, boxer_name):
+        """A boxer's bouts and their win/loss record against each opponent"""
+        own = bouts[bouts['Boxer_Name'] == boxer_name].sort_values('Date', kind='stable')
+        records = own.groupby('Opponent', sort=False)['Result'].agg(wins='sum', bouts='size')
+        records['losses'] = records['bouts'] - records['wins']
+        
+        return {
+            'boxer_name': boxer_name,
+            'bouts': [
+                {
+                    'date': bout.Date.strftime('%Y-%m-%d'),
+                    'opponent': bout.Opponent,
+                    'result': 'win' if bout.Result == 1 else 'loss',
+                    'venue': bout.Venue
+                }
+                for bout in own.itertuples(index=False)
+            ],
+            'opponents': [
+                {'opponent': opponent, 'wins': int(row.wins), 'losses': int(row.losses)}
+                for opponent, row in records.iterrows()
+            ]
+        }
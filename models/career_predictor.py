@@ -0,0 +1,208 @@
+# models/career_predictor.py
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import SGDRegressor
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+from models.model_registry import ModelRegistry
+
+class CareerModelState:
+    """A model with the prediction tables built from it; never mutated after it is built"""
+    
+    def __init__(self, model=None, feature_columns=None, latest_features=None, predictions=None, data_hash=None):
+        self.model = model
+        self.feature_columns = feature_columns or []
+        self.latest_features = latest_features if latest_features is not None else pd.DataFrame()
+        self.predictions = predictions if predictions is not None else pd.DataFrame()
+        self.data_hash = data_hash
+
+class CareerPredictor:
+    """Career trajectory predictions for every boxer from one model trained per data version"""
+    
+    MODEL_NAME = "career_predictor"
+    HORIZON = 3
+    SUCCESS_WIN_RATIO = 0.7
+    NUMERIC_FEATURES = ['Age', 'Total_Fights', 'Years_Active', 'Prev_Win_Ratio', 'Gym_Win_Ratio']
+    
+    def __init__(self, data, registry=None):
+        self.data = data
+        self.registry = registry or ModelRegistry()
+        # Replaced as a whole when a retrained model arrives; read it once per call
+        self.state = CareerModelState()
+        
+        if data.empty:
+            return
+        
+        bundle, data_hash = self.registry.get(
+            self.MODEL_NAME, data, self._fit, self._partial_fit, on_retrained=self._apply_model
+        )
+        self._apply_model(bundle, data_hash)
+    
+    def _build_features(self, data):
+        """One feature row per boxer-year"""
+        frame = data.copy()
+        frame['Row_Position'] = np.arange(len(frame))
+        frame = frame.sort_values(['Boxer_Name', 'Year'])
+        by_boxer = frame.groupby('Boxer_Name', sort=False)
+        
+        frame['Years_Active'] = by_boxer.cumcount() + 1
+        frame['Prev_Win_Ratio'] = by_boxer['Win_Ratio'].shift(1).fillna(frame['Win_Ratio'].mean())
+        
+        # Leave-one-out gym strength, so a boxer's own record does not leak into the feature
+        gym_wins = frame.groupby(['Location', 'Gym'])['Wins'].transform('sum') - frame['Wins']
+        gym_fights = frame.groupby(['Location', 'Gym'])['Total_Fights'].transform('sum') - frame['Total_Fights']
+        frame['Gym_Win_Ratio'] = (gym_wins / gym_fights.where(gym_fights > 0)).fillna(frame['Win_Ratio'].mean())
+        
+        frame['Is_Female'] = (frame['Gender'] == 'Female').astype(float)
+        weight_dummies = pd.get_dummies(frame['Weight_Class'], prefix='Weight', dtype=float)
+        return pd.concat([frame, weight_dummies], axis=1)
+    
+    @staticmethod
+    def _complete_rows(features, feature_columns):
+        """Rows with every value the model uses; blank CSV cells leave NaN it cannot take"""
+        needed = [column for column in feature_columns if column in features] + ['Win_Ratio', 'Year']
+        return features.dropna(subset=needed)
+    
+    @staticmethod
+    def _feature_matrix(features, feature_columns):
+        return features.reindex(columns=feature_columns, fill_value=0.0).to_numpy(dtype=float)
+    
+    def _fit(self, data):
+        """Full training run on every boxer-year row"""
+        features = self._complete_rows(self._build_features(data), self.NUMERIC_FEATURES)
+        feature_columns = self.NUMERIC_FEATURES + ['Is_Female'] + sorted(
+            column for column in features.columns if column.startswith('Weight_') and column != 'Weight_Class'
+        )
+        pipeline = Pipeline([
+            ('scaler', StandardScaler()),
+            ('regressor', SGDRegressor(alpha=1e-3, max_iter=1000, tol=1e-4, random_state=0))
+        ])
+        pipeline.fit(self._feature_matrix(features, feature_columns), features['Win_Ratio'].to_numpy())
+        return {'pipeline': pipeline, 'feature_columns': feature_columns}
+    
+    def _partial_fit(self, bundle, data, first_new_row):
+        """Update the regressor with the appended boxer-year rows only, keeping the fitted scaling"""
+        features = self._build_features(data)
+        appended = self._complete_rows(features[features['Row_Position'] >= first_new_row], bundle['feature_columns'])
+        if not appended.empty:
+            pipeline = bundle['pipeline']
+            scaled = pipeline.named_steps['scaler'].transform(
+                self._feature_matrix(appended, bundle['feature_columns'])
+            )
+            pipeline.named_steps['regressor'].partial_fit(scaled, appended['Win_Ratio'].to_numpy())
+        return bundle
+    
+    def _apply_model(self, bundle, data_hash):
+        """Rebuild the prediction tables from a model, then swap them in together with a single assignment"""
+        features = self._build_features(self.data)
+        latest, predictions = self._build_prediction_table(features, bundle)
+        self.state = CareerModelState(bundle['pipeline'], bundle['feature_columns'], latest, predictions, data_hash)
+    
+    def _build_prediction_table(self, features, bundle):
+        """Roll every boxer forward HORIZON seasons with one batched predict per season"""
+        latest = features.groupby('Boxer_Name', sort=False).tail(1).set_index('Boxer_Name')
+        latest = self._complete_rows(latest, bundle['feature_columns'])
+        pipeline = bundle['pipeline']
+        
+        step = latest.copy()
+        step['Prev_Win_Ratio'] = latest['Win_Ratio']
+        predicted = {}
+        for offset in range(1, self.HORIZON + 1):
+            step['Age'] = latest['Age'] + offset
+            step['Years_Active'] = latest['Years_Active'] + offset
+            ratios = np.clip(pipeline.predict(self._feature_matrix(step, bundle['feature_columns'])), 0.0, 1.0)
+            predicted[offset] = ratios
+            step['Prev_Win_Ratio'] = ratios
+        
+        table = latest[['Gym', 'Location', 'Gender', 'Weight_Class', 'Age', 'Year', 'Win_Ratio']].copy()
+        for offset, ratios in predicted.items():
+            table[f'Predicted_{offset}'] = ratios
+        return latest, table
+    
+    def predict_career_trajectory(self, boxer_name):
+        """Look up a boxer's projected win ratio for the next HORIZON seasons"""
+        state = self.state
+        if state.predictions.empty or boxer_name not in state.predictions.index:
+            return None
+        
+        row = state.predictions.loc[boxer_name]
+        trajectory = [{
+            'year': int(row['Year']) + offset,
+            'age': int(row['Age']) + offset,
+            'predicted_win_ratio': row[f'Predicted_{offset}']
+        } for offset in range(1, self.HORIZON + 1)]
+        
+        change = trajectory[-1]['predicted_win_ratio'] - row['Win_Ratio']
+        if change > 0.05:
+            trend = "Improving"
+        elif change < -0.05:
+            trend = "Declining"
+        else:
+            trend = "Stable"
+        
+        peak = max(trajectory, key=lambda x: x['predicted_win_ratio'])
+        
+        return {
+            'boxer_name': boxer_name,
+            'gym': row['Gym'],
+            'location': row['Location'],
+            'weight_class': row['Weight_Class'],
+            'current_year': int(row['Year']),
+            'current_win_ratio': row['Win_Ratio'],
+            'trajectory': trajectory,
+            'trend': trend,
+            'peak_year': peak['year'],
+            'peak_win_ratio': peak['predicted_win_ratio'],
+            'data_hash': state.data_hash
+        }
+    
+    def find_similar_successful_boxers(self, boxer_name, top_k=3):
+        """Find successful boxers of the same gender and weight class with the closest profile"""
+        state = self.state
+        if state.latest_features.empty or boxer_name not in state.latest_features.index:
+            return []
+        
+        latest = state.latest_features
+        boxer = latest.loc[boxer_name]
+        candidates = latest[
+            (latest['Gender'] == boxer['Gender']) &
+            (latest['Weight_Class'] == boxer['Weight_Class']) &
+            (latest['Win_Ratio'] >= self.SUCCESS_WIN_RATIO) &
+            (latest.index != boxer_name)
+        ]
+        if candidates.empty:
+            return []
+        
+        scaler = state.model.named_steps['scaler']
+        candidate_matrix = scaler.transform(self._feature_matrix(candidates, state.feature_columns))
+        boxer_vector = scaler.transform(self._feature_matrix(latest.loc[[boxer_name]], state.feature_columns))
+        distances = np.linalg.norm(candidate_matrix - boxer_vector, axis=1)
+        
+        results = []
+        for position in np.argsort(distances)[:top_k]:
+            other = candidates.iloc[position]
+            results.append({
+                'boxer_name': candidates.index[position],
+                'gym': other['Gym'],
+                'location': other['Location'],
+                'win_ratio': other['Win_Ratio'],
+                'total_fights': int(other['Total_Fights']),
+                'similarity': 1.0 / (1.0 + distances[position])
+            })
+        return results
+    
+    def predict_all_boxers_next_year(self):
+        """Projected next-season win ratio for every boxer, best first"""
+        predictions = self.state.predictions
+        if predictions.empty:
+            return []
+        
+        table = predictions.sort_values('Predicted_1', ascending=False)
+        return [{
+            'boxer_name': boxer_name,
+            'gym': row.Gym,
+            'location': row.Location,
+            'current_win_ratio': row.Win_Ratio,
+            'predicted_win_ratio': row.Predicted_1,
+            'year': int(row.Year) + 1
+        } for boxer_name, row in zip(table.index, table.itertuples(index=False))]
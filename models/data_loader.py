@@ -1,68 +1,655 @@
 # models/data_loader.py
 import pandas as pd
+import hashlib
 import os
+import threading
+import numpy as np
+from pandas.api.types import union_categoricals
 from config import Config
+from models.results_log import ResultsLog
+from models.bout_store import BoutStore
+from models.sqlite_store import SQLiteStore
+from models.shared_frame import SharedFrameStore
+
+CSV_COLUMNS = ['Location', 'Gym', 'Boxer_Name', 'Gender', 'Age', 'Weight_Class', 'Wins', 'Losses', 'Year']
+PROFILE_COLUMNS = ['Location', 'Gym', 'Gender', 'Age', 'Weight_Class']
+# Narrowest dtype each integer column is stored in while its values fit and none are blank
+INTEGER_COLUMNS = {'Age': 'int16', 'Wins': 'int16', 'Losses': 'int16', 'Year': 'int16'}
+TEXT_COLUMNS = ['Location', 'Gym', 'Boxer_Name', 'Gender', 'Weight_Class']
+
+class BoxerYearIndex:
+    """Finds a snapshot frame's rows by boxer and year; shared with the snapshots ingests derive from it"""
+    
+    def __init__(self, df):
+        # The loaded rows grouped by boxer (rows of boxer i are _rows[_starts[i]:_starts[i + 1]]), plus
+        # {boxer: {year: position}} for rows ingests appended since. Rows are only ever appended, so
+        # positions never move and one index serves a whole chain of snapshots: each one ignores the
+        # positions at or past its own length (`limit`)
+        self._codes, names = pd.factorize(df['Boxer_Name'].to_numpy())
+        self._boxers = pd.Index(names)
+        self._rows = np.argsort(self._codes, kind='stable')
+        self._starts = np.searchsorted(self._codes[self._rows], np.arange(len(names) + 1))
+        self._years = df['Year'].to_numpy(dtype='float64', na_value=np.nan)
+        self._appended = {}
+    
+    def _loaded_positions(self, names):
+        boxers = self._boxers.get_indexer(names)
+        boxers = boxers[boxers >= 0]
+        if not len(boxers):
+            return np.empty(0, dtype=np.int64)
+        return np.concatenate([self._rows[self._starts[boxer]:self._starts[boxer + 1]] for boxer in boxers])
+    
+    def boxer_positions(self, names, limit):
+        """Positions of every row of `names` below `limit`"""
+        names = pd.unique(np.asarray(names, dtype=object))
+        positions = self._loaded_positions(names).tolist()
+        for name in names:
+            positions += [position for position in self._appended.get(name, {}).values() if position < limit]
+        return positions
+    
+    def positions(self, names, years, limit):
+        """Row of each (name, year) pair below `limit`, or -1; of duplicate boxer-years the last row"""
+        loaded = self._loaded_positions(pd.unique(np.asarray(names, dtype=object)))
+        rows = dict(zip(zip(self._boxers.take(self._codes[loaded]), self._years[loaded]), loaded))
+        for name in names:
+            rows.update(
+                ((name, year), position) for year, position in self._appended.get(name, {}).items() if position < limit
+            )
+        return np.array([rows.get((name, year), -1) for name, year in zip(names, years)], dtype=np.int64)
+    
+    def add(self, names, years, start):
+        """Record rows appended at `start` onwards; called once the snapshot holding them is complete"""
+        for position, (name, year) in enumerate(zip(names, years), start):
+            self._appended.setdefault(name, {})[year] = position
+
+class DataSnapshot:
+    """One loaded, preprocessed version of the dataset; never mutated after it is built"""
+    
+    def __init__(self, df, version=None, source_stat=None, base_version=None, log_position=(0, 0),
+                 gym_rollup=None, bouts=None, store_dir=None, row_index=None, summary=None, data_path=None,
+                 store=None):
+        self.df = df
+        self.version = version
+        self.source_stat = source_stat
+        # Version of the CSV alone, and how far into the results log (byte offset) and the
+        # bout store (segment count) the records applied on top of it reach
+        self.base_version = base_version
+        self.log_position = log_position
+        if summary is None:
+            summary = (
+                sorted(df['Location'].unique()) if not df.empty else [],
+                df['Wins'].max() if not df.empty else 0,
+                df['Total_Fights'].max() if not df.empty else 0
+            )
+        # Passed on by ingests, which know how they change without scanning the frame
+        self.locations, self.max_wins, self.max_fights = summary
+        if gym_rollup is None and not df.empty:
+            gym_rollup = df.groupby(['Location', 'Gym'], sort=False).agg(
+                wins=('Wins', 'sum'),
+                losses=('Losses', 'sum'),
+                boxers=('Boxer_Name', 'nunique')
+            )
+        self.gym_rollup = gym_rollup
+        # Per-bout table; df is its boxer-year view on top of the pre-aggregated CSV rows
+        self.bouts = bouts if bouts is not None else BoutStore.empty()
+        self.store_dir = store_dir or Config.SQLITE_DIR
+        self.data_path = data_path or Config.DATA_PATH
+        # Passed on by the ingest that advanced the parent's store, otherwise opened on first use
+        self._store = store
+        self._store_lock = threading.Lock()
+        self._memory_bytes = None
+        self._row_index = row_index
+    
+    def row_index(self):
+        """BoxerYearIndex of the frame, built on the first ingest; only used under the loader's load lock"""
+        if self._row_index is None:
+            self._row_index = BoxerYearIndex(self.df)
+        return self._row_index
+    
+    def get_store(self):
+        """SQLite store of this snapshot's rows when STORAGE_BACKEND is 'sqlite', opened on first use; None otherwise"""
+        if Config.STORAGE_BACKEND != 'sqlite' or self.df.empty:
+            return None
+        with self._store_lock:
+            if self._store is None:
+                self._store = SQLiteStore.open(
+                    self.store_dir, self.base_version, self.data_path, self.source_stat, self.log_position,
+                    (self.max_wins, self.max_fights), self.df.dtypes, Config.SQLITE_POOL_SIZE
+                )
+            return self._store
+    
+    def after_fork(self):
+        self._store_lock = threading.Lock()
+        if self._store is not None:
+            self._store.after_fork()
+    
+    def memory_bytes(self):
+        """Deep in-memory size of the frame and bout table, computed once"""
+        if self._memory_bytes is None:
+            self._memory_bytes = int(
+                self.df.memory_usage(deep=True).sum() + self.bouts.memory_usage(deep=True).sum()
+            )
+        return self._memory_bytes
+    
+    def get_available_filters(self):
+        """Get all available filter options"""
+        if self.df.empty:
+            return {}
+        
+        return {
+            'locations': ["All Locations"] + self.locations,
+            'gyms': ["All Gyms"] + sorted(self.df['Gym'].unique()),
+            'years': ["All Years"] + sorted(int(year) for year in self.df['Year'].dropna().unique()),
+            'weights': ["All"] + sorted(self.df['Weight_Class'].unique()),
+            'diagram_types': ["Bar Chart", "Pie Chart", "Line Chart", "Scatter Plot"],
+            'genders': ["Both", "Male", "Female"]
+        }
 
 class EnhancedDataLoader:
-    def __init__(self):
-        self.df = None
-        self.locations = []
+    def __init__(self, data_path=None, results_log_path=None, bouts_dir=None, sqlite_dir=None, shared_dir=None):
+        self.data_path = data_path or Config.DATA_PATH
+        self.sqlite_dir = sqlite_dir or Config.SQLITE_DIR
+        self.snapshot = DataSnapshot(pd.DataFrame(), store_dir=self.sqlite_dir, data_path=self.data_path)
+        self._load_listeners = []
+        self._publish_listeners = []
+        self._load_lock = threading.Lock()
+        self.results_log = ResultsLog(results_log_path or Config.RESULTS_LOG_PATH)
+        self.bout_store = BoutStore(bouts_dir or Config.BOUTS_DIR)
+        # Frames published for other worker processes to map instead of parsing the CSV again
+        self.shared_store = None
+        if Config.SHARED_DATA_ENABLED:
+            self.shared_store = SharedFrameStore(shared_dir or Config.SHARED_DATA_DIR)
         self.load_data()
     
+    @property
+    def df(self):
+        return self.snapshot.df
+    
+    @property
+    def locations(self):
+        return self.snapshot.locations
+    
+    @property
+    def version(self):
+        return self.snapshot.version
+    
     def load_data(self):
         """Load and preprocess the enhanced boxing data with locations"""
-        try:
-            if not os.path.exists(Config.DATA_PATH):
-                print(f"Data file not found at: {Config.DATA_PATH}")
-                print(f"Current working directory: {os.getcwd()}")
-                self.df = pd.DataFrame()
-                return
+        with self._load_lock:
+            try:
+                if not os.path.exists(self.data_path):
+                    print(f"Data file not found at: {self.data_path}")
+                    print(f"Current working directory: {os.getcwd()}")
+                    return False
+                
+                source_stat = self.get_source_stat()
+                version = self._compute_version(self.data_path)
+                if version == self.snapshot.base_version:
+                    # Same CSV: only results other workers logged since are missing. Like an
+                    # ingest, this needs no load listeners; caches are keyed on the version
+                    snapshot = self._catch_up(self.snapshot)
+                    if snapshot is self.snapshot:
+                        return False
+                    self._publish(snapshot)
+                    return True
+                
+                results, results_offset = self.results_log.read()
+                bouts, bout_segments = self.bout_store.read()
+                log_position = (results_offset, bout_segments)
+                snapshot = self._attach_shared(version, source_stat, log_position, bouts)
+                if snapshot is None:
+                    snapshot = self._build_snapshot(version, source_stat, results, bouts, log_position)
+                    if self.shared_store is not None and not snapshot.df.empty:
+                        self.shared_store.publish(snapshot.version, snapshot.df, snapshot.gym_rollup)
+                print(f"Enhanced data loaded successfully. Shape: {snapshot.df.shape}")
             
-            self.df = pd.read_csv(Config.DATA_PATH)
-            self._preprocess_data()
-            print(f"Enhanced data loaded successfully. Shape: {self.df.shape}")
+            except Exception as e:
+                # Keep serving the previous snapshot (empty on first load)
+                print(f"Error loading data: {e}")
+                return False
             
-        except Exception as e:
-            print(f"Error loading data: {e}")
-            self.df = pd.DataFrame()
+            # Build the new snapshot completely, then publish it with a single reference swap
+            self._publish(snapshot)
+        
+        self._notify_load_listeners()
+        return True
+    
+    def _build_snapshot(self, version, source_stat, results, bouts, log_position):
+        df = self._read_csv(self.data_path)
+        self._preprocess_data(df)
+        snapshot = DataSnapshot(
+            df, version, source_stat, base_version=version, store_dir=self.sqlite_dir, data_path=self.data_path
+        )
+        if df.empty:
+            return snapshot
+        return self._replay(snapshot, results, bouts, log_position)
+    
+    def _replay(self, snapshot, results, bouts, log_position):
+        """`snapshot` with logged results, then the boxer-year view of stored bouts, applied up to `log_position`"""
+        results_offset, bout_segments = log_position
+        if results:
+            snapshot = self._apply_results(
+                snapshot, pd.DataFrame.from_records(results), (results_offset, snapshot.log_position[1])
+            )
+        if not bouts.empty:
+            batch = self._normalize_results(snapshot, BoutStore.aggregate(bouts).to_dict('records'))
+            snapshot = self._apply_results(snapshot, batch, log_position, bouts)
+        return snapshot
+    
+    def _catch_up(self, snapshot):
+        """`snapshot` with whatever other processes logged after its log position, or itself when nothing was"""
+        results_offset, bout_segments = snapshot.log_position
+        results, results_offset = self.results_log.read(results_offset)
+        bouts, bout_segments = self.bout_store.read(bout_segments)
+        if snapshot.df.empty:
+            return snapshot
+        return self._replay(snapshot, results, bouts, (results_offset, bout_segments))
+    
+    def has_unapplied_records(self):
+        """Whether the results log or bout store grew past the current snapshot, e.g. through another worker"""
+        results_offset, bout_segments = self.snapshot.log_position
+        return self.results_log.size() > results_offset or self.bout_store.segment_count() > bout_segments
+    
+    def catch_up(self):
+        """Apply results and bouts other processes logged since the current snapshot; True if there were any"""
+        with self._load_lock:
+            snapshot = self._catch_up(self.snapshot)
+            if snapshot is self.snapshot:
+                return False
+            self._publish(snapshot)
+            return True
+    
+    def _attach_shared(self, version, source_stat, log_position, bouts):
+        """Snapshot over the frame another process already built and published for this version, if any"""
+        if self.shared_store is None:
+            return None
+        
+        snapshot_version = self._snapshot_version(version, log_position)
+        shared = self.shared_store.attach(snapshot_version)
+        if shared is None:
+            return None
+        df, gym_rollup = shared
+        print(f"Attached shared data version {snapshot_version}")
+        return DataSnapshot(
+            df, snapshot_version, source_stat, version, log_position,
+            gym_rollup, bouts if not bouts.empty else None, self.sqlite_dir, data_path=self.data_path
+        )
+    
+    @staticmethod
+    def _snapshot_version(base_version, log_position):
+        """Version of the CSV with the logged results and bouts up to `log_position` applied"""
+        # A position in the shared logs names exactly which records are applied, so workers
+        # that reached the same one serve the same data under the same version
+        if log_position == (0, 0):
+            return base_version
+        version = f"{base_version}:{log_position[0]}:{log_position[1]}"
+        return hashlib.sha1(version.encode()).hexdigest()[:16]
+    
+    def get_source_stat(self):
+        """(mtime, size) of the data file, or None when it does not exist"""
+        try:
+            stat = os.stat(self.data_path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+    
+    def _read_csv(self, path):
+        """Stream the CSV in chunks with explicit dtypes, keeping only the columns the app uses"""
+        numeric_parts = {column: [] for column in INTEGER_COLUMNS}
+        text_parts = {column: [] for column in TEXT_COLUMNS}
+        # Nullable on read, so one blank cell does not fail the whole load
+        dtypes = {column: 'Int64' for column in INTEGER_COLUMNS}
+        dtypes.update({column: 'category' for column in TEXT_COLUMNS})
+        
+        with pd.read_csv(path, usecols=CSV_COLUMNS, dtype=dtypes, chunksize=Config.CSV_CHUNK_SIZE) as reader:
+            for chunk in reader:
+                for column, dtype in INTEGER_COLUMNS.items():
+                    numeric_parts[column].append(self._fit_integer(chunk[column].array, dtype))
+                for column in TEXT_COLUMNS:
+                    text_parts[column].append(chunk[column].array)
+        
+        if not text_parts[TEXT_COLUMNS[0]]:
+            return pd.DataFrame(columns=CSV_COLUMNS)
+        
+        columns = {}
+        for column in CSV_COLUMNS:
+            if column in INTEGER_COLUMNS:
+                # A chunk with blanks stays nullable (Int16), which makes the whole column nullable
+                # rather than float, so years and counts keep printing and comparing as integers
+                columns[column] = pd.concat(
+                    [pd.Series(part, copy=False) for part in numeric_parts.pop(column)], ignore_index=True
+                )
+            else:
+                # Chunk dictionaries are merged into one; materializing it gives an object column
+                # holding one shared string per distinct value rather than one string per row
+                categorical = union_categoricals(text_parts.pop(column))
+                columns[column] = np.asarray(categorical, dtype=object)
+        return pd.DataFrame(columns)
+    
+    @staticmethod
+    def _fit_integer(values, dtype):
+        """`values` cast to the integer `dtype` (its nullable variant if any are missing) when every value fits"""
+        dtype = pd.api.types.pandas_dtype(dtype)
+        numpy_dtype = np.dtype(getattr(dtype, 'numpy_dtype', dtype))
+        if len(values) == 0 or not np.issubdtype(numpy_dtype, np.integer):
+            return values
+        nullable = numpy_dtype.name.capitalize()
+        if isinstance(values, pd.api.extensions.ExtensionArray):
+            if values.isna().all():
+                return values.astype(nullable)
+            if not values.isna().any():
+                values = values.to_numpy(dtype='int64')
+        limits = np.iinfo(numpy_dtype)
+        if values.min() >= limits.min and values.max() <= limits.max:
+            return values.astype(nullable if isinstance(values, pd.api.extensions.ExtensionArray) else numpy_dtype)
+        return values
+    
+    def _compute_version(self, path):
+        """Content hash of the data file, used to key caches on the dataset version"""
+        digest = hashlib.sha1()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        return digest.hexdigest()[:16]
+    
+    def after_fork(self):
+        """Fresh locks in a forked worker, where a lock held by another parent thread would never be released"""
+        self._load_lock = threading.Lock()
+        self.results_log = ResultsLog(self.results_log.path)
+        self.bout_store = BoutStore(self.bout_store.directory)
+        self.snapshot.after_fork()
     
-    def _preprocess_data(self):
+    def add_load_listener(self, callback):
+        """Register a callback to run after every successful data load"""
+        self._load_listeners.append(callback)
+    
+    def _notify_load_listeners(self):
+        for callback in self._load_listeners:
+            try:
+                callback()
+            except Exception as e:
+                print(f"Error in data load listener: {e}")
+    
+    def add_publish_listener(self, callback):
+        """Register a callback to run whenever a new snapshot is published: loads, ingests and catch-ups"""
+        # Called with the load lock held, so it must only schedule work (read get_snapshot() for the snapshot)
+        self._publish_listeners.append(callback)
+    
+    def _publish(self, snapshot):
+        self.snapshot = snapshot
+        for callback in self._publish_listeners:
+            try:
+                callback()
+            except Exception as e:
+                print(f"Error in snapshot publish listener: {e}")
+    
+    def _preprocess_data(self, df):
         """Preprocess the enhanced data"""
-        if self.df.empty:
+        if df.empty:
             return
-            
-        # Calculate win ratio
-        self.df['Win_Ratio'] = self.df['Wins'] / (self.df['Wins'] + self.df['Losses'] + 1e-8)
+        
+        # Calculate win ratio; a row with a blank count gets NaN rather than failing the load
+        wins = self._float_values(df['Wins'])
+        losses = self._float_values(df['Losses'])
+        df['Win_Ratio'] = wins / (wins + losses + 1e-8)
         
         # Calculate total fights
-        self.df['Total_Fights'] = self.df['Wins'] + self.df['Losses']
+        total_fights = df['Wins'].astype('Int64') + df['Losses'].astype('Int64')
+        df['Total_Fights'] = self._fit_integer(total_fights.array, df['Wins'].dtype)
         
         # Calculate performance score
-        self.df['Performance_Score'] = (
-            self.df['Win_Ratio'] * 0.6 + 
-            (self.df['Wins'] / (self.df['Wins'].max() + 1)) * 0.2 +
-            (self.df['Total_Fights'] / (self.df['Total_Fights'].max() + 1)) * 0.2
+        df['Performance_Score'] = self._performance_score(
+            df['Win_Ratio'].to_numpy(), wins, wins + losses,
+            df['Wins'].max(), df['Total_Fights'].max()
         )
+    
+    @staticmethod
+    def _performance_score(win_ratio, wins, total_fights, max_wins, max_fights):
+        return (
+            win_ratio * 0.6 +
+            (wins / (max_wins + 1)) * 0.2 +
+            (total_fights / (max_fights + 1)) * 0.2
+        )
+    
+    def apply_results(self, records):
+        """Validate fight results, append them to the results log and publish a snapshot with them applied"""
+        with self._load_lock, self.results_log.locked():
+            # Other workers' results first, so this batch lands at the log position it is written to
+            snapshot = self.snapshot = self._catch_up(self.snapshot)
+            if snapshot.df.empty:
+                raise ValueError("No data loaded to apply results to")
+            
+            batch = self._normalize_results(snapshot, records)
+            results_offset, bout_segments = snapshot.log_position
+            results_offset = self.results_log.append(batch.to_dict('records'), results_offset)
+            # Caches are keyed on the version and pick the new snapshot up lazily, so no
+            # load listeners are run for every ingested batch, only publish listeners
+            self._publish(self._apply_results(snapshot, batch, (results_offset, bout_segments)))
+            return self.snapshot, len(batch)
+    
+    def apply_bouts(self, records):
+        """Store per-bout records and fold their boxer-year totals into a new snapshot"""
+        with self._load_lock, self.bout_store.locked():
+            snapshot = self.snapshot = self._catch_up(self.snapshot)
+            if snapshot.df.empty:
+                raise ValueError("No data loaded to apply bouts to")
+            
+            bouts = BoutStore.normalize(records)
+            names = bouts['Boxer_Name'].unique()
+            rows = snapshot.row_index().boxer_positions(names, len(snapshot.df))
+            unknown = sorted(set(names) - set(snapshot.df['Boxer_Name'].iloc[rows]))
+            if unknown:
+                raise ValueError(f"Unknown boxers, add them through /api/results first: {', '.join(unknown)}")
+            
+            batch = self._normalize_results(snapshot, BoutStore.aggregate(bouts).to_dict('records'))
+            bout_segments = self.bout_store.append(bouts)
+            log_position = (snapshot.log_position[0], bout_segments)
+            self._publish(self._apply_results(snapshot, batch, log_position, bouts))
+            return self.snapshot, len(bouts)
+    
+    def _normalize_results(self, snapshot, records):
+        """Turn one or many result records into full boxer-year rows, filling the profile from the boxer's latest row"""
+        if isinstance(records, dict):
+            records = [records]
+        if not isinstance(records, list) or not records:
+            raise ValueError("Provide a result object or a non-empty list of results")
+        if not all(isinstance(record, dict) for record in records):
+            raise ValueError("Every result must be an object")
+        
+        batch = pd.DataFrame.from_records(records)
+        if 'Boxer_Name' not in batch or 'Year' not in batch:
+            raise ValueError("Every result needs Boxer_Name and Year")
+        if batch['Boxer_Name'].isna().any() or batch['Year'].isna().any():
+            raise ValueError("Every result needs Boxer_Name and Year")
+        
+        # Only the counts default to 0; Year has to be given
+        for column in ['Wins', 'Losses']:
+            batch[column] = batch[column].fillna(0) if column in batch else 0
+        for column in ['Wins', 'Losses', 'Year']:
+            values = pd.to_numeric(batch[column], errors='coerce')
+            if values.isna().any() or (values < 0).any() or (values % 1 != 0).any():
+                raise ValueError(f"{column} must be a non-negative integer")
+            batch[column] = values.astype('int64')
+        if (batch['Wins'] + batch['Losses'] == 0).any():
+            raise ValueError("Every result needs at least one win or loss")
+        
+        # Profile of each boxer's latest known row, for results that leave it out
+        df = snapshot.df
+        known = df.iloc[snapshot.row_index().boxer_positions(batch['Boxer_Name'].unique(), len(df))]
+        # Rows with a blank Year sort first, so they only count for boxers that have no other row
+        latest = known.sort_values('Year', na_position='first', kind='stable').groupby('Boxer_Name').tail(1)
+        latest = latest.set_index('Boxer_Name')
+        for column in PROFILE_COLUMNS:
+            fallback = batch['Boxer_Name'].map(latest[column])
+            if column in batch:
+                # A new boxer's profile only has to be given on one of their results in the batch
+                given = batch.groupby('Boxer_Name')[column].transform('first')
+                batch[column] = batch[column].fillna(given).fillna(fallback)
+            else:
+                batch[column] = fallback
+        
+        unknown = batch.loc[batch[PROFILE_COLUMNS].isna().any(axis=1), 'Boxer_Name'].unique()
+        if len(unknown):
+            raise ValueError(
+                f"New boxers need {', '.join(PROFILE_COLUMNS)}: {', '.join(map(str, unknown))}"
+            )
+        batch['Age'] = batch['Age'].astype('int64')
         
-        # Extract unique locations and gyms
-        self.locations = sorted(self.df['Location'].unique())
+        return batch[CSV_COLUMNS]
+    
+    def _apply_results(self, snapshot, batch, log_position, bouts=None):
+        """New snapshot with results (or the totals of `bouts`) added; the work grows with the batch, not the frame"""
+        if bouts is None:
+            all_bouts = snapshot.bouts
+        else:
+            all_bouts = pd.concat([snapshot.bouts, bouts], ignore_index=True)
+        batch = batch.groupby(['Boxer_Name', 'Year'], sort=False, as_index=False).agg(
+            {**{column: 'first' for column in PROFILE_COLUMNS}, 'Wins': 'sum', 'Losses': 'sum'}
+        )[CSV_COLUMNS]
+        
+        df = snapshot.df
+        old_rows = len(df)
+        row_index = snapshot.row_index()
+        positions = row_index.positions(batch['Boxer_Name'].tolist(), batch['Year'].tolist(), old_rows)
+        existing = positions >= 0
+        updated_positions = positions[existing]
+        updated = len(updated_positions)
+        
+        # Results for existing boxer-years add to that row and count for its gym
+        for column in ['Location', 'Gym']:
+            batch.loc[existing, column] = df[column].iloc[updated_positions].to_numpy()
+        new_rows = batch.loc[~existing, CSV_COLUMNS].reset_index(drop=True)
+        
+        # Counts and derived columns of the touched rows only: updated rows first, then new ones
+        wins = np.concatenate([
+            self._float_values(df['Wins'].iloc[updated_positions]) + batch.loc[existing, 'Wins'].to_numpy(),
+            new_rows['Wins'].to_numpy(dtype='float64')
+        ])
+        losses = np.concatenate([
+            self._float_values(df['Losses'].iloc[updated_positions]) + batch.loc[existing, 'Losses'].to_numpy(),
+            new_rows['Losses'].to_numpy(dtype='float64')
+        ])
+        total_fights = wins + losses
+        win_ratio = wins / (total_fights + 1e-8)
+        
+        # Performance_Score is normalized by the global maxima; they can only grow because
+        # results never subtract, so the whole column is rescaled only when one of them does
+        max_wins = max(snapshot.max_wins, pd.Series(wins).max())
+        max_fights = max(snapshot.max_fights, pd.Series(total_fights).max())
+        score = self._performance_score(win_ratio, wins, total_fights, max_wins, max_fights)
+        
+        if new_rows.empty:
+            # Shares every column with the parent until one is replaced below
+            merged = df.copy(deep=False)
+        else:
+            new_rows['Total_Fights'] = total_fights[updated:]
+            new_rows['Win_Ratio'] = win_ratio[updated:]
+            new_rows['Performance_Score'] = score[updated:]
+            # Keep the loader's narrow integer dtypes for as long as the values fit
+            for column in list(INTEGER_COLUMNS) + ['Total_Fights']:
+                new_rows[column] = self._fit_like(new_rows[column], df[column].dtype)
+            merged = pd.concat([df, new_rows[df.columns]], ignore_index=True)
+        
+        if updated:
+            for column, values in [('Wins', wins), ('Losses', losses), ('Total_Fights', total_fights),
+                                   ('Win_Ratio', win_ratio), ('Performance_Score', score)]:
+                merged[column] = self._with_rows(merged[column], updated_positions, values[:updated])
+        if max_wins != snapshot.max_wins or max_fights != snapshot.max_fights:
+            merged['Performance_Score'] = self._performance_score(
+                self._float_values(merged['Win_Ratio']), self._float_values(merged['Wins']),
+                self._float_values(merged['Total_Fights']), max_wins, max_fights
+            )
+        
+        locations = snapshot.locations
+        if not new_rows.empty and not new_rows['Location'].isin(locations).all():
+            locations = sorted(set(locations).union(new_rows['Location']))
+        gym_rollup = self._update_gym_rollup(snapshot, batch, new_rows)
+        # The snapshot is complete; only now may the shared index learn about its rows
+        row_index.add(new_rows['Boxer_Name'], new_rows['Year'], old_rows)
+        
+        # The SQLite store (when that backend is on) gets the same touched rows instead of a rewrite
+        store = snapshot.get_store()
+        if store is not None:
+            store = store.advance(
+                log_position, merged.iloc[updated_positions], merged.iloc[old_rows:],
+                (max_wins, max_fights), merged.dtypes
+            )
+        
+        version = self._snapshot_version(snapshot.base_version, log_position)
+        return DataSnapshot(
+            merged, version, snapshot.source_stat, snapshot.base_version, log_position,
+            gym_rollup, all_bouts, snapshot.store_dir, row_index, (locations, max_wins, max_fights),
+            snapshot.data_path, store
+        )
+    
+    @staticmethod
+    def _float_values(series):
+        """`series` as float64 with NaN for missing values, whatever its integer or float dtype"""
+        return series.to_numpy(dtype='float64', na_value=np.nan)
+    
+    @staticmethod
+    def _fit_like(series, dtype):
+        """`series` in the integer `dtype` when its values fit, otherwise unchanged (concat then widens)"""
+        if not pd.api.types.is_integer_dtype(dtype) or series.empty:
+            return series
+        limits = np.iinfo(getattr(dtype, 'numpy_dtype', dtype))
+        if series.min() >= limits.min and series.max() <= limits.max:
+            return series.astype(dtype)
+        return series
+    
+    @staticmethod
+    def _with_rows(column, positions, values):
+        """Copy of `column` with `values` at `positions`, widened first if they do not fit its integer dtype"""
+        dtype = column.dtype
+        if pd.api.types.is_integer_dtype(dtype):
+            limits = np.iinfo(getattr(dtype, 'numpy_dtype', dtype))
+            present = values[~np.isnan(values)]
+            if len(present) and (present.min() < limits.min or present.max() > limits.max):
+                column = column.astype('Int64' if isinstance(dtype, pd.api.extensions.ExtensionDtype) else 'int64')
+        array = column.array.copy()
+        array[positions] = values
+        return pd.Series(array, index=column.index, name=column.name)
+    
+    @staticmethod
+    def _update_gym_rollup(snapshot, batch, new_rows):
+        """Add the batch's wins, losses and newly seen boxers to the per-gym rollup"""
+        delta = batch.groupby(['Location', 'Gym'], sort=False)[['Wins', 'Losses']].sum()
+        rollup = snapshot.gym_rollup
+        added = delta.index[~delta.index.isin(rollup.index)]
+        index = rollup.index.append(added) if len(added) else rollup.index
+        
+        wins = np.append(rollup['wins'].to_numpy(), np.zeros(len(added), dtype='int64'))
+        losses = np.append(rollup['losses'].to_numpy(), np.zeros(len(added), dtype='int64'))
+        boxers = np.append(rollup['boxers'].to_numpy(), np.zeros(len(added), dtype='int64'))
+        positions = index.get_indexer(delta.index)
+        wins[positions] += delta['Wins'].to_numpy()
+        losses[positions] += delta['Losses'].to_numpy()
+        
+        # A new boxer-year only grows the roster if the boxer was not in that gym before
+        if not new_rows.empty:
+            df = snapshot.df
+            rows = snapshot.row_index().boxer_positions(new_rows['Boxer_Name'].unique(), len(df))
+            known = df.iloc[rows][['Location', 'Gym', 'Boxer_Name']]
+            arrivals = new_rows[['Location', 'Gym', 'Boxer_Name']].drop_duplicates()
+            arrivals = arrivals[~pd.MultiIndex.from_frame(arrivals).isin(pd.MultiIndex.from_frame(known))]
+            joined = arrivals.groupby(['Location', 'Gym'], sort=False).size()
+            np.add.at(boxers, index.get_indexer(joined.index), joined.to_numpy())
+        
+        return pd.DataFrame({'wins': wins, 'losses': losses, 'boxers': boxers}, index=index)
+    
+    def get_snapshot(self):
+        """Current snapshot; hold on to it to keep a consistent view across several reads"""
+        return self.snapshot
     
     def get_data(self):
-        return self.df
+        return self.snapshot.df
+    
+    def get_version(self):
+        return self.snapshot.version
     
     def get_available_filters(self):
         """Get all available filter options"""
-        if self.df.empty:
-            return {}
-        
-        return {
-            'locations': ["All Locations"] + self.locations,
-            'gyms': ["All Gyms"] + sorted(self.df['Gym'].unique()),
-            'years': ["All Years"] + sorted(self.df['Year'].unique()),
-            'weights': ["All"] + sorted(self.df['Weight_Class'].unique()),
-            'diagram_types': ["Bar Chart", "Pie Chart", "Line Chart", "Scatter Plot"],
-            'genders': ["Both", "Male", "Female"]
-        }
+        return self.snapshot.get_available_filters()
 
 
 
@@ -0,0 +1,44 @@
+# models/data_watcher.py
+import threading
+
+class DataWatcher:
+    """Poll the data file and the shared results logs, hot-reloading the loader's snapshot when they change"""
+    
+    def __init__(self, data_loader, interval=2.0):
+        self.data_loader = data_loader
+        self.interval = interval
+        self._last_stat = data_loader.get_snapshot().source_stat
+        self._stop_event = threading.Event()
+        self._thread = None
+    
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return self
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="data-watcher", daemon=True)
+        self._thread.start()
+        return self
+    
+    def stop(self):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+    
+    def check(self):
+        """Reload once if the file's (mtime, size) changed since the last check, or catch up on results other workers logged"""
+        current_stat = self.data_loader.get_source_stat()
+        if current_stat is None or current_stat == self._last_stat:
+            if self.data_loader.has_unapplied_records():
+                return self.data_loader.catch_up()
+            return False
+        self._last_stat = current_stat
+        # The new snapshot is built on this thread; requests keep using the old one until the swap
+        return self.data_loader.load_data()
+    
+    def _run(self):
+        while not self._stop_event.wait(self.interval):
+            try:
+                if self.check():
+                    print(f"Data changed, now serving version {self.data_loader.get_version()}")
+            except Exception as e:
+                print(f"Error checking data file: {e}")
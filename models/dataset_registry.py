@@ -0,0 +1,151 @@
+# models/dataset_registry.py
+import os
+import threading
+from collections import OrderedDict
+from config import Config
+from models.data_loader import EnhancedDataLoader
+from models.data_watcher import DataWatcher
+from models.model_registry import ModelRegistry
+
+class Dataset:
+    """A loaded dataset together with everything cached for it; dropped as a whole on eviction"""
+    
+    def __init__(self, name, data_path, results_log_path, bouts_dir, sqlite_dir, model_dir, shared_dir):
+        self.name = name
+        self.loader = EnhancedDataLoader(data_path, results_log_path, bouts_dir, sqlite_dir, shared_dir)
+        self.model_registry = ModelRegistry(model_dir)
+        # Per-version service instances, see ServiceContainer.get
+        self.services = {}
+        self.services_lock = threading.Lock()
+        self.service_build_locks = {}
+        # Objects attached by dataset listeners; closed on eviction if they have close()
+        self.extensions = {}
+        self.watcher = None
+        self.loader.add_load_listener(self.clear_services)
+        
+        if Config.DATA_WATCH_ENABLED:
+            self.watcher = DataWatcher(self.loader, Config.DATA_WATCH_INTERVAL).start()
+    
+    def clear_services(self):
+        with self.services_lock:
+            self.services = {}
+    
+    def memory_bytes(self):
+        return self.loader.get_snapshot().memory_bytes()
+    
+    def after_fork(self):
+        """Recreate locks, thread pools and the watcher thread; only the forking thread survives in the child"""
+        self.services_lock = threading.Lock()
+        self.service_build_locks = {}
+        self.loader.after_fork()
+        self.model_registry.after_fork()
+        for extension in self.extensions.values():
+            if hasattr(extension, 'after_fork'):
+                extension.after_fork()
+        if self.watcher is not None:
+            self.watcher = DataWatcher(self.loader, Config.DATA_WATCH_INTERVAL).start()
+    
+    def close(self):
+        if self.watcher is not None:
+            self.watcher.stop()
+        for extension in self.extensions.values():
+            if hasattr(extension, 'close'):
+                extension.close()
+
+class DatasetRegistry:
+    """Datasets loaded on first access, keeping the most recently used within a count and size budget"""
+    
+    def __init__(self, max_loaded=None, max_bytes=None):
+        self.max_loaded = max_loaded or Config.DATASET_CACHE_SIZE
+        self.max_bytes = max_bytes or Config.DATASET_CACHE_MAX_BYTES
+        self._loaded = OrderedDict()
+        self._open_locks = {}
+        self._open_listeners = []
+        self._lock = threading.Lock()
+    
+    def names(self):
+        return [Config.DEFAULT_DATASET] + [name for name in Config.DATASETS if name != Config.DEFAULT_DATASET]
+    
+    def loaded_names(self):
+        with self._lock:
+            return list(self._loaded)
+    
+    def after_fork(self):
+        """Make the loaded datasets usable in a forked worker process"""
+        self._lock = threading.Lock()
+        self._open_locks = {}
+        for dataset in self._loaded.values():
+            dataset.after_fork()
+    
+    def add_open_listener(self, callback):
+        """Register a callback run with each newly loaded Dataset, to attach per-dataset caches"""
+        self._open_listeners.append(callback)
+    
+    def _paths(self, name):
+        if name == Config.DEFAULT_DATASET:
+            return (
+                Config.DATA_PATH, Config.RESULTS_LOG_PATH, Config.BOUTS_DIR,
+                Config.SQLITE_DIR, Config.MODEL_DIR, Config.SHARED_DATA_DIR
+            )
+        
+        log_dir = os.path.dirname(Config.RESULTS_LOG_PATH)
+        return (
+            Config.DATASETS[name],
+            os.path.join(log_dir, f"results_log_{name}.jsonl"),
+            f"{Config.BOUTS_DIR}_{name}",
+            os.path.join(Config.SQLITE_DIR, name),
+            os.path.join(Config.MODEL_DIR, name),
+            os.path.join(Config.SHARED_DATA_DIR, name)
+        )
+    
+    def peek(self, name=None):
+        """Loaded Dataset for `name`, or None when it is cold; never loads and leaves the LRU order alone"""
+        with self._lock:
+            return self._loaded.get(name or Config.DEFAULT_DATASET)
+    
+    def get(self, name=None):
+        """Loaded Dataset for `name`, loading it now if it is cold; KeyError for unknown names"""
+        name = name or Config.DEFAULT_DATASET
+        with self._lock:
+            dataset = self._loaded.get(name)
+            if dataset is not None:
+                self._loaded.move_to_end(name)
+                return dataset
+            if name != Config.DEFAULT_DATASET and name not in Config.DATASETS:
+                raise KeyError(name)
+            open_lock = self._open_locks.setdefault(name, threading.Lock())
+        
+        # Load outside the registry lock so other datasets stay available meanwhile
+        with open_lock:
+            with self._lock:
+                dataset = self._loaded.get(name)
+                if dataset is not None:
+                    self._loaded.move_to_end(name)
+                    return dataset
+            
+            dataset = Dataset(name, *self._paths(name))
+            for callback in self._open_listeners:
+                callback(dataset)
+            
+            with self._lock:
+                self._loaded[name] = dataset
+                evicted = self._evict(keep=name)
+        
+        for old_dataset in evicted:
+            print(f"Evicting dataset '{old_dataset.name}'")
+            old_dataset.close()
+        return dataset
+    
+    def _evict(self, keep):
+        """Drop least recently used datasets until within budget, never the one just requested"""
+        evicted = []
+        sizes = {name: dataset.memory_bytes() for name, dataset in self._loaded.items()}
+        total = sum(sizes.values())
+        for name in list(self._loaded):
+            if len(self._loaded) <= self.max_loaded and total <= self.max_bytes:
+                break
+            if name == keep:
+                continue
+            evicted.append(self._loaded.pop(name))
+            total -= sizes[name]
+        return evicted
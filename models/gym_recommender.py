@@ -2,15 +2,63 @@
 import pandas as pd
 
 class GymRecommender:
-    def __init__(self, data):
+    def __init__(self, data, store=None):
         self.data = data
+        # Optional SQLiteStore holding the same rows; per-gym totals are then aggregated in SQL
+        self.store = store
+        self._location_rows = None
     
     def recommend_gyms_by_location(self, location, gender="Both", weight_class="All", limit=4):
         """Recommend best gyms in a specific location"""
         if self.data.empty:
             return []
         
-        filtered_data = self.data[self.data['Location'] == location]
+        gym_stats = None
+        if self.store is not None:
+            gym_stats = self._gym_stats_from_store(location, gender, weight_class)
+        if gym_stats is None:
+            gym_stats = self._gym_stats_from_frame(location, gender, weight_class)
+        
+        # Sort by win ratio and then by total wins
+        gym_stats.sort(key=lambda x: (x['win_ratio'], x['total_wins']), reverse=True)
+        
+        if limit is None:
+            return gym_stats
+        return gym_stats[:limit]
+    
+    def _gym_stats_from_store(self, location, gender, weight_class):
+        rows = self.store.gym_stats(location, gender, weight_class)
+        if rows is None:
+            # The store has moved on to a newer snapshot than this one
+            return None
+        gym_stats = []
+        for row in rows:
+            gym, total_wins, total_losses, total_boxers, avg_performance = row[:5]
+            male_wins, male_losses, female_wins, female_losses = row[5:]
+            total_fights = total_wins + total_losses
+            gym_stats.append({
+                'gym': gym,
+                'win_ratio': total_wins / total_fights if total_fights > 0 else 0,
+                'total_wins': total_wins,
+                'total_boxers': total_boxers,
+                'avg_performance': avg_performance if avg_performance is not None else float('nan'),
+                'male_win_ratio': male_wins / (male_wins + male_losses + 1e-8),
+                'female_win_ratio': female_wins / (female_wins + female_losses + 1e-8),
+                'total_fights': total_fights
+            })
+        return gym_stats
+    
+    def _get_location_rows(self, location):
+        """Rows of one location, looked up from a group index built on first use"""
+        if self._location_rows is None:
+            self._location_rows = self.data.groupby('Location', sort=False).indices
+        positions = self._location_rows.get(location)
+        if positions is None:
+            return self.data.iloc[0:0]
+        return self.data.iloc[positions]
+    
+    def _gym_stats_from_frame(self, location, gender, weight_class):
+        filtered_data = self._get_location_rows(location)
         
         if gender != "Both":
             filtered_data = filtered_data[filtered_data['Gender'] == gender]
@@ -48,12 +96,7 @@ class GymRecommender:
                 'total_fights': total_fights
             })
         
-        # Sort by win ratio and then by total wins
-        gym_stats.sort(key=lambda x: (x['win_ratio'], x['total_wins']), reverse=True)
-        
-        if limit is None:
-            return gym_stats
-        return gym_stats[:limit]
+        return gym_stats
     
     def get_gym_improvement_suggestions(self, gym_name, location):
         """Provide improvement suggestions for a specific gym"""
@@ -0,0 +1,149 @@
+# models/ml_gym_recommender.py
+import numpy as np
+import pandas as pd
+
+class MLGymRecommender:
+    """Score every gym against a boxer's profile with one product over a precomputed gym feature index"""
+    
+    # Pseudo-fights used to shrink sparse win ratios towards the overall ratio
+    PRIOR_FIGHTS = 5.0
+    WEIGHT_CLASS_WEIGHT = 0.45
+    GENDER_WEIGHT = 0.25
+    DEPTH_WEIGHT = 0.15
+    TREND_WEIGHT = 0.15
+    
+    def __init__(self, data):
+        self.data = data
+        self.gyms = pd.DataFrame()
+        self.features = np.zeros((0, 0))
+        self.columns = {}
+        self.location_positions = {}
+        self.boxer_profiles = pd.DataFrame()
+        self.overall_ratio = 0
+
+        if data.empty:
+            return
+        
+        self._build_index()
+    
+    def _smoothed_ratio(self, wins, fights):
+        return (wins + self.overall_ratio * self.PRIOR_FIGHTS) / (fights + self.PRIOR_FIGHTS)
+    
+    def _grouped_ratios(self, column):
+        """Smoothed win ratio of every gym for each value of `column`, one column per value"""
+        totals = self.data.groupby(['Location', 'Gym', column])[['Wins', 'Total_Fights']].sum()
+        wins = totals['Wins'].unstack(column, fill_value=0).reindex(self.gyms.index, fill_value=0)
+        fights = totals['Total_Fights'].unstack(column, fill_value=0).reindex(self.gyms.index, fill_value=0)
+        return self._smoothed_ratio(wins, fights)
+    
+    def _build_index(self):
+        """Build the gym x feature matrix once; recommendations only read it"""
+        self.overall_ratio = self.data['Wins'].sum() / max(self.data['Total_Fights'].sum(), 1)
+        
+        self.gyms = self.data.groupby(['Location', 'Gym'], sort=False).agg(
+            wins=('Wins', 'sum'),
+            total_fights=('Total_Fights', 'sum'),
+            total_boxers=('Boxer_Name', 'nunique')
+        )
+        self.gyms['win_ratio'] = self._smoothed_ratio(self.gyms['wins'], self.gyms['total_fights'])
+        
+        weight_ratios = self._grouped_ratios('Weight_Class')
+        gender_ratios = self._grouped_ratios('Gender')
+        
+        # Year-over-year trend: least-squares slope of the yearly win ratio, per gym
+        yearly = self.data.groupby(['Location', 'Gym', 'Year'])[['Wins', 'Total_Fights']].sum()
+        yearly_ratio = (yearly['Wins'] / yearly['Total_Fights'].where(yearly['Total_Fights'] > 0))
+        yearly_ratio = yearly_ratio.unstack('Year').reindex(self.gyms.index)
+        years = yearly_ratio.columns.to_numpy(dtype=float)
+        observed = yearly_ratio.notna().to_numpy()
+        ratios = yearly_ratio.to_numpy(dtype=float)
+        counts = observed.sum(axis=1)
+        year_mean = np.where(observed, years, 0).sum(axis=1) / np.maximum(counts, 1)
+        ratio_mean = np.nansum(ratios, axis=1) / np.maximum(counts, 1)
+        year_dev = np.where(observed, years - year_mean[:, None], 0)
+        ratio_dev = np.where(observed, ratios - ratio_mean[:, None], 0)
+        variance = (year_dev ** 2).sum(axis=1)
+        slope = np.divide((year_dev * ratio_dev).sum(axis=1), variance,
+                          out=np.zeros_like(variance), where=variance > 0)
+        self.gyms['trend'] = slope
+        
+        depth = self.gyms['total_boxers'] / self.gyms['total_boxers'].max()
+        trend_score = np.clip(0.5 + slope * 2.5, 0.0, 1.0)
+        
+        blocks = [weight_ratios.to_numpy(dtype=float), gender_ratios.to_numpy(dtype=float),
+                  depth.to_numpy(dtype=float)[:, None], trend_score[:, None]]
+        self.features = np.hstack(blocks)
+        
+        offset = 0
+        for prefix, names in [('weight', weight_ratios.columns), ('gender', gender_ratios.columns)]:
+            for name in names:
+                self.columns[(prefix, name)] = offset
+                offset += 1
+        self.columns[('depth', None)] = offset
+        self.columns[('trend', None)] = offset + 1
+        
+        self.gyms = self.gyms.reset_index()
+        self.location_positions = self.gyms.groupby('Location', sort=False).indices
+        
+        self.boxer_profiles = self.data.groupby('Boxer_Name', sort=False).agg(
+            gym=('Gym', 'first'),
+            location=('Location', 'first'),
+            gender=('Gender', 'first'),
+            weight_class=('Weight_Class', 'first')
+        )
+    
+    def _profile_vector(self, boxer):
+        """Weights over the feature columns that matter for this boxer"""
+        vector = np.zeros(self.features.shape[1])
+        weight_column = self.columns.get(('weight', boxer['weight_class']))
+        gender_column = self.columns.get(('gender', boxer['gender']))
+        if weight_column is not None:
+            vector[weight_column] = self.WEIGHT_CLASS_WEIGHT
+        if gender_column is not None:
+            vector[gender_column] = self.GENDER_WEIGHT
+        vector[self.columns[('depth', None)]] = self.DEPTH_WEIGHT
+        vector[self.columns[('trend', None)]] = self.TREND_WEIGHT
+        return vector
+    
+    def recommend_gyms_for_boxer(self, boxer_name, location=None, top_k=5):
+        """Recommend the gyms that best fit a boxer's weight class and gender"""
+        if self.gyms.empty or boxer_name not in self.boxer_profiles.index:
+            return []
+        
+        boxer = self.boxer_profiles.loc[boxer_name]
+        
+        if location and location != "All Locations":
+            positions = self.location_positions.get(location)
+            if positions is None:
+                return []
+        else:
+            positions = np.arange(len(self.gyms))
+        
+        scores = self.features[positions] @ self._profile_vector(boxer)
+        
+        top_k = min(int(top_k), len(positions))
+        if top_k <= 0:
+            return []
+        best = np.argpartition(-scores, top_k - 1)[:top_k]
+        best = best[np.argsort(-scores[best], kind='stable')]
+        
+        weight_column = self.columns.get(('weight', boxer['weight_class']))
+        gender_column = self.columns.get(('gender', boxer['gender']))
+        
+        results = []
+        for index in best:
+            position = positions[index]
+            gym = self.gyms.iloc[position]
+            results.append({
+                'gym': gym['Gym'],
+                'location': gym['Location'],
+                'score': scores[index],
+                'weight_class_win_ratio': self.features[position, weight_column] if weight_column is not None else None,
+                'gender_win_ratio': self.features[position, gender_column] if gender_column is not None else None,
+                'overall_win_ratio': gym['win_ratio'],
+                'total_boxers': int(gym['total_boxers']),
+                'trend': gym['trend'],
+                'is_current_gym': gym['Gym'] == boxer['gym'] and gym['Location'] == boxer['location']
+            })
+        
+        return results
@@ -0,0 +1,141 @@
+# models/model_registry.py
+import copy
+import hashlib
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import joblib
+import pandas as pd
+from config import Config
+
+class ModelRegistry:
+    """Fitted models persisted with joblib together with a fingerprint of the data they were trained on"""
+    
+    def __init__(self, model_dir=None):
+        self.model_dir = model_dir or Config.MODEL_DIR
+        self._entries = {}
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._update_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="model-retrain")
+    
+    def after_fork(self):
+        """Fresh locks and retrain thread in a forked worker; retrains still running in the parent are dropped"""
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._update_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="model-retrain")
+    
+    @staticmethod
+    def fingerprint(data):
+        """Schema, row count and a digest of every row prefix-comparable across versions"""
+        row_hashes = pd.util.hash_pandas_object(data, index=False).to_numpy()
+        return {
+            'schema': tuple((column, str(dtype)) for column, dtype in data.dtypes.items()),
+            'row_count': len(data),
+            'row_hashes': row_hashes,
+            'digest': hashlib.sha1(row_hashes.tobytes()).hexdigest()[:16]
+        }
+    
+    def _path(self, name):
+        return os.path.join(self.model_dir, f"{name}.joblib")
+    
+    def _load_entry(self, name):
+        entry = self._entries.get(name)
+        if entry is None and os.path.exists(self._path(name)):
+            try:
+                entry = joblib.load(self._path(name))
+                self._entries[name] = entry
+            except Exception as e:
+                print(f"Error loading model '{name}': {e}")
+        return entry
+    
+    def _store(self, name, model, fingerprint):
+        entry = {
+            'model': model,
+            'data_version': fingerprint['digest'],
+            'schema': fingerprint['schema'],
+            'row_count': fingerprint['row_count']
+        }
+        with self._lock:
+            self._entries[name] = entry
+        path = self._path(name)
+        # Written beside the target and renamed over it, so another process never loads half a file
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(self.model_dir, exist_ok=True)
+            joblib.dump(entry, temp_path)
+            os.replace(temp_path, path)
+        except OSError as e:
+            print(f"Could not persist model '{name}': {e}")
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+        return entry
+    
+    def get(self, name, data, fit, partial_fit=None, on_retrained=None):
+        """Return (model, data_version) for `data`, reusing, updating or retraining the stored model"""
+        fingerprint = self.fingerprint(data)
+        with self._lock:
+            entry = self._load_entry(name)
+        
+        # Trained on exactly this data
+        if entry is not None and entry['data_version'] == fingerprint['digest']:
+            return entry['model'], entry['data_version']
+        
+        # Rows were only appended: update a copy of the stored model with partial_fit(model, data, first_new_row)
+        same_schema = entry is not None and entry['schema'] == fingerprint['schema']
+        if same_schema and partial_fit is not None and fingerprint['row_count'] > entry['row_count']:
+            old_rows = fingerprint['row_hashes'][:entry['row_count']]
+            if hashlib.sha1(old_rows.tobytes()).hexdigest()[:16] == entry['data_version']:
+                with self._update_lock:
+                    current = self._entries.get(name)
+                    if current is not entry:
+                        # Another request already updated it; start over against the new entry
+                        return self.get(name, data, fit, partial_fit, on_retrained)
+                    # Update a copy: the stored model is still serving requests for older versions
+                    model = partial_fit(copy.deepcopy(entry['model']), data, entry['row_count'])
+                    entry = self._store(name, model, fingerprint)
+                return entry['model'], entry['data_version']
+        
+        # Schema or history changed: retrain from scratch in the background, serving the
+        # stale model meanwhile when its schema still matches
+        future = self._schedule_retrain(name, data, fit, fingerprint)
+        if same_schema:
+            if on_retrained is not None:
+                future.add_done_callback(lambda done: self._notify(done, on_retrained))
+            return entry['model'], entry['data_version']
+        
+        entry = future.result()
+        return entry['model'], entry['data_version']
+    
+    def _schedule_retrain(self, name, data, fit, fingerprint):
+        with self._lock:
+            pending = self._pending.get(name)
+            if pending is not None and pending[0] == fingerprint['digest']:
+                return pending[1]
+            future = self._executor.submit(self._retrain, name, data, fit, fingerprint)
+            self._pending[name] = (fingerprint['digest'], future)
+            return future
+    
+    def _retrain(self, name, data, fit, fingerprint):
+        try:
+            model = fit(data)
+        finally:
+            with self._lock:
+                latest = self._pending.get(name, (None,))[0] == fingerprint['digest']
+                if latest:
+                    del self._pending[name]
+        if not latest:
+            # A newer data version was scheduled meanwhile; do not let this one overwrite it
+            return {'model': model, 'data_version': fingerprint['digest']}
+        return self._store(name, model, fingerprint)
+    
+    @staticmethod
+    def _notify(future, callback):
+        try:
+            entry = future.result()
+            callback(entry['model'], entry['data_version'])
+        except Exception as e:
+            print(f"Error applying retrained model: {e}")
@@ -0,0 +1,66 @@
+# models/results_log.py
+import fcntl
+import json
+import os
+import threading
+from contextlib import contextmanager
+
+class ResultsLog:
+    """Append-only JSON-lines log of ingested fight results, replayed on top of the CSV at load time"""
+    
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+    
+    @contextmanager
+    def locked(self):
+        """Exclusive across worker processes, so catching up and appending act as one step"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path + '.lock', 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+    
+    def append(self, records, offset=None):
+        """Durably append a batch of records with a single write and fsync; returns the new end offset"""
+        payload = ''.join(json.dumps(record, separators=(',', ':')) + '\n' for record in records)
+        with self._lock:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.path, 'ab') as f:
+                # A torn tail past `offset` (the end of the last complete record) would swallow
+                # this batch's first line; it was never acknowledged, so it is cut off
+                if offset is not None and f.tell() > offset:
+                    f.truncate(offset)
+                f.write(payload.encode('utf-8'))
+                f.flush()
+                os.fsync(f.fileno())
+                return f.tell()
+    
+    def read(self, offset=0):
+        """Complete records from byte `offset` on, oldest first, and the offset just past the last of them"""
+        if not os.path.exists(self.path):
+            return [], 0
+        
+        records = []
+        with self._lock, open(self.path, 'rb') as f:
+            f.seek(offset)
+            for line in f:
+                if not line.endswith(b'\n'):
+                    # Torn final write from a crash; the batch was never acknowledged
+                    break
+                offset += len(line)
+                if line.strip():
+                    records.append(json.loads(line))
+        return records, offset
+    
+    def size(self):
+        try:
+            return os.path.getsize(self.path)
+        except OSError:
+            return 0
@@ -0,0 +1,121 @@
+# models/shared_frame.py
+import glob
+import json
+import os
+import shutil
+import threading
+import numpy as np
+import pandas as pd
+
+class SharedFrameStore:
+    """Published snapshot frames as raw column files that every worker process memory-maps read-only"""
+    
+    MANIFEST = 'manifest.json'
+    
+    def __init__(self, directory):
+        self.directory = directory
+    
+    def _path(self, version):
+        return os.path.join(self.directory, f"frame-{version}")
+    
+    def publish(self, version, df, gym_rollup=None):
+        """Write the frame (and its gym rollup) once for `version`, unless some process already has"""
+        path = self._path(version)
+        if os.path.exists(os.path.join(path, self.MANIFEST)):
+            return path
+        
+        os.makedirs(self.directory, exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            manifest = {'version': version, 'frames': {}}
+            manifest['frames']['df'] = self._write_frame(os.path.join(temp_path, 'df'), df)
+            if gym_rollup is not None:
+                manifest['frames']['gym_rollup'] = self._write_frame(
+                    os.path.join(temp_path, 'gym_rollup'), gym_rollup.reset_index()
+                )
+            
+            # The manifest is written last, so a directory without one is never attached
+            with open(os.path.join(temp_path, self.MANIFEST), 'w') as f:
+                json.dump(manifest, f)
+            os.replace(temp_path, path)
+        except OSError:
+            # Another process published the same version first; theirs is identical
+            shutil.rmtree(temp_path, ignore_errors=True)
+            if not os.path.exists(os.path.join(path, self.MANIFEST)):
+                raise
+        
+        self._remove_other_versions(path)
+        return path
+    
+    def attach(self, version):
+        """(df, gym_rollup) for `version` backed by the published files, or None when it was not published"""
+        path = self._path(version)
+        try:
+            with open(os.path.join(path, self.MANIFEST)) as f:
+                manifest = json.load(f)
+            
+            df = self._read_frame(os.path.join(path, 'df'), manifest['frames']['df'])
+            gym_rollup = None
+            if 'gym_rollup' in manifest['frames']:
+                gym_rollup = self._read_frame(
+                    os.path.join(path, 'gym_rollup'), manifest['frames']['gym_rollup']
+                ).set_index(['Location', 'Gym'])
+        except (OSError, ValueError):
+            # Not published, or removed by a newer publish while we were attaching
+            return None
+        return df, gym_rollup
+    
+    @staticmethod
+    def _write_frame(directory, frame):
+        """Numeric columns as .npy (nullable ones with a mask), text columns as int32 codes plus their distinct values"""
+        os.makedirs(directory)
+        columns = []
+        for position, column in enumerate(frame.columns):
+            series = frame[column]
+            if isinstance(series.dtype, pd.api.extensions.ExtensionDtype) and hasattr(series.dtype, 'numpy_dtype'):
+                # Nullable integers (blank cells in the CSV) as their values plus the missing mask
+                np.save(os.path.join(directory, f"{position}.npy"), series.to_numpy(series.dtype.numpy_dtype, na_value=0))
+                np.save(os.path.join(directory, f"{position}.mask.npy"), series.isna().to_numpy())
+                columns.append({'name': column, 'kind': 'nullable'})
+                continue
+            values = series.to_numpy()
+            if values.dtype == object:
+                # Missing values get code -1, which picks the NaN appended to the values on read
+                codes, uniques = pd.factorize(values, sort=True)
+                np.save(os.path.join(directory, f"{position}.codes.npy"), codes.astype('int32'))
+                np.save(os.path.join(directory, f"{position}.values.npy"), np.asarray(uniques, dtype=str))
+                columns.append({'name': column, 'kind': 'text'})
+            else:
+                np.save(os.path.join(directory, f"{position}.npy"), values)
+                columns.append({'name': column, 'kind': 'numeric'})
+        return {'rows': len(frame), 'columns': columns}
+    
+    @staticmethod
+    def _read_frame(directory, layout):
+        data = {}
+        for position, column in enumerate(layout['columns']):
+            if column['kind'] == 'text':
+                # Codes stay mapped, but the object column taken from them is private to this process:
+                # 8 bytes per row plus one string per distinct value, about 110MB per worker over five
+                # text columns at 1M rows. Categoricals would keep the codes shared, but the services
+                # group, compare and serialize these columns as plain strings
+                codes = np.load(os.path.join(directory, f"{position}.codes.npy"), mmap_mode='r')
+                uniques = np.load(os.path.join(directory, f"{position}.values.npy")).astype(object)
+                data[column['name']] = np.append(uniques, np.nan)[codes]
+            elif column['kind'] == 'nullable':
+                data[column['name']] = pd.arrays.IntegerArray(
+                    np.load(os.path.join(directory, f"{position}.npy"), mmap_mode='r'),
+                    np.load(os.path.join(directory, f"{position}.mask.npy"), mmap_mode='r')
+                )
+            else:
+                data[column['name']] = np.load(os.path.join(directory, f"{position}.npy"), mmap_mode='r')
+        
+        # copy=False keeps one block per column, so the numeric blocks are the mapped files themselves
+        # and only the text columns cost memory in every worker
+        return pd.DataFrame(data, index=pd.RangeIndex(layout['rows']), copy=False)
+    
+    def _remove_other_versions(self, path):
+        # Workers still mapping an older version keep their pages on POSIX after the unlink
+        for old_path in glob.glob(os.path.join(self.directory, 'frame-*')):
+            if old_path != path and not old_path.endswith('.tmp'):
+                shutil.rmtree(old_path, ignore_errors=True)
@@ -0,0 +1,327 @@
+# models/sqlite_store.py
+import glob
+import os
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+import numpy as np
+import pandas as pd
+from config import Config
+
+class FrameMean:
+    """SQL aggregate that averages in row order with numpy, so it matches pandas' Series.mean exactly"""
+    
+    def __init__(self):
+        self.rows = []
+    
+    def step(self, row_id, value):
+        # Like Series.mean, missing values (blank cells) are skipped
+        if value is not None:
+            self.rows.append((row_id, value))
+    
+    def finalize(self):
+        if not self.rows:
+            return None
+        self.rows.sort()
+        return float(np.mean(np.array([value for _, value in self.rows], dtype=float)))
+
+class ConnectionPool:
+    """Up to `size` read-only connections to one database file, opened on demand and reused"""
+    
+    def __init__(self, path, size):
+        self.path = path
+        self.size = size
+        self._idle = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+    
+    def _connect(self):
+        connection = sqlite3.connect(
+            f"file:{self.path}?mode=ro", uri=True, check_same_thread=False, isolation_level=None
+        )
+        connection.create_aggregate('frame_mean', 2, FrameMean)
+        return connection
+    
+    @contextmanager
+    def connection(self):
+        try:
+            connection = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                can_create = self._created < self.size
+                if can_create:
+                    self._created += 1
+            connection = self._connect() if can_create else self._idle.get()
+        try:
+            yield connection
+        finally:
+            self._idle.put(connection)
+
+class SQLiteStore:
+    """One CSV version in an indexed SQLite file, loaded from the CSV and kept current by ingests"""
+    
+    TABLE = 'boxers'
+    # The file holds the rows at the one log position recorded here, which every read checks first:
+    # the store of an older snapshot of the same data then returns None and its caller uses the frame
+    POSITION_TABLE = 'log_position'
+    INDEXES = [
+        ('Location', 'Gym'), ('Gym',), ('Year',), ('Weight_Class',), ('Gender',), ('Boxer_Name',), ('row_id',)
+    ]
+    # Derived per snapshot rather than stored, since it is normalized by the dataset-wide maxima
+    SCORE = "(Win_Ratio * 0.6 + (Wins / (? + 1.0)) * 0.2 + (Total_Fights / (? + 1.0)) * 0.2)"
+    # Files of older CSV versions kept for snapshots still reading them, besides the current one
+    KEEP_PREVIOUS = 1
+    
+    def __init__(self, path, dtypes, log_position, maxima, pool):
+        self.path = path
+        self.dtypes = dtypes
+        self.log_position = tuple(log_position)
+        self.maxima = [None if pd.isna(value) else float(value) for value in maxima]
+        self.pool = pool
+        self.columns = [column for column in dtypes.index if column != 'Performance_Score']
+    
+    def after_fork(self):
+        """Drop connections inherited from the parent process; SQLite handles must not cross a fork"""
+        self.pool = ConnectionPool(self.path, self.pool.size)
+    
+    @classmethod
+    def open(cls, directory, base_version, data_path, source_stat, log_position, maxima, dtypes, pool_size=4):
+        """Store over the database of the CSV version `base_version`, loading it from `data_path` the first time"""
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"boxing-{base_version}.sqlite3")
+        if not os.path.exists(path) and not cls._load_csv(path, data_path, source_stat, dtypes):
+            return None
+        return cls(path, dtypes, log_position, maxima, ConnectionPool(path, pool_size))
+    
+    @classmethod
+    def _load_csv(cls, path, data_path, source_stat, dtypes):
+        """Stream the CSV into a new database file at log position (0, 0); False if the CSV changed meanwhile"""
+        derived = ['Win_Ratio', 'Total_Fights', 'Performance_Score']
+        csv_columns = [column for column in dtypes.index if column not in derived]
+        integer_columns = [
+            column for column in csv_columns if pd.api.types.is_integer_dtype(dtypes[column])
+        ]
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        connection = sqlite3.connect(temp_path, isolation_level=None)
+        try:
+            connection.execute(f"CREATE TABLE {cls.TABLE} ({cls._column_definitions(dtypes)})")
+            connection.execute(f"CREATE TABLE {cls.POSITION_TABLE} (results_offset INTEGER, bout_segments INTEGER)")
+            connection.execute(f"INSERT INTO {cls.POSITION_TABLE} VALUES (0, 0)")
+            connection.execute("BEGIN")
+            with pd.read_csv(data_path, usecols=csv_columns, dtype={column: 'Int64' for column in integer_columns},
+                             chunksize=Config.CSV_CHUNK_SIZE) as reader:
+                for chunk in reader:
+                    # Same derivation as the loader's preprocessing, so both backends hold equal values
+                    wins = chunk['Wins'].to_numpy(dtype='float64', na_value=np.nan)
+                    losses = chunk['Losses'].to_numpy(dtype='float64', na_value=np.nan)
+                    chunk['Win_Ratio'] = wins / (wins + losses + 1e-8)
+                    chunk['Total_Fights'] = chunk['Wins'] + chunk['Losses']
+                    cls._insert(connection, chunk, [column for column in dtypes.index if column != 'Performance_Score'])
+            for columns in cls.INDEXES:
+                connection.execute(
+                    f"CREATE INDEX idx_{'_'.join(columns).lower()} ON {cls.TABLE} ({', '.join(columns)})"
+                )
+            connection.execute("COMMIT")
+            # Readers keep going while an ingest writes
+            connection.execute("PRAGMA journal_mode=WAL")
+        finally:
+            connection.close()
+        
+        stat = os.stat(data_path)
+        if (stat.st_mtime_ns, stat.st_size) != tuple(source_stat):
+            # Rows of a newer CSV must not be filed under this version
+            os.remove(temp_path)
+            return False
+        os.replace(temp_path, path)
+        cls._remove_old_versions(path)
+        return True
+    
+    @classmethod
+    def _column_definitions(cls, dtypes):
+        definitions = ["row_id INTEGER"]
+        for column, dtype in dtypes.items():
+            if column == 'Performance_Score':
+                continue
+            if pd.api.types.is_integer_dtype(dtype):
+                definitions.append(f"{column} INTEGER")
+            elif pd.api.types.is_float_dtype(dtype):
+                definitions.append(f"{column} REAL")
+            else:
+                definitions.append(f"{column} TEXT")
+        return ', '.join(definitions)
+    
+    @classmethod
+    def _insert(cls, connection, frame, columns):
+        """Insert `frame`'s rows under their index labels as row_id, blanks as NULL"""
+        values = frame[columns].astype(object)
+        values = values.where(values.notna(), None)
+        connection.executemany(
+            f"INSERT INTO {cls.TABLE} (row_id, {', '.join(columns)}) VALUES (?, {', '.join('?' * len(columns))})",
+            ((int(row_id), *row) for row_id, *row in values.itertuples(name=None))
+        )
+    
+    @staticmethod
+    def _remove_old_versions(path):
+        """Delete database files of all but the newest KEEP_PREVIOUS other CSV versions"""
+        directory = os.path.dirname(path)
+        others = []
+        for old_path in glob.glob(os.path.join(directory, 'boxing-*.sqlite3')):
+            try:
+                if old_path != path:
+                    others.append((os.path.getmtime(old_path), old_path))
+            except OSError:
+                pass
+        # Open connections keep working on POSIX; pools that never connected get None back
+        for _, old_path in sorted(others, reverse=True)[SQLiteStore.KEEP_PREVIOUS:]:
+            for suffix in ['', '-wal', '-shm']:
+                try:
+                    os.remove(old_path + suffix)
+                except OSError:
+                    pass
+    
+    def advance(self, log_position, updated_rows, new_rows, maxima, dtypes):
+        """Store for the snapshot an ingest derives from this one, with its changed rows updated and new rows inserted"""
+        # Whichever process first gets from this store's position to `log_position` writes it; the
+        # rows at a log position are the same everywhere, so later ones find it done and write nothing
+        connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        try:
+            connection.execute("BEGIN IMMEDIATE")
+            position = connection.execute(f"SELECT * FROM {self.POSITION_TABLE}").fetchone()
+            if tuple(position) == self.log_position:
+                assignments = ', '.join(f"{column} = ?" for column in ['Wins', 'Losses', 'Total_Fights', 'Win_Ratio'])
+                values = updated_rows[['Wins', 'Losses', 'Total_Fights', 'Win_Ratio']].astype(object)
+                connection.executemany(
+                    f"UPDATE {self.TABLE} SET {assignments} WHERE row_id = ?",
+                    ((*row, int(row_id)) for row_id, *row in values.where(values.notna(), None).itertuples(name=None))
+                )
+                self._insert(connection, new_rows, self.columns)
+                connection.execute(f"UPDATE {self.POSITION_TABLE} SET results_offset = ?, bout_segments = ?", log_position)
+            connection.execute("COMMIT")
+        except sqlite3.Error as e:
+            print(f"Error updating SQLite store: {e}")
+        finally:
+            connection.close()
+        return SQLiteStore(self.path, dtypes, log_position, maxima, self.pool)
+    
+    def _read(self, read):
+        """`read(connection)` in one transaction, or None when the file no longer holds this store's rows"""
+        try:
+            with self.pool.connection() as connection:
+                connection.execute("BEGIN")
+                try:
+                    position = connection.execute(f"SELECT * FROM {self.POSITION_TABLE}").fetchone()
+                    if tuple(position) != self.log_position:
+                        return None
+                    return read(connection)
+                finally:
+                    connection.execute("COMMIT")
+        except sqlite3.Error:
+            # Removed with an old CSV version before this pool first connected
+            return None
+    
+    def query_frame(self, sql, params=()):
+        """Rows as a frame indexed and typed like the source frame, or None"""
+        frame = self._read(lambda connection: pd.read_sql_query(sql, connection, params=params, index_col='row_id'))
+        if frame is None:
+            return None
+        frame.index = frame.index.astype('int64')
+        frame.index.name = None
+        return frame.astype(self.dtypes.to_dict())
+    
+    def query(self, sql, params=()):
+        return self._read(lambda connection: connection.execute(sql, params).fetchall())
+    
+    @staticmethod
+    def in_clause(column, values):
+        return f"{column} IN ({', '.join('?' * len(values))})", list(values)
+    
+    def filter_conditions(self, filters):
+        """WHERE conditions and parameters equivalent to DataFilter.apply_filters"""
+        conditions = []
+        params = []
+        
+        if filters.get('location') != "All Locations":
+            conditions.append("Location = ?")
+            params.append(filters['location'])
+        
+        if filters.get('year') != "All Years":
+            try:
+                params.append(int(filters['year']))
+                conditions.append("Year = ?")
+            except ValueError:
+                pass
+        
+        if filters.get('weight') != "All":
+            conditions.append("Weight_Class = ?")
+            params.append(filters['weight'])
+        
+        if filters.get('gender') != "Both":
+            conditions.append("Gender = ?")
+            params.append(filters['gender'])
+        
+        if filters.get('gym') != "All Gyms":
+            conditions.append("Gym = ?")
+            params.append(filters['gym'])
+        
+        selection = None
+        if filters.get('mode') == "Gym" and filters.get('selected_gyms'):
+            selection = self.in_clause('Gym', filters['selected_gyms'])
+        elif filters.get('mode') == "Boxer" and filters.get('selected_boxers'):
+            selection = self.in_clause('Boxer_Name', filters['selected_boxers'])
+        if selection is not None:
+            conditions.append(selection[0])
+            params.extend(selection[1])
+        
+        return conditions, params
+    
+    @staticmethod
+    def _where(conditions):
+        return f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    
+    def filter_rows(self, filters):
+        conditions, params = self.filter_conditions(filters)
+        return self.query_frame(
+            f"SELECT row_id, {', '.join(self.columns)}, {self.SCORE} AS Performance_Score "
+            f"FROM {self.TABLE} {self._where(conditions)} ORDER BY row_id",
+            self.maxima + params
+        )
+    
+    def gym_stats(self, location, gender="Both", weight_class="All"):
+        """Per-gym totals in one location, gyms in order of first appearance"""
+        conditions = ["Location = ?"]
+        params = [location]
+        if gender != "Both":
+            conditions.append("Gender = ?")
+            params.append(gender)
+        if weight_class != "All":
+            conditions.append("Weight_Class = ?")
+            params.append(weight_class)
+        
+        return self.query(f"""
+            SELECT Gym,
+                   COALESCE(SUM(Wins), 0), COALESCE(SUM(Losses), 0), COUNT(DISTINCT Boxer_Name),
+                   frame_mean(row_id, {self.SCORE}),
+                   SUM(CASE WHEN Gender = 'Male' THEN COALESCE(Wins, 0) ELSE 0 END),
+                   SUM(CASE WHEN Gender = 'Male' THEN COALESCE(Losses, 0) ELSE 0 END),
+                   SUM(CASE WHEN Gender = 'Female' THEN COALESCE(Wins, 0) ELSE 0 END),
+                   SUM(CASE WHEN Gender = 'Female' THEN COALESCE(Losses, 0) ELSE 0 END)
+            FROM {self.TABLE} {self._where(conditions)}
+            GROUP BY Gym
+            ORDER BY MIN(row_id)
+        """, self.maxima + params)
+    
+    def boxer_totals(self, conditions, params):
+        """Per-boxer totals plus the gym, location and gender of each boxer's first row, by name"""
+        return self.query(f"""
+            SELECT totals.Boxer_Name, first.Gym, first.Location, first.Gender,
+                   totals.wins, totals.losses
+            FROM (
+                SELECT Boxer_Name, MIN(row_id) AS first_row,
+                       COALESCE(SUM(Wins), 0) AS wins, COALESCE(SUM(Losses), 0) AS losses
+                FROM {self.TABLE} {self._where(conditions)}
+                GROUP BY Boxer_Name
+            ) AS totals
+            JOIN {self.TABLE} AS first ON first.row_id = totals.first_row
+            ORDER BY totals.Boxer_Name
+        """, params)
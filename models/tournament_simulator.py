@@ -0,0 +1,133 @@
+# models/tournament_simulator.py
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from models.match_maker import MatchMaker
+
+
+def _simulate_chunk(win_matrix, simulations, seed):
+    """Play `simulations` single-elimination brackets at once and count how far each slot gets"""
+    rng = np.random.default_rng(seed)
+    size = win_matrix.shape[0]
+    rounds = size.bit_length() - 1
+    
+    # Every row is one tournament; columns hold the slots still alive in bracket order
+    alive = np.tile(np.arange(size, dtype=np.int32), (simulations, 1))
+    counts = np.zeros((rounds + 1, size), dtype=np.int64)
+    counts[0] = simulations
+    
+    for round_number in range(1, rounds + 1):
+        left = alive[:, 0::2]
+        right = alive[:, 1::2]
+        left_wins = rng.random(left.shape) < win_matrix[left, right]
+        alive = np.where(left_wins, left, right)
+        counts[round_number] = np.bincount(alive.ravel(), minlength=size)
+    
+    return counts
+
+
+class TournamentSimulator:
+    """Monte Carlo estimate of who advances in a single-elimination bracket"""
+    
+    # Rating gap (Overall_Rating points) at which the stronger boxer wins ~91% of bouts
+    RATING_SCALE = 25.0
+    CHUNK_SIZE = 25000
+    
+    def __init__(self, data):
+        self.data = data
+        self.boxer_profiles = MatchMaker(data).boxer_profiles if not data.empty else None
+    
+    def _get_ratings(self, bracket):
+        profiles = self.boxer_profiles.set_index('Boxer_Name')
+        missing = [name for name in bracket if name not in profiles.index]
+        if missing:
+            raise ValueError(f"Unknown boxers: {', '.join(missing)}")
+        return profiles.loc[bracket, 'Overall_Rating'].to_numpy(dtype=float)
+    
+    @staticmethod
+    def _seed_order(size):
+        """Seed index in each bracket slot under standard seeding (1 v 8, 4 v 5, 2 v 7, 3 v 6, ...)"""
+        order = [0]
+        while len(order) < size:
+            last = 2 * len(order) - 1
+            order = [seed for top in order for seed in (top, last - top)]
+        return np.array(order)
+    
+    def _build_win_matrix(self, ratings):
+        """P(row slot beats column slot) with seeds in standard seeding order, padded with byes up to a power of two"""
+        entrants = len(ratings)
+        size = 1 << max(1, (entrants - 1).bit_length())
+        
+        diff = ratings[:, None] - ratings[None, :]
+        win_matrix = np.ones((size, size))
+        win_matrix[:entrants, :entrants] = 1.0 / (1.0 + 10 ** (-diff / self.RATING_SCALE))
+        # Byes are the lowest seeds, so each one meets a different top seed in the first
+        # round and never another bye; they never beat a real boxer
+        win_matrix[entrants:, :entrants] = 0.0
+        seeds = self._seed_order(size)
+        return win_matrix[np.ix_(seeds, seeds)]
+    
+    @staticmethod
+    def _stage_name(remaining):
+        if remaining == 1:
+            return "Champion"
+        if remaining == 2:
+            return "Final"
+        if remaining == 4:
+            return "Semifinal"
+        if remaining == 8:
+            return "Quarterfinal"
+        return f"Round of {remaining}"
+    
+    def simulate(self, bracket, simulations=100000, seed=None, workers=1):
+        """Estimate per-round advancement probabilities for every boxer in the bracket"""
+        if self.boxer_profiles is None or self.boxer_profiles.empty:
+            return {}
+        if len(bracket) < 2:
+            raise ValueError("A bracket needs at least two boxers")
+        if len(set(bracket)) != len(bracket):
+            raise ValueError("A boxer can only appear once in a bracket")
+        
+        ratings = self._get_ratings(bracket)
+        win_matrix = self._build_win_matrix(ratings)
+        size = win_matrix.shape[0]
+        rounds = size.bit_length() - 1
+        
+        # Chunking and seeds depend only on (simulations, seed), so results do not change with workers
+        chunk_sizes = [self.CHUNK_SIZE] * (simulations // self.CHUNK_SIZE)
+        if simulations % self.CHUNK_SIZE:
+            chunk_sizes.append(simulations % self.CHUNK_SIZE)
+        seeds = np.random.SeedSequence(seed).spawn(len(chunk_sizes))
+        matrices = [win_matrix] * len(chunk_sizes)
+        
+        if workers > 1 and len(chunk_sizes) > 1:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                chunk_counts = list(executor.map(_simulate_chunk, matrices, chunk_sizes, seeds))
+        else:
+            chunk_counts = list(map(_simulate_chunk, matrices, chunk_sizes, seeds))
+        
+        # Counts are per slot; each boxer's column is the slot their seed was drawn into
+        slots = np.argsort(self._seed_order(size))[:len(bracket)]
+        probabilities = np.sum(chunk_counts, axis=0)[:, slots] / simulations
+        stages = [self._stage_name(size >> round_number) for round_number in range(1, rounds + 1)]
+        
+        boxers = []
+        for slot, boxer_name in enumerate(bracket):
+            boxers.append({
+                'boxer_name': boxer_name,
+                'seed_position': slot + 1,
+                'overall_rating': ratings[slot],
+                'advancement': {stage: probabilities[round_number, slot]
+                                for round_number, stage in enumerate(stages, start=1)},
+                'win_probability': probabilities[rounds, slot]
+            })
+        
+        boxers.sort(key=lambda x: x['win_probability'], reverse=True)
+        
+        return {
+            'bracket': list(bracket),
+            'bracket_size': size,
+            'simulations': simulations,
+            'seed': seed,
+            'stages': stages,
+            'boxers': boxers
+        }
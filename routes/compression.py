@@ -0,0 +1,155 @@
+# routes/compression.py
+import gzip
+import mimetypes
+import os
+import zlib
+from flask import request, send_from_directory
+from werkzeug.security import safe_join
+from config import Config
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Preferred first when the client rates them equally
+ENCODINGS = ('br', 'gzip')
+SUFFIXES = {'br': '.br', 'gzip': '.gz'}
+COMPRESSIBLE_TYPES = ('text/', 'application/json', 'application/javascript', 'image/svg+xml')
+
+def compressible(mimetype):
+    return bool(mimetype) and mimetype.startswith(COMPRESSIBLE_TYPES)
+
+def available_encodings():
+    return [encoding for encoding in ENCODINGS if encoding != 'br' or brotli is not None]
+
+def encoded_etags(etag):
+    """The ETag of every representation of a response: identity and each content coding"""
+    return [etag] + [f"{etag}-{encoding}" for encoding in ENCODINGS]
+
+def precompress_static(folder):
+    """Write .gz (and .br with brotli) next to each compressible static file lacking an up-to-date one"""
+    written = []
+    for root, _, files in os.walk(folder):
+        for name in files:
+            if name.endswith(tuple(SUFFIXES.values())) or not compressible(mimetypes.guess_type(name)[0]):
+                continue
+            path = os.path.join(root, name)
+            data = None
+            for encoding in available_encodings():
+                target = path + SUFFIXES[encoding]
+                if _is_fresh(target, path):
+                    continue
+                if data is None:
+                    with open(path, 'rb') as f:
+                        data = f.read()
+                # Slowest, smallest settings: this runs once per build, not per request
+                if encoding == 'br':
+                    encoded = brotli.compress(data, quality=11)
+                else:
+                    encoded = gzip.compress(data, compresslevel=9, mtime=0)
+                tmp_path = f"{target}.tmp"
+                with open(tmp_path, 'wb') as f:
+                    f.write(encoded)
+                os.replace(tmp_path, target)
+                written.append(target)
+    return written
+
+def _is_fresh(target, source):
+    return os.path.isfile(target) and os.path.getmtime(target) >= os.path.getmtime(source)
+
+class ResponseCompressor:
+    """gzip/brotli content negotiation for dynamic responses and precompressed static files"""
+    
+    def __init__(self, app):
+        self.app = app
+        self.min_size = app.config['COMPRESS_MIN_SIZE']
+        self.gzip_level = app.config['COMPRESS_GZIP_LEVEL']
+        self.brotli_quality = app.config['COMPRESS_BROTLI_QUALITY']
+        
+        if app.static_folder and os.path.isdir(app.static_folder):
+            try:
+                precompress_static(app.static_folder)
+            except OSError as e:
+                # Read-only deployments precompress at build time with `python -m routes.compression`
+                print(f"Could not precompress static files: {e}")
+        
+        app.view_functions['static'] = self.send_static
+        app.after_request(self.compress)
+    
+    def _negotiate(self, encodings):
+        """Best content coding the client accepts among `encodings`, or None for identity"""
+        return request.accept_encodings.best_match(encodings)
+    
+    def compress(self, response):
+        if (response.status_code < 200 or response.status_code in (204, 206, 304)
+                or response.direct_passthrough or 'Content-Encoding' in response.headers
+                or not compressible(response.mimetype)):
+            return response
+        
+        response.vary.add('Accept-Encoding')
+        encoding = self._negotiate(available_encodings())
+        if encoding is None:
+            return response
+        
+        if response.is_streamed:
+            # Exports stay streamed: each chunk is compressed as it is produced
+            response.response = self._compress_stream(encoding, response.iter_encoded())
+            response.headers.pop('Content-Length', None)
+        else:
+            data = response.get_data()
+            if len(data) < self.min_size:
+                return response
+            response.set_data(self._compress_bytes(encoding, data))
+        
+        response.headers['Content-Encoding'] = encoding
+        etag, weak = response.get_etag()
+        if etag:
+            # Each representation needs its own strong validator
+            response.set_etag(f"{etag}-{encoding}", weak)
+        return response
+    
+    def _compress_bytes(self, encoding, data):
+        if encoding == 'br':
+            return brotli.compress(data, quality=self.brotli_quality)
+        compressor = zlib.compressobj(self.gzip_level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+        return compressor.compress(data) + compressor.flush()
+    
+    def _compress_stream(self, encoding, chunks):
+        if encoding == 'br':
+            compressor = brotli.Compressor(quality=self.brotli_quality)
+            compress, finish = compressor.process, compressor.finish
+        else:
+            compressor = zlib.compressobj(self.gzip_level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+            compress, finish = compressor.compress, compressor.flush
+        for chunk in chunks:
+            data = compress(chunk)
+            if data:
+                yield data
+        yield finish()
+    
+    def send_static(self, filename):
+        """Static files from their precompressed copy when the client accepts its coding"""
+        static_folder = self.app.static_folder
+        path = safe_join(static_folder, filename)
+        mimetype = mimetypes.guess_type(filename)[0]
+        if path is None or not os.path.isfile(path) or not compressible(mimetype):
+            return self.app.send_static_file(filename)
+        
+        encodings = [encoding for encoding in ENCODINGS if _is_fresh(path + SUFFIXES[encoding], path)]
+        encoding = self._negotiate(encodings) if encodings else None
+        if encoding is None:
+            response = self.app.send_static_file(filename)
+        else:
+            response = send_from_directory(
+                static_folder, filename + SUFFIXES[encoding],
+                mimetype=mimetype, max_age=self.app.get_send_file_max_age(filename)
+            )
+            response.headers['Content-Encoding'] = encoding
+        response.vary.add('Accept-Encoding')
+        return response
+
+if __name__ == "__main__":
+    # Build step: precompress the static folder ahead of deployment
+    for target in precompress_static(os.path.join(Config.BASE_DIR, "static")):
+        print(f"Wrote {target}")
@@ -0,0 +1,88 @@
+# routes/json_provider.py
+import numpy as np
+import pandas as pd
+from flask import has_request_context, request
+from flask.json.provider import DefaultJSONProvider
+from services.metrics import span
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _default(obj):
+    """Values neither encoder handles natively: numpy, pandas and plain objects"""
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, pd.DataFrame):
+        return obj.to_dict('records')
+    if isinstance(obj, (pd.Series, pd.Index)):
+        return obj.tolist()
+    if obj is pd.NA or obj is pd.NaT:
+        return None
+    try:
+        return DefaultJSONProvider.default(obj)
+    except TypeError:
+        # Objects with attributes are sent as their attribute dict, as convert_to_native_types did
+        if hasattr(obj, '__dict__'):
+            return obj.__dict__
+        raise
+
+def to_columns(obj):
+    """Lists of records with the same keys (and frames) as {column: [values]}, anywhere in `obj`"""
+    if isinstance(obj, pd.DataFrame):
+        return {column: obj[column].tolist() for column in obj.columns}
+    if isinstance(obj, dict):
+        return {key: to_columns(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        if obj and all(isinstance(item, dict) for item in obj):
+            keys = list(obj[0])
+            if all(item.keys() == obj[0].keys() for item in obj):
+                return {key: [to_columns(item[key]) for item in obj] for key in keys}
+        return [to_columns(item) for item in obj]
+    return obj
+
+class FastJSONProvider(DefaultJSONProvider):
+    """JSON provider that serializes numpy and pandas values in one pass, with orjson when it is installed"""
+    
+    default = staticmethod(_default)
+    
+    def dumps(self, obj, **kwargs):
+        if orjson is None or not self._orjson_compatible(kwargs):
+            return super().dumps(obj, **kwargs)
+        
+        # Datetimes go through _default too, so they are formatted the way Flask does
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if kwargs.get('sort_keys', self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get('indent'):
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option).decode()
+    
+    @staticmethod
+    def _orjson_compatible(kwargs):
+        """orjson only knows compact output and two-space indentation"""
+        for name, value in kwargs.items():
+            if name == 'indent' and value in (None, 2):
+                continue
+            if name == 'separators' and (value is None or tuple(value) == (',', ':') or kwargs.get('indent')):
+                continue
+            if name == 'sort_keys':
+                continue
+            return False
+        return True
+    
+    def loads(self, s, **kwargs):
+        if orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        """Like jsonify; `?orient=columns` sends lists of records column-oriented"""
+        obj = self._prepare_response_obj(args, kwargs)
+        if has_request_context() and request.args.get('orient') == 'columns':
+            obj = to_columns(obj)
+        with span('serialize'):
+            return super().response(obj)
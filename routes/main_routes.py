@@ -1,82 +1,238 @@
 # routes/main_routes.py
-from flask import render_template, request, send_file, jsonify
-import io
-from datetime import datetime
-import numpy as np
-from models.data_loader import EnhancedDataLoader
-from models.gym_recommender import GymRecommender
-from models.match_maker import MatchMaker
-from services.data_filter import DataFilter
+from flask import render_template, request, jsonify, Response, g, abort
+import os
+import time
+from models.bout_store import BoutStore
 from services.analytics import Analytics
-from services.chart_generator import ChartGenerator
-from services.improvement_advisor import ImprovementAdvisor
-
-
-def convert_to_native_types(obj):
-    """Convert numpy/pandas types to native Python types for JSON serialization"""
-    if isinstance(obj, (np.integer, np.int64, np.int32)):
-        return int(obj)
-    elif isinstance(obj, (np.floating, np.float64, np.float32)):
-        return float(obj)
-    elif isinstance(obj, np.ndarray):
-        return obj.tolist()
-    elif isinstance(obj, dict):
-        return {key: convert_to_native_types(value) for key, value in obj.items()}
-    elif isinstance(obj, (list, tuple)):
-        return [convert_to_native_types(item) for item in obj]
-    elif hasattr(obj, '__dict__'):
-        return convert_to_native_types(obj.__dict__)
-    else:
-        return obj
+from services.data_exporter import DataExporter
+from services.report_cache import AnalysisReportCache
+from services.single_flight import SingleFlight
+from services.metrics import Metrics, span
+from routes.response_cache import ResponseCache
+from routes.compression import encoded_etags
 
+# Dashboard sections that can be re-rendered alone (templates/partials), with the form fields each depends on.
+# A section's entry must cover every field its context builder and its template read: it is both the
+# response cache key of /fragment/<name> and what the page watches to decide which sections to refresh.
+_FILTER_INPUTS = ('mode', 'gender', 'location', 'gyms', 'boxers', 'boxer_primary', 'boxer_secondary', 'year', 'weight', 'diagram', 'gym')
+FRAGMENT_INPUTS = {
+    'recommendations': ('location', 'gender', 'weight'),
+    'comparison_header': ('mode',),
+    'selected_gyms': ('gyms',),
+    # Gym mode narrows the list by the selected gyms; the selects render the chosen gyms and boxers
+    'boxer_list': ('mode', 'gender', 'location', 'year', 'weight', 'gyms', 'boxer_primary', 'boxer_secondary'),
+    'chart': _FILTER_INPUTS,
+    'kpis': _FILTER_INPUTS
+}
 
 class MainRoutes:
-    def __init__(self, app, data_loader):
+    def __init__(self, app, datasets, services):
         self.app = app
-        self.data_loader = data_loader
+        self.datasets = datasets
+        self.services = services
+        self.single_flight = SingleFlight(app.config['COALESCE_REQUESTS'])
+        self.app.extensions['single_flight'] = self.single_flight
+        self.response_cache = ResponseCache(app.config['RESPONSE_CACHE_MAX_BYTES'])
+        self.app.extensions['response_cache'] = self.response_cache
+        self.metrics = Metrics(app.config['METRICS_ENABLED'])
+        self.app.extensions['metrics'] = self.metrics
+        self.exporter = DataExporter()
+        self.datasets.add_open_listener(self._open_dataset)
         self.setup_routes()
     
     def setup_routes(self):
-        self.app.add_url_rule('/', 'index', self.index, methods=['GET', 'POST'])
-        self.app.add_url_rule('/export_csv', 'export_csv', self.export_csv)
-        self.app.add_url_rule('/get_recommendations', 'get_recommendations', self.get_recommendations, methods=['POST'])
-        self.app.add_url_rule('/get_improvement_analysis', 'get_improvement_analysis', self.get_improvement_analysis, methods=['POST'])
-        self.app.add_url_rule('/get_suggestions', 'get_suggestions', self.get_suggestions, methods=['POST'])
+        self._add_url_rule('/', 'index', self.index, methods=['GET', 'POST'])
+        self._add_url_rule('/fragment/<name>', 'fragment', self.fragment, methods=['POST'])
+        self._add_url_rule('/export_csv', 'export_csv', self.export_csv)
+        self._add_url_rule('/get_recommendations', 'get_recommendations', self.get_recommendations, methods=['POST'])
+        self._add_url_rule('/get_improvement_analysis', 'get_improvement_analysis', self.get_improvement_analysis, methods=['POST'])
+        self._add_url_rule('/get_suggestions', 'get_suggestions', self.get_suggestions, methods=['POST'])
+        self._add_url_rule('/get_bulk_suggestions', 'get_bulk_suggestions', self.get_bulk_suggestions, methods=['POST'])
         # Real problem solving endpoints
-        # self.app.add_url_rule('/predict_career', 'predict_career', self.predict_career, methods=['POST'])
-        self.app.add_url_rule('/find_fair_matches', 'find_fair_matches', self.find_fair_matches, methods=['POST'])
+        self._add_url_rule('/predict_career', 'predict_career', self.predict_career, methods=['POST'])
+        self._add_url_rule('/detect_anomalies', 'detect_anomalies', self.detect_anomalies, methods=['POST'])
+        self._add_url_rule('/get_ml_insights', 'get_ml_insights', self.get_ml_insights)
+        self._add_url_rule('/ml_recommend_gyms', 'ml_recommend_gyms', self.ml_recommend_gyms, methods=['POST'])
+        self._add_url_rule('/find_fair_matches', 'find_fair_matches', self.find_fair_matches, methods=['POST'])
+        self._add_url_rule('/api/leaderboard', 'leaderboard', self.leaderboard)
+        self._add_url_rule('/simulate_tournament', 'simulate_tournament', self.simulate_tournament, methods=['POST'])
+        self._add_url_rule('/api/results', 'ingest_results', self.ingest_results, methods=['POST'])
+        self._add_url_rule('/api/bouts', 'ingest_bouts', self.ingest_bouts, methods=['POST'])
+        self._add_url_rule('/api/bouts/<boxer_name>', 'boxer_bouts', self.boxer_bouts)
+        self._add_url_rule('/api/datasets', 'datasets', self.list_datasets)
+        self.app.add_url_rule('/ready', 'ready', self.ready)
+        self.app.add_url_rule('/api/coalescing', 'coalescing', self.coalescing_stats)
+        self.app.url_value_preprocessor(self._pull_dataset)
+        if self.metrics.enabled:
+            self.app.add_url_rule('/metrics', 'metrics', self.metrics_text)
+            self.app.before_request(self._start_request_metrics)
+            self.app.teardown_request(self._finish_request_metrics)
+            self._add_metric_collectors()
        
     
+    def _add_url_rule(self, rule, endpoint, view_func, **options):
+        """Register a route both as-is (default dataset) and under the /d/<dataset> prefix"""
+        self.app.add_url_rule(rule, endpoint, view_func, **options)
+        self.app.add_url_rule(f"/d/<dataset>{rule}", endpoint, view_func, **options)
+    
+    def _pull_dataset(self, endpoint, values):
+        if values and 'dataset' in values:
+            g.dataset_name = values.pop('dataset')
+    
+    def _dataset(self):
+        """Dataset chosen by the /d/<dataset> prefix or a `dataset` parameter, loaded on first use"""
+        if 'dataset' not in g:
+            name = g.get('dataset_name') or request.values.get('dataset')
+            if name is None and request.is_json:
+                body = request.get_json(silent=True)
+                if isinstance(body, dict):
+                    name = body.get('dataset')
+            try:
+                g.dataset = self.datasets.get(name)
+            except KeyError:
+                abort(404, description=f"Unknown dataset '{name}'")
+        return g.dataset
+    
+    def _open_dataset(self, dataset):
+        dataset.extensions['report_cache'] = AnalysisReportCache(dataset.loader)
+    
+    def _snapshot(self):
+        """Data snapshot pinned for the current request, so a reload mid-request cannot mix versions"""
+        if 'data_snapshot' not in g:
+            g.data_snapshot = self._dataset().loader.get_snapshot()
+        return g.data_snapshot
+    
+    def _service(self, name):
+        """The request's dataset's `name` service for the pinned snapshot, from the service container"""
+        return self.services.get(name, self._dataset(), self._snapshot())
+    
+    def _flight_key(self, *params):
+        """Coalescing key: the request's dataset and data version plus the inputs of the computation"""
+        return (self._dataset().name, self._snapshot().version) + tuple(
+            tuple(value) if isinstance(value, list) else value for value in params
+        )
+    
+    def _request_params(self):
+        """Everything the response depends on besides the data: query string and JSON body"""
+        args = sorted((name, value) for name, value in request.args.items(multi=True) if name != 'dataset')
+        body = request.get_json(silent=True) if request.is_json else None
+        if isinstance(body, dict):
+            body = {name: value for name, value in body.items() if name != 'dataset'}
+        return [args, body]
+    
+    def _cached(self, route, build, params=None):
+        """`build()`'s response tagged with a strong ETag of (route, params, data version), skipping the work when possible"""
+        if params is None:
+            params = self._request_params()
+        etag = self.response_cache.make_etag(route, self._dataset().name, self._snapshot().version, params)
+        # A compressed copy carries the tag plus its coding; any of them validates
+        sent_etag = next((tag for tag in encoded_etags(etag) if request.if_none_match.contains(tag)), None)
+        if sent_etag is not None:
+            if request.method not in ('GET', 'HEAD'):
+                # RFC 9110: a matching If-None-Match fails the precondition of any other method
+                return Response(status=412)
+            self.response_cache.not_modified()
+            response = Response(status=304)
+            response.set_etag(sent_etag)
+            return response
+        
+        response = self.response_cache.get(etag)
+        if response is None:
+            with span('build'):
+                response = self.app.make_response(build())
+            if response.status_code != 200:
+                # Errors are neither cached nor tagged, a retry must reach the handler
+                return response
+            self.response_cache.put(etag, response)
+        
+        response.set_etag(etag)
+        # Clients revalidate every time; the tag changes with the data version
+        response.cache_control.no_cache = True
+        return response
+    
     def index(self):
         # Get form data
         form_data = self._get_form_data()
         
-        # Filter data
-        data_filter = DataFilter(self.data_loader.get_data())
-        filtered_data = data_filter.apply_filters(form_data)
+        # Identical concurrent dashboard requests (a shared link) render the page once
+        key = self._flight_key(*(form_data[name] for name in sorted(form_data)))
+        return self.single_flight.do('index', key, lambda: self._render_index(form_data))
+    
+    def _render_index(self, form_data):
+        context = self._selection_context(form_data)
+        context.update(self._recommendations_context(form_data))
+        context.update(self._boxer_list_context(form_data))
+        
+        # Filter data once for the chart and the metrics
+        with span('filter'):
+            filtered_data = self._service('data_filter').apply_filters(form_data)
+        context.update(self._kpis_context(form_data, filtered_data))
+        context.update(self._chart_context(form_data, filtered_data))
+        with span('advanced_stats'):
+            context['advanced_stats'] = Analytics.calculate_advanced_stats(filtered_data, form_data['mode'])
         
-        # Calculate metrics
-        kpis = Analytics.calculate_kpis(filtered_data, form_data['mode'])
-        win_ratios = Analytics.calculate_win_ratios(
-            filtered_data, form_data['mode'], form_data['selected_boxers'], 
-            form_data['year'], form_data['diagram_type']
-        )
-        advanced_stats = Analytics.calculate_advanced_stats(filtered_data, form_data['mode'])
-        
-        # Generate chart
-        chart_generator = ChartGenerator()
-        fig = chart_generator.generate_chart(
-            filtered_data, form_data['mode'], form_data['diagram_type'],
-            form_data['selected_boxers'], form_data['selected_gyms'], 
-            form_data['year'], form_data['location']
-        )
-        graph_html = chart_generator.chart_to_html(fig)
+        with span('render'):
+            return render_template("index.html", **context)
+    
+    def fragment(self, name):
+        """One dashboard section rendered for the posted filters, so the page can update it in place"""
+        if name not in FRAGMENT_INPUTS:
+            abort(404, description=f"Unknown fragment '{name}'")
         
-        # Get available filters
-        available_filters = self.data_loader.get_available_filters()
-
-        # Get gym recommendations
-        gym_recommender = GymRecommender(self.data_loader.get_data())
+        # Keyed on the section's own inputs: other filters changing does not invalidate it
+        params = {field: request.form.getlist(field) for field in FRAGMENT_INPUTS[name]}
+        return self._cached(f'fragment/{name}', lambda: self._render_fragment(name), params)
+    
+    def _render_fragment(self, name):
+        form_data = self._get_form_data()
+        context = self._selection_context(form_data)
+        if name == 'recommendations':
+            context.update(self._recommendations_context(form_data))
+        elif name == 'boxer_list':
+            context.update(self._boxer_list_context(form_data))
+        elif name in ('chart', 'kpis'):
+            with span('filter'):
+                filtered_data = self._service('data_filter').apply_filters(form_data)
+            if name == 'chart':
+                # The page has plotly.js already
+                context.update(self._chart_context(form_data, filtered_data, include_plotlyjs=False))
+            else:
+                context.update(self._kpis_context(form_data, filtered_data))
+        with span('render'):
+            return render_template(f"partials/{name}.html", **context)
+    
+    def _selection_context(self, form_data):
+        """Filter choices and current selections, which every section renders from"""
+        available_filters = self._snapshot().get_available_filters()
+        dataset = self._dataset()
+        dataset_prefix = "" if dataset.name == self.app.config['DEFAULT_DATASET'] else f"/d/{dataset.name}"
+        return {
+            'dataset_prefix': dataset_prefix,
+            'fragment_inputs': FRAGMENT_INPUTS,
+            'locations': available_filters['locations'],
+            'gyms': available_filters['gyms'],
+            'years': available_filters['years'],
+            'weights': available_filters['weights'],
+            'diagram_types': available_filters['diagram_types'],
+            'genders': available_filters['genders'],
+            'selected_mode': form_data['mode'],
+            'selected_gender': form_data['gender'],
+            'selected_location': form_data['location'],
+            'selected_gyms': form_data['selected_gyms'],
+            'selected_boxers': form_data['selected_boxers'],
+            'selected_year': form_data['year'],
+            'selected_weight': form_data['weight'],
+            'selected_diagram': form_data['diagram_type'],
+            'boxer_primary': form_data['boxer_primary'],
+            'boxer_secondary': form_data['boxer_secondary']
+        }
+    
+    def _recommendations_context(self, form_data):
+        with span('recommendations'):
+            return self._build_recommendations_context(form_data)
+    
+    def _build_recommendations_context(self, form_data):
+        gym_recommender = self._service('gym_recommender')
         recommended_gyms = []
         location_gym_details = []
         location_recommendations = {}
@@ -87,7 +243,7 @@ class MainRoutes:
             recommended_gyms = all_ranked_gyms[:4]
             location_gym_details = all_ranked_gyms
         else:
-            for loc in available_filters['locations']:
+            for loc in self._snapshot().get_available_filters()['locations']:
                 if loc == "All Locations":
                     continue
                 recs = gym_recommender.recommend_gyms_by_location(
@@ -96,48 +252,52 @@ class MainRoutes:
                 if recs:
                     location_recommendations[loc] = recs
         
-        # Get available boxers
+        return {
+            'recommended_gyms': recommended_gyms,
+            'location_recommendations': location_recommendations,
+            'location_gym_details': location_gym_details
+        }
+    
+    def _boxer_list_context(self, form_data):
         boxer_filters = form_data.copy()
         boxer_filters['selected_boxers'] = []
         boxer_filters['selected_gyms'] = []
         boxer_filters['gym'] = "All Gyms"
-        boxer_filtered_data = data_filter.apply_filters(boxer_filters)
         boxer_location_filter = "All Locations" if form_data['mode'] == "Boxer" else form_data['location']
         boxer_gyms_filter = None if form_data['mode'] == "Boxer" else form_data['selected_gyms']
-        available_boxers = data_filter.get_boxers_with_gyms(
-            boxer_gyms_filter, form_data['gender'], boxer_location_filter, boxer_filtered_data
-        )
-        
-        return render_template("index.html",
-                           locations=available_filters['locations'],
-                           gyms=available_filters['gyms'],
-                           boxers=available_boxers,
-                           years=available_filters['years'],
-                           weights=available_filters['weights'],
-                           diagram_types=available_filters['diagram_types'],
-                           genders=available_filters['genders'],
-                           graph_html=graph_html,
-                           win_ratios=win_ratios,
-                           recommended_gyms=recommended_gyms,
-                           location_recommendations=location_recommendations,
-                           location_gym_details=location_gym_details,
-                           selected_mode=form_data['mode'],
-                           selected_gender=form_data['gender'],
-                           selected_location=form_data['location'],
-                           selected_gyms=form_data['selected_gyms'],
-                           selected_boxers=form_data['selected_boxers'],
-                           selected_year=form_data['year'],
-                           selected_weight=form_data['weight'],
-                           selected_diagram=form_data['diagram_type'],
-                           boxer_primary=form_data['boxer_primary'],
-                           boxer_secondary=form_data['boxer_secondary'],
-                           total_boxers=kpis['total_boxers'],
-                           total_gyms=kpis['total_gyms'],
-                           total_locations=kpis['total_locations'],
-                           total_fights=kpis['total_fights'],
-                           avg_win_ratio=kpis['avg_win_ratio'],
-                           top_performer=kpis['top_performer'],
-                           advanced_stats=advanced_stats)
+        with span('boxer_list'):
+            available_boxers = self._service('data_filter').get_available_boxers(
+                boxer_filters, boxer_gyms_filter, form_data['gender'], boxer_location_filter
+            )
+        return {'boxers': available_boxers}
+    
+    def _kpis_context(self, form_data, filtered_data):
+        with span('kpis'):
+            kpis = Analytics.calculate_kpis(filtered_data, form_data['mode'])
+            win_ratios = Analytics.calculate_win_ratios(
+                filtered_data, form_data['mode'], form_data['selected_boxers'], 
+                form_data['year'], form_data['diagram_type']
+            )
+        return {
+            'win_ratios': win_ratios,
+            'total_boxers': kpis['total_boxers'],
+            'total_gyms': kpis['total_gyms'],
+            'total_locations': kpis['total_locations'],
+            'total_fights': kpis['total_fights'],
+            'avg_win_ratio': kpis['avg_win_ratio'],
+            'top_performer': kpis['top_performer']
+        }
+    
+    def _chart_context(self, form_data, filtered_data, include_plotlyjs=True):
+        chart_generator = self._service('chart_generator')
+        with span('chart'):
+            fig = chart_generator.generate_chart(
+                filtered_data, form_data['mode'], form_data['diagram_type'],
+                form_data['selected_boxers'], form_data['selected_gyms'], 
+                form_data['year'], form_data['location']
+            )
+        with span('chart_html'):
+            return {'graph_html': chart_generator.chart_to_html(fig, include_plotlyjs)}
     
     def _get_form_data(self):
         """Extract and format form data"""
@@ -172,35 +332,47 @@ class MainRoutes:
     
     def get_recommendations(self):
         """Get gym recommendations for a specific location"""
+        return self._cached('get_recommendations', self._get_recommendations)
+    
+    def _get_recommendations(self):
         data = request.get_json()
         location = data.get('location', 'Boudha')
         gender = data.get('gender', 'Both')
         weight_class = data.get('weight_class', 'All')
         
-        gym_recommender = GymRecommender(self.data_loader.get_data())
-        recommendations = gym_recommender.recommend_gyms_by_location(location, gender, weight_class)
+        gym_recommender = self._service('gym_recommender')
+        with span('recommend'):
+            recommendations = gym_recommender.recommend_gyms_by_location(location, gender, weight_class)
         
         return jsonify(recommendations)
     
     def get_improvement_analysis(self):
         """Get improvement analysis for a location"""
+        return self._cached('get_improvement_analysis', self._get_improvement_analysis)
+    
+    def _get_improvement_analysis(self):
         data = request.get_json()
         location = data.get('location', 'Boudha')
         gender = data.get('gender', 'Both')
         
-        improvement_advisor = ImprovementAdvisor(self.data_loader.get_data())
-        analysis = improvement_advisor.get_comprehensive_analysis(location, gender)
-        
+        report_cache = self._dataset().extensions['report_cache']
+        analysis = self.single_flight.do(
+            'improvement_analysis', self._flight_key(location, gender),
+            lambda: report_cache.get(location, gender, self._snapshot())
+        )
         return jsonify(analysis)
     
     def get_suggestions(self):
         """Get improvement suggestions for a gym or boxer"""
+        return self._cached('get_suggestions', self._get_suggestions)
+    
+    def _get_suggestions(self):
         data = request.get_json()
         entity_type = data.get('type', 'gym')  # 'gym' or 'boxer'
         entity_name = data.get('name')
         location = data.get('location')
         
-        improvement_advisor = ImprovementAdvisor(self.data_loader.get_data())
+        improvement_advisor = self._service('improvement_advisor')
         
         if entity_type == 'gym':
             suggestions = improvement_advisor.get_gym_suggestions(entity_name, location)
@@ -221,8 +393,45 @@ class MainRoutes:
         else:
             return jsonify({'error': 'Invalid entity type'}), 400
     
+    def get_bulk_suggestions(self):
+        """Get improvement suggestions for many gyms/boxers in one request"""
+        data = request.get_json()
+        if not isinstance(data, dict):
+            return jsonify({'error': 'Request body must be a JSON object'}), 400
+        items = data.get('items')
+        location = data.get('location')
+        
+        if not items and not location:
+            return jsonify({'error': 'Provide either items or a location'}), 400
+        if items and not (
+            isinstance(items, list)
+            and all(isinstance(item, dict) and isinstance(item.get('name'), str) for item in items)
+        ):
+            return jsonify({'error': 'items must be a list of objects, each with a string name'}), 400
+        if not items and not isinstance(location, str):
+            return jsonify({'error': 'location must be a string'}), 400
+        
+        improvement_advisor = self._service('improvement_advisor')
+        
+        if items:
+            results = improvement_advisor.get_bulk_suggestions(items)
+        else:
+            results = improvement_advisor.get_location_gym_suggestions(location)
+        
+        return jsonify({'results': results})
+    
     def export_csv(self):
-        """Export filtered data as CSV"""
+        """Export filtered data as CSV (optionally gzipped), Parquet or Arrow, streamed in row chunks"""
+        return self._cached('export_csv', self._export_csv)
+    
+    def _export_csv(self):
+        export_format = request.args.get('format', 'csv')
+        compression = request.args.get('compression') or None
+        try:
+            self.exporter.check_format(export_format, compression)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
         form_data = {
             'mode': request.args.get('mode', 'Gym'),
             'gender': request.args.get('gender', 'Both'),
@@ -230,24 +439,48 @@ class MainRoutes:
             'selected_gyms': request.args.getlist('gyms'),
             'selected_boxers': request.args.getlist('boxers'),
             'year': request.args.get('year', 'All Years'),
-            'weight': request.args.get('weight', 'All')
+            'weight': request.args.get('weight', 'All'),
+            'gym': request.args.get('gym', 'All Gyms')
         }
         
-        data_filter = DataFilter(self.data_loader.get_data())
-        filtered_data = data_filter.apply_filters(form_data)
-        
-        # Create CSV in memory
-        output = io.StringIO()
-        filtered_data.to_csv(output, index=False)
-        output.seek(0)
+        data_filter = self._service('data_filter')
+        with span('filter'):
+            filtered_data = data_filter.apply_filters(form_data)
         
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        return send_file(
-            io.BytesIO(output.getvalue().encode()),
-            mimetype='text/csv',
-            as_attachment=True,
-            download_name=f'boxing_data_export_{timestamp}.csv'
+        # Encoded chunk by chunk as the client reads, instead of building the whole file first.
+        # Named after the data version rather than the time, as the headers are covered by the ETag
+        filename = self.exporter.filename(
+            f'boxing_data_export_{self._snapshot().version}', export_format, compression
         )
+        return Response(
+            self.exporter.stream(filtered_data, export_format, compression),
+            mimetype=self.exporter.mimetype(export_format, compression),
+            headers={'Content-Disposition': f'attachment; filename={filename}'}
+        )
+    
+    def leaderboard(self):
+        """Paginated percentile leaderboard of boxers or gyms within a scope"""
+        try:
+            page = int(request.args.get('page', 1))
+            per_page = min(int(request.args.get('per_page', 20)), 100)
+        except ValueError:
+            return jsonify({'error': 'page and per_page must be integers'}), 400
+        
+        try:
+            leaderboard = self._service('leaderboard')
+            result = leaderboard.get_page(
+                entity=request.args.get('entity', 'gym'),
+                gender=request.args.get('gender', 'Both'),
+                weight_class=request.args.get('weight_class', 'All'),
+                location=request.args.get('location', 'All Locations'),
+                year=request.args.get('year', 'All Years'),
+                page=page,
+                per_page=per_page
+            )
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        return jsonify(result)
     
     # def predict_boxer_performance(self):
     #     """Predict future performance for a boxer using ML"""
@@ -259,96 +492,99 @@ class MainRoutes:
     #         return jsonify({'error': 'Boxer name is required'}), 400
         
     #     try:
-    #         ml_predictor = MLPredictor(self.data_loader.get_data())
+    #         ml_predictor = MLPredictor(self._snapshot().df)
     #         prediction = ml_predictor.predict_boxer_performance(boxer_name, future_years)
             
     #         if prediction:
-    #             return jsonify(convert_to_native_types(prediction))
+    #             return jsonify(prediction)
     #         else:
     #             return jsonify({'error': 'Could not generate prediction. Not enough data.'}), 400
     #     except Exception as e:
     #         return jsonify({'error': str(e)}), 500
     
-    # def ml_recommend_gyms(self):
-    #     """Get ML-based gym recommendations for a boxer"""
-    #     data = request.get_json()
-    #     boxer_name = data.get('boxer_name')
-    #     location = data.get('location', None)
-    #     top_k = data.get('top_k', 5)
+    def ml_recommend_gyms(self):
+        """Get ML-based gym recommendations for a boxer"""
+        data = request.get_json()
+        boxer_name = data.get('boxer_name')
+        location = data.get('location', None)
+        top_k = data.get('top_k', 5)
         
-    #     if not boxer_name:
-    #         return jsonify({'error': 'Boxer name is required'}), 400
+        if not boxer_name:
+            return jsonify({'error': 'Boxer name is required'}), 400
         
-    #     try:
-    #         ml_recommender = MLGymRecommender(self.data_loader.get_data())
-    #         recommendations = ml_recommender.recommend_gyms_for_boxer(boxer_name, location, top_k)
+        try:
+            ml_recommender = self._service('ml_gym_recommender')
+            recommendations = ml_recommender.recommend_gyms_for_boxer(boxer_name, location, top_k)
             
-    #         return jsonify(convert_to_native_types({
-    #             'boxer_name': boxer_name,
-    #             'recommendations': recommendations
-    #         }))
-    #     except Exception as e:
-    #         return jsonify({'error': str(e)}), 500
+            return jsonify({
+                'boxer_name': boxer_name,
+                'recommendations': recommendations
+            })
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
     
-    # def detect_anomalies(self):
-    #     """Detect underperforming boxers and gyms"""
-    #     data = request.get_json()
-    #     entity_type = data.get('type', 'all')  # 'boxers', 'gyms', or 'all'
+    def detect_anomalies(self):
+        """Detect underperforming boxers and gyms"""
+        data = request.get_json()
+        entity_type = data.get('type', 'all')  # 'boxers', 'gyms', or 'all'
         
-    #     try:
-    #         detector = AnomalyDetector(self.data_loader.get_data())
+        try:
+            detector = self._service('anomaly_detector')
             
-    #         result = {}
-    #         if entity_type in ['boxers', 'all']:
-    #             result['underperforming_boxers'] = detector.detect_underperforming_boxers()
+            result = {}
+            if entity_type in ['boxers', 'all']:
+                result['underperforming_boxers'] = detector.detect_underperforming_boxers()
             
-    #         if entity_type in ['gyms', 'all']:
-    #             result['underperforming_gyms'] = detector.detect_underperforming_gyms()
+            if entity_type in ['gyms', 'all']:
+                result['underperforming_gyms'] = detector.detect_underperforming_gyms()
             
-    #         return jsonify(convert_to_native_types(result))
-    #     except Exception as e:
-    #         return jsonify({'error': str(e)}), 500
+            return jsonify(result)
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
     
-    # def get_ml_insights(self):
-    #     """Get comprehensive ML insights"""
-    #     try:
-    #         detector = AnomalyDetector(self.data_loader.get_data())
-    #         insights = detector.get_insights()
+    def get_ml_insights(self):
+        """Get comprehensive ML insights"""
+        try:
+            detector = self._service('anomaly_detector')
+            insights = detector.get_insights()
             
-    #         # Add prediction insights
-    #         ml_predictor = MLPredictor(self.data_loader.get_data())
-    #         top_predictions = ml_predictor.predict_all_boxers_next_year()
-    #         insights['top_predicted_performers'] = top_predictions[:10]  # Top 10
+            # Add prediction insights
+            predictor = self._service('career_predictor')
+            top_predictions = predictor.predict_all_boxers_next_year()
+            insights['top_predicted_performers'] = top_predictions[:10]  # Top 10
             
-    #         return jsonify(convert_to_native_types(insights))
-    #     except Exception as e:
-    #         return jsonify({'error': str(e)}), 500
+            return jsonify(insights)
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
     
-    # def predict_career(self):
-    #     """Predict boxer career trajectory"""
-    #     data = request.get_json()
-    #     boxer_name = data.get('boxer_name')
+    def predict_career(self):
+        """Predict boxer career trajectory"""
+        data = request.get_json()
+        boxer_name = data.get('boxer_name')
         
-    #     if not boxer_name:
-    #         return jsonify({'error': 'Boxer name is required'}), 400
+        if not boxer_name:
+            return jsonify({'error': 'Boxer name is required'}), 400
         
-    #     try:
-    #         predictor = CareerPredictor(self.data_loader.get_data())
-    #         prediction = predictor.predict_career_trajectory(boxer_name)
+        try:
+            predictor = self._service('career_predictor')
+            prediction = predictor.predict_career_trajectory(boxer_name)
             
-    #         if prediction:
-    #             # Get similar successful boxers
-    #             similar = predictor.find_similar_successful_boxers(boxer_name, top_k=3)
-    #             prediction['similar_successful_boxers'] = similar
+            if prediction:
+                # Get similar successful boxers
+                similar = predictor.find_similar_successful_boxers(boxer_name, top_k=3)
+                prediction['similar_successful_boxers'] = similar
                 
-    #             return jsonify(convert_to_native_types(prediction))
-    #         else:
-    #             return jsonify({'error': 'Could not generate career prediction. Not enough data.'}), 400
-    #     except Exception as e:
-    #         return jsonify({'error': str(e)}), 500
+                return jsonify(prediction)
+            else:
+                return jsonify({'error': 'Could not generate career prediction. Not enough data.'}), 400
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
     
     def find_fair_matches(self):
         """Find fair matches for a boxer"""
+        return self._cached('find_fair_matches', self._find_fair_matches)
+    
+    def _find_fair_matches(self):
         data = request.get_json()
         boxer_name = data.get('boxer_name')
         top_k = data.get('top_k', 5)
@@ -357,15 +593,153 @@ class MainRoutes:
             return jsonify({'error': 'Boxer name is required'}), 400
         
         try:
-            match_maker = MatchMaker(self.data_loader.get_data())
-            matches = match_maker.find_fair_matches(boxer_name, top_k)
+            match_maker = self._service('match_maker')
+            matches = self.single_flight.do(
+                'fair_matches', self._flight_key(boxer_name, top_k),
+                lambda: match_maker.find_fair_matches(boxer_name, top_k)
+            )
             
-            return jsonify(convert_to_native_types({
+            return jsonify({
                 'boxer_name': boxer_name,
                 'matches': matches
-            }))
+            })
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
+    
+    def simulate_tournament(self):
+        """Estimate who is likely to win a bracket of boxers"""
+        data = request.get_json()
+        if not isinstance(data, dict):
+            return jsonify({'error': 'Request body must be a JSON object'}), 400
+        bracket = data.get('boxers') or []
+        seed = data.get('seed')
+        
+        if not isinstance(bracket, list) or not all(isinstance(name, str) for name in bracket):
+            return jsonify({'error': 'boxers must be a list of boxer names'}), 400
+        # bool is an int subclass, but true/false is not a seed
+        if seed is not None and (not isinstance(seed, int) or isinstance(seed, bool)):
+            return jsonify({'error': 'seed must be an integer'}), 400
+        
+        try:
+            simulations = int(data.get('simulations', 100000))
+            workers = int(data.get('workers', 1))
+        except (TypeError, ValueError):
+            return jsonify({'error': 'simulations and workers must be integers'}), 400
+        
+        if not 0 < simulations <= self.app.config['TOURNAMENT_MAX_SIMULATIONS']:
+            return jsonify({'error': f"simulations must be between 1 and {self.app.config['TOURNAMENT_MAX_SIMULATIONS']}"}), 400
+        workers = max(1, min(workers, self.app.config['TOURNAMENT_MAX_WORKERS']))
+        
+        try:
+            simulator = self._service('tournament_simulator')
+            with span('simulate'):
+                result = simulator.simulate(bracket, simulations, seed, workers)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
+        
+        return jsonify(result)
+    
+    def ingest_results(self):
+        """Append new fight results (one object, a list, or {"results": [...]}) to the dataset"""
+        data = request.get_json(silent=True)
+        records = data.get('results', data) if isinstance(data, dict) else data
+        
+        try:
+            snapshot, applied = self._dataset().loader.apply_results(records)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         except Exception as e:
             return jsonify({'error': str(e)}), 500
+        
+        return jsonify({
+            'applied': applied,
+            'version': snapshot.version,
+            'total_rows': len(snapshot.df)
+        })
+    
+    def ingest_bouts(self):
+        """Record per-bout results (date, boxer, opponent, result, venue) for known boxers"""
+        data = request.get_json(silent=True)
+        records = data.get('bouts', data) if isinstance(data, dict) else data
+        
+        try:
+            snapshot, applied = self._dataset().loader.apply_bouts(records)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
+        
+        return jsonify({
+            'applied': applied,
+            'version': snapshot.version,
+            'total_bouts': len(snapshot.bouts)
+        })
+    
+    def list_datasets(self):
+        """Configured datasets and which of them are currently loaded"""
+        loaded = self.datasets.loaded_names()
+        return jsonify([
+            {'name': name, 'loaded': name in loaded} for name in self.datasets.names()
+        ])
+    
+    def ready(self):
+        """Readiness probe: 503 until warm-up has finished and the default dataset has data"""
+        # Probes run constantly, so they only look: loading here would churn the dataset LRU
+        dataset = self.datasets.peek()
+        snapshot = dataset.loader.get_snapshot() if dataset is not None else None
+        if not self.app.extensions.get('warmed_up') or snapshot is None or snapshot.df.empty:
+            return jsonify({'ready': False}), 503
+        return jsonify({'ready': True, 'pid': os.getpid(), 'version': snapshot.version})
+    
+    def _start_request_metrics(self):
+        g.metrics_token = self.metrics.bind(request.endpoint or 'unmatched')
+        g.request_start = time.perf_counter()
+    
+    def _finish_request_metrics(self, exc):
+        if 'metrics_token' not in g:
+            return
+        self.metrics.observe('request_duration_seconds', (('route', request.endpoint or 'unmatched'),),
+                             time.perf_counter() - g.request_start)
+        self.metrics.unbind(g.pop('metrics_token'))
+    
+    def _add_metric_collectors(self):
+        """Hit and coalescing counters the caches already keep, read only when /metrics is scraped"""
+        def response_cache_events():
+            stats = self.response_cache.stats()
+            return [({'event': event}, stats[event]) for event in ('hits', 'misses', 'not_modified', 'evictions')]
+        
+        def response_cache_size():
+            stats = self.response_cache.stats()
+            return [({'unit': 'entries'}, stats['entries']), ({'unit': 'bytes'}, stats['bytes'])]
+        
+        def coalesced_calls():
+            return [
+                ({'computation': name, 'outcome': outcome}, counts[outcome])
+                for name, counts in sorted(self.single_flight.stats().items())
+                for outcome in ('executed', 'coalesced')
+            ]
+        
+        def datasets_loaded():
+            return [({}, len(self.datasets.loaded_names()))]
+        
+        self.metrics.add_collector('response_cache_events_total', 'counter', 'Response cache lookups by outcome', response_cache_events)
+        self.metrics.add_collector('response_cache_size', 'gauge', 'Responses held by the response cache', response_cache_size)
+        self.metrics.add_collector('coalesced_calls_total', 'counter', 'Coalesced computations run or shared', coalesced_calls)
+        self.metrics.add_collector('datasets_loaded', 'gauge', 'Datasets currently loaded in this process', datasets_loaded)
+    
+    def metrics_text(self):
+        """Stage latencies and cache counters of this process in the Prometheus text format"""
+        return Response(self.metrics.render(), mimetype='text/plain; version=0.0.4')
+    
+    def coalescing_stats(self):
+        """How often each coalesced computation ran and how many requests shared a running one"""
+        return jsonify(self.single_flight.stats())
+    
+    def boxer_bouts(self, boxer_name):
+        """A boxer's recorded bouts and head-to-head record per opponent"""
+        return jsonify(BoutStore.opponent_summary(self._snapshot().bouts, boxer_name))
     
     # def find_training_partners(self):
     #     """Find training partners for a boxer"""
@@ -377,13 +751,13 @@ class MainRoutes:
     #         return jsonify({'error': 'Boxer name is required'}), 400
         
     #     try:
-    #         match_maker = MatchMaker(self.data_loader.get_data())
+    #         match_maker = MatchMaker(self._snapshot().df)
     #         partners = match_maker.find_training_partners(boxer_name, top_k)
             
-    #         return jsonify(convert_to_native_types({
+    #         return jsonify({
     #             'boxer_name': boxer_name,
     #             'training_partners': partners
-    #         }))
+    #         })
     #     except Exception as e:
     #         return jsonify({'error': str(e)}), 500
 
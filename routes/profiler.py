@@ -0,0 +1,205 @@
+# routes/profiler.py
+import cProfile
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from flask import request, g, abort, render_template, send_from_directory
+
+class _Sampler:
+    """Samples one thread's stack at a fixed interval into collapsed (flamegraph) stacks"""
+    
+    def __init__(self, thread_id, interval):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+    
+    def start(self):
+        self._thread.start()
+    
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+    
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                self.stacks[';'.join(reversed(stack))] += 1
+    
+    def dump(self, path):
+        with open(path, 'w') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+class RequestProfiler:
+    """Opt-in cProfile or sampling profiles of single requests, kept in a bounded on-disk ring buffer"""
+    
+    KINDS = {'cprofile': '.prof', 'sample': '.folded'}
+    
+    def __init__(self, app):
+        self.app = app
+        self.directory = app.config['PROFILE_DIR']
+        self.max_profiles = app.config['PROFILE_MAX_FILES']
+        self.allowed_addresses = set(app.config['PROFILE_ALLOWED_ADDRESSES'])
+        self.header = app.config['PROFILE_HEADER']
+        self.sample_interval = app.config['PROFILE_SAMPLE_INTERVAL']
+        # One profile at a time: profilers are per thread and cost the request they run in
+        self._lock = threading.Lock()
+        
+        os.makedirs(self.directory, exist_ok=True)
+        app.add_url_rule('/profiles', 'profiles', self.index)
+        app.add_url_rule('/profiles/<path:filename>', 'profile_file', self.download)
+        app.before_request(self._start)
+        app.after_request(self._tag_response)
+        app.teardown_request(self._finish)
+    
+    def _allowed(self):
+        return request.remote_addr in self.allowed_addresses
+    
+    def _requested_kind(self):
+        """'cprofile', 'sample' or None from `?profile=1|sample` or the profile header"""
+        value = request.args.get('profile') or request.headers.get(self.header)
+        if not value or value in ('0', 'false'):
+            return None
+        return 'sample' if value == 'sample' else 'cprofile'
+    
+    def _start(self):
+        if request.endpoint in ('profiles', 'profile_file'):
+            return
+        kind = self._requested_kind()
+        if kind is None or not self._allowed():
+            return
+        if not self._lock.acquire(blocking=False):
+            g.profile_skipped = True
+            return
+        
+        name = f"{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}-{os.getpid()}-{request.endpoint or 'unmatched'}"
+        if kind == 'sample':
+            profiler = _Sampler(threading.get_ident(), self.sample_interval)
+            profiler.start()
+        else:
+            profiler = cProfile.Profile()
+            profiler.enable()
+        g.profile = {
+            'name': name, 'kind': kind, 'profiler': profiler, 'start': time.perf_counter(), 'status': 500,
+            # Taken now: a streamed response is finished after the request context is gone
+            'request': {
+                'route': request.endpoint,
+                'method': request.method,
+                'path': request.path,
+                'params': self._params()
+            }
+        }
+    
+    def _tag_response(self, response):
+        if 'profile' in g:
+            profile = g.profile
+            profile['status'] = response.status_code
+            response.headers['X-Profile-Id'] = profile['name']
+            if response.is_streamed:
+                # The body (an export) is produced while the server sends it, after teardown,
+                # so the profile runs until the server closes the response
+                profile['streamed'] = True
+                response.call_on_close(lambda: self._save(profile))
+        elif g.get('profile_skipped'):
+            response.headers['X-Profile-Skipped'] = 'another profile is running'
+        return response
+    
+    def _finish(self, exc):
+        profile = g.pop('profile', None)
+        if profile is None or profile.get('streamed'):
+            return
+        self._save(profile)
+    
+    def _save(self, profile):
+        """Stop the profiler, write its data and metadata, and let the next profile start"""
+        try:
+            profiler = profile['profiler']
+            if profile['kind'] == 'sample':
+                profiler.stop()
+            else:
+                profiler.disable()
+            duration = time.perf_counter() - profile['start']
+            
+            data_file = profile['name'] + self.KINDS[profile['kind']]
+            if profile['kind'] == 'sample':
+                profiler.dump(os.path.join(self.directory, data_file))
+            else:
+                profiler.dump_stats(os.path.join(self.directory, data_file))
+            
+            meta = {
+                'name': profile['name'],
+                'file': data_file,
+                'kind': profile['kind'],
+                **profile['request'],
+                'status': profile['status'],
+                'duration_ms': round(duration * 1000, 1),
+                'pid': os.getpid(),
+                'created': datetime.now().isoformat(timespec='seconds')
+            }
+            # The metadata is written last: a profile is listed only once its data is complete
+            with open(os.path.join(self.directory, profile['name'] + '.json'), 'w') as f:
+                json.dump(meta, f)
+            self._trim()
+        except Exception as e:
+            print(f"Error saving profile: {e}")
+        finally:
+            self._lock.release()
+    
+    @staticmethod
+    def _params():
+        params = {'args': request.args.to_dict(flat=False), 'form': request.form.to_dict(flat=False)}
+        body = request.get_json(silent=True) if request.is_json else None
+        if body is not None:
+            params['json'] = body
+        text = json.dumps(params, default=str)
+        # Large bodies (bulk ingest) are cut down; the index only needs enough to tell requests apart
+        return text if len(text) <= 2000 else text[:2000] + '...'
+    
+    def _profiles(self):
+        """Metadata of the stored profiles, newest first"""
+        profiles = []
+        for filename in os.listdir(self.directory):
+            if not filename.endswith('.json'):
+                continue
+            try:
+                with open(os.path.join(self.directory, filename)) as f:
+                    profiles.append(json.load(f))
+            except (OSError, ValueError):
+                continue
+        return sorted(profiles, key=lambda meta: meta['name'], reverse=True)
+    
+    def _trim(self):
+        """Drop the oldest profiles beyond PROFILE_MAX_FILES (shared by every worker process)"""
+        for meta in self._profiles()[self.max_profiles:]:
+            for filename in (meta['name'] + '.json', meta['file']):
+                try:
+                    os.remove(os.path.join(self.directory, filename))
+                except FileNotFoundError:
+                    pass
+    
+    def index(self):
+        """Recent profiles with their routes and parameters"""
+        if not self._allowed():
+            abort(404)
+        return render_template("profiles.html", profiles=self._profiles(), header=self.header)
+    
+    def download(self, filename):
+        if not self._allowed():
+            abort(404)
+        return send_from_directory(self.directory, filename, as_attachment=True)
+    
+    def after_fork(self):
+        # A profile the parent was running belongs to a thread that does not exist here
+        self._lock = threading.Lock()
@@ -0,0 +1,74 @@
+# routes/response_cache.py
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from flask import Response
+
+class ResponseCache:
+    """Encoded responses by strong ETag, evicting the least recently used beyond a byte budget"""
+    
+    # Recomputed by Werkzeug for every response it sends
+    SKIPPED_HEADERS = {'content-length', 'etag', 'cache-control'}
+    
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._size = 0
+        self._counts = {'hits': 0, 'misses': 0, 'not_modified': 0, 'evictions': 0}
+    
+    @staticmethod
+    def make_etag(route, dataset, version, params):
+        """Same route, parameters and data version give the same bytes, so the tag is strong"""
+        key = json.dumps([route, dataset, version, params], sort_keys=True, default=str)
+        return hashlib.sha1(key.encode()).hexdigest()[:20]
+    
+    def get(self, etag):
+        """A fresh response with the cached body and headers, or None"""
+        with self._lock:
+            entry = self._entries.get(etag)
+            if entry is None:
+                self._counts['misses'] += 1
+                return None
+            self._entries.move_to_end(etag)
+            self._counts['hits'] += 1
+        body, headers = entry
+        return Response(body, headers=headers)
+    
+    def put(self, etag, response):
+        """Keep a successful, fully built response; streamed ones (exports) only get the ETag"""
+        if response.status_code != 200 or response.is_streamed:
+            return
+        body = response.get_data()
+        if len(body) > self.max_bytes:
+            return
+        headers = [(name, value) for name, value in response.headers if name.lower() not in self.SKIPPED_HEADERS]
+        
+        with self._lock:
+            previous = self._entries.pop(etag, None)
+            if previous is not None:
+                self._size -= len(previous[0])
+            self._entries[etag] = (body, headers)
+            self._size += len(body)
+            while self._size > self.max_bytes:
+                _, (evicted, _) = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+                self._counts['evictions'] += 1
+    
+    def not_modified(self):
+        with self._lock:
+            self._counts['not_modified'] += 1
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+    
+    def stats(self):
+        with self._lock:
+            return dict(self._counts, entries=len(self._entries), bytes=self._size, max_bytes=self.max_bytes)
+    
+    def after_fork(self):
+        # The parent's entries stay valid: tags include the data version
+        self._lock = threading.Lock()
@@ -0,0 +1,176 @@
+# serve.py
+import argparse
+import os
+import select
+import signal
+import socket
+import threading
+import time
+from werkzeug.serving import make_server
+from config import Config
+from app import create_app, warm_up
+
+class PreforkServer:
+    """Master process that preloads the app, then forks threaded workers sharing its memory copy-on-write"""
+    
+    def __init__(self, app, host, port, workers):
+        self.app = app
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self._socket = None
+        # pid -> generation; a graceful restart starts a new generation before stopping the old one
+        self._children = {}
+        self._stopping = {}
+        self._generation = 0
+        self._stop_requested = False
+        self._restart_requested = False
+    
+    def run(self):
+        self._socket = socket.create_server((self.host, self.port), backlog=Config.SERVE_BACKLOG)
+        self._socket.set_inheritable(True)
+        signal.signal(signal.SIGTERM, self._request_stop)
+        signal.signal(signal.SIGINT, self._request_stop)
+        signal.signal(signal.SIGHUP, self._request_restart)
+        
+        print(f"Master {os.getpid()} serving http://{self.host}:{self.port}/ with {self.workers} workers")
+        print("Send SIGHUP for a graceful restart, SIGTERM or CTRL+C to stop")
+        self._spawn(self.workers)
+        try:
+            while not self._stop_requested:
+                if self._restart_requested:
+                    self._restart_requested = False
+                    self._restart()
+                self._reap()
+                time.sleep(0.2)
+        finally:
+            self._stop_workers(list(self._children))
+            while self._children:
+                self._reap()
+                time.sleep(0.1)
+            self._socket.close()
+    
+    def _request_stop(self, signum, frame):
+        self._stop_requested = True
+    
+    def _request_restart(self, signum, frame):
+        self._restart_requested = True
+    
+    def _restart(self):
+        """Reload the data and warm up again in the master, then replace workers once the new ones accept"""
+        print("Graceful restart: reloading data")
+        datasets = self.app.extensions['datasets']
+        for name in datasets.loaded_names():
+            # Also replays results the old workers ingested, which the master never saw
+            datasets.get(name).loader.load_data()
+        warm_up(self.app)
+        
+        old_workers = [pid for pid, generation in self._children.items() if generation == self._generation]
+        self._generation += 1
+        self._spawn(self.workers)
+        self._stop_workers(old_workers)
+    
+    def _spawn(self, count):
+        """Fork `count` workers of the current generation and wait until each one is accepting"""
+        ready_pipes = [self._spawn_worker() for _ in range(count)]
+        deadline = time.monotonic() + Config.SERVE_READY_TIMEOUT
+        for ready_fd in ready_pipes:
+            try:
+                remaining = max(0, deadline - time.monotonic())
+                if not select.select([ready_fd], [], [], remaining)[0] or not os.read(ready_fd, 1):
+                    print("A worker did not report ready in time")
+            finally:
+                os.close(ready_fd)
+    
+    def _spawn_worker(self):
+        ready_fd, ready_write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(ready_fd)
+            exit_code = 1
+            try:
+                exit_code = self._serve_worker(ready_write_fd)
+            except Exception as e:
+                print(f"Worker {os.getpid()} failed: {e}")
+            finally:
+                # Skip the master's atexit handlers and thread pools
+                os._exit(exit_code)
+        
+        os.close(ready_write_fd)
+        self._children[pid] = self._generation
+        return ready_fd
+    
+    def _serve_worker(self, ready_fd):
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        signal.signal(signal.SIGHUP, signal.SIG_IGN)
+        
+        # Only the forking thread exists in the child; recreate locks, pools and watcher threads
+        for extension in self.app.extensions.values():
+            if hasattr(extension, 'after_fork'):
+                extension.after_fork()
+        
+        server = make_server(self.host, self.port, self.app, threaded=True, fd=self._socket.fileno())
+        # Non-daemon request threads are joined by server_close, so in-flight requests finish
+        server.daemon_threads = False
+        
+        def stop(signum, frame):
+            # shutdown() waits for serve_forever to return, so it cannot run on the serving thread
+            threading.Thread(target=server.shutdown, daemon=True).start()
+        signal.signal(signal.SIGTERM, stop)
+        
+        os.write(ready_fd, b'1')
+        os.close(ready_fd)
+        print(f"Worker {os.getpid()} ready")
+        server.serve_forever()
+        server.server_close()
+        return 0
+    
+    def _stop_workers(self, pids):
+        """Ask workers to finish in-flight requests and exit; they are killed after the graceful timeout"""
+        deadline = time.monotonic() + Config.SERVE_GRACEFUL_TIMEOUT
+        for pid in pids:
+            if pid in self._stopping:
+                continue
+            self._stopping[pid] = deadline
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+    
+    def _reap(self):
+        """Collect exited workers, replace unexpected exits and kill workers past the graceful timeout"""
+        while self._children:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if pid == 0:
+                break
+            generation = self._children.pop(pid, None)
+            expected = self._stopping.pop(pid, None) is not None
+            if generation == self._generation and not expected and not self._stop_requested:
+                print(f"Worker {pid} exited unexpectedly ({status}), starting a replacement")
+                self._spawn(1)
+        
+        now = time.monotonic()
+        for pid, deadline in list(self._stopping.items()):
+            if now > deadline:
+                self._stopping[pid] = float('inf')
+                try:
+                    os.kill(pid, signal.SIGKILL)
+                except ProcessLookupError:
+                    pass
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the dashboard with a preloaded master and forked workers")
+    parser.add_argument('--host', default=Config.SERVE_HOST)
+    parser.add_argument('--port', type=int, default=Config.SERVE_PORT)
+    parser.add_argument('--workers', type=int, default=Config.SERVE_WORKERS)
+    args = parser.parse_args()
+    
+    # Loads the default dataset and warms its caches once, before any worker exists
+    app = create_app()
+    PreforkServer(app, args.host, args.port, args.workers).run()
+
+if __name__ == "__main__":
+    main()
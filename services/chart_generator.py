@@ -7,6 +7,7 @@ import plotly.express as px
 import plotly.io as pio
 import pandas as pd
 import random
+from services.metrics import span
 
 class ChartGenerator:
     @staticmethod
@@ -17,7 +18,8 @@ class ChartGenerator:
         
         # Apply filtering for "All Locations" to show only top performers
         if location == "All Locations":
-            filtered_data = ChartGenerator._filter_top_performers(filtered_data, mode)
+            with span('chart.top_performers'):
+                filtered_data = ChartGenerator._filter_top_performers(filtered_data, mode)
         
         if diagram_type == "Bar Chart":
             return ChartGenerator._generate_bar_chart(filtered_data, mode, selected_boxers, selected_gyms, year, location, gender)
@@ -471,7 +473,7 @@ class ChartGenerator:
         boxer_progress = []
         for boxer in boxers_to_show:
             boxer_data = filtered_data[filtered_data['Boxer_Name'] == boxer]
-            for year_val in sorted(boxer_data['Year'].unique()):
+            for year_val in sorted(boxer_data['Year'].dropna().unique()):
                 year_data = boxer_data[boxer_data['Year'] == year_val]
                 total_wins = year_data['Wins'].sum()
                 total_losses = year_data['Losses'].sum()
@@ -541,7 +543,7 @@ class ChartGenerator:
                 display_name = gym
                 color_by = 'Gym'
             
-            for year_val in sorted(gym_data['Year'].unique()):
+            for year_val in sorted(gym_data['Year'].dropna().unique()):
                 year_data = gym_data[gym_data['Year'] == year_val]
                 total_wins = year_data['Wins'].sum()
                 total_losses = year_data['Losses'].sum()
@@ -712,6 +714,6 @@ class ChartGenerator:
         return None
 
     @staticmethod
-    def chart_to_html(fig):
-        """Convert plotly figure to HTML"""
-        return pio.to_html(fig, full_html=False) if fig else "<p>No data available for the selected filters.</p>"
\ No newline at end of file
+    def chart_to_html(fig, include_plotlyjs=True):
+        """Convert plotly figure to HTML; without the plotly.js bundle for pages that already load it"""
+        return pio.to_html(fig, full_html=False, include_plotlyjs=include_plotlyjs) if fig else "<p>No data available for the selected filters.</p>"
\ No newline at end of file
@@ -0,0 +1,101 @@
+# services/data_exporter.py
+import io
+import zlib
+from config import Config
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that hands out whatever was written since the last drain"""
+    
+    def __init__(self):
+        self._chunks = []
+    
+    def writable(self):
+        return True
+    
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+    
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+class DataExporter:
+    """Filtered rows streamed as CSV (optionally gzipped), Parquet or Arrow IPC, a chunk of rows at a time"""
+    
+    FORMATS = {
+        'csv': {'mimetype': 'text/csv', 'extension': 'csv', 'needs_pyarrow': False},
+        'parquet': {'mimetype': 'application/vnd.apache.parquet', 'extension': 'parquet', 'needs_pyarrow': True},
+        'arrow': {'mimetype': 'application/vnd.apache.arrow.stream', 'extension': 'arrow', 'needs_pyarrow': True}
+    }
+    
+    def __init__(self, chunk_rows=None):
+        self.chunk_rows = chunk_rows or Config.EXPORT_CHUNK_ROWS
+    
+    def check_format(self, fmt, compression=None):
+        """ValueError when `fmt`/`compression` is unknown or needs pyarrow that is not installed"""
+        if fmt not in self.FORMATS:
+            raise ValueError(f"Unknown export format '{fmt}', use one of: {', '.join(self.FORMATS)}")
+        if compression not in (None, 'gzip'):
+            raise ValueError("compression must be 'gzip'")
+        if compression and fmt != 'csv':
+            raise ValueError("gzip compression is only available for csv; parquet is compressed already")
+        if self.FORMATS[fmt]['needs_pyarrow'] and pa is None:
+            raise ValueError(f"The {fmt} format needs pyarrow, which is not installed")
+    
+    def mimetype(self, fmt, compression=None):
+        return 'application/gzip' if compression == 'gzip' else self.FORMATS[fmt]['mimetype']
+    
+    def filename(self, basename, fmt, compression=None):
+        extension = self.FORMATS[fmt]['extension']
+        return f"{basename}.{extension}.gz" if compression == 'gzip' else f"{basename}.{extension}"
+    
+    def stream(self, df, fmt='csv', compression=None):
+        """Generator of the encoded export; only one chunk of rows is encoded in memory at a time"""
+        self.check_format(fmt, compression)
+        if fmt == 'csv':
+            chunks = self._csv_chunks(df)
+            return self._gzip(chunks) if compression == 'gzip' else chunks
+        if fmt == 'parquet':
+            return self._arrow_chunks(df, lambda sink, schema: pq.ParquetWriter(sink, schema))
+        return self._arrow_chunks(df, lambda sink, schema: pa.ipc.new_stream(sink, schema))
+    
+    def _row_chunks(self, df):
+        for start in range(0, max(len(df), 1), self.chunk_rows):
+            yield start, df.iloc[start:start + self.chunk_rows]
+    
+    def _csv_chunks(self, df):
+        for start, chunk in self._row_chunks(df):
+            yield chunk.to_csv(index=False, header=start == 0).encode()
+    
+    @staticmethod
+    def _gzip(chunks):
+        compressor = zlib.compressobj(6, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+        for chunk in chunks:
+            data = compressor.compress(chunk)
+            if data:
+                yield data
+        yield compressor.flush()
+    
+    def _arrow_chunks(self, df, open_writer):
+        sink = _ChunkSink()
+        schema = pa.Schema.from_pandas(df, preserve_index=False)
+        writer = open_writer(pa.PythonFile(sink, mode='w'), schema)
+        try:
+            for _, chunk in self._row_chunks(df):
+                # One record batch (Arrow) or row group (Parquet) per chunk of rows
+                writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+                data = sink.drain()
+                if data:
+                    yield data
+        finally:
+            writer.close()
+        yield sink.drain()
@@ -2,11 +2,19 @@
 import pandas as pd
 
 class DataFilter:
-    def __init__(self, data):
+    def __init__(self, data, store=None):
         self.data = data
+        # Optional SQLiteStore holding the same rows; filters are then run as SQL
+        self.store = store
     
     def apply_filters(self, filters):
         """Apply all filters to the dataset"""
+        if self.store is not None:
+            filtered = self.store.filter_rows(filters)
+            # None when the store has moved on to a newer snapshot than this one
+            if filtered is not None:
+                return filtered
+        
         filtered = self.data.copy()
         
         # Location filter
@@ -40,6 +48,46 @@ class DataFilter:
         
         return filtered
     
+    def get_available_boxers(self, filters, selected_gyms=None, gender="Both", location="All Locations"):
+        """Boxers list for rows matching `filters`, narrowed by gyms, gender and location"""
+        if self.store is None:
+            return self.get_boxers_with_gyms(selected_gyms, gender, location, self.apply_filters(filters))
+        
+        conditions, params = self.store.filter_conditions(filters)
+        if location != "All Locations":
+            conditions.append("Location = ?")
+            params.append(location)
+        if selected_gyms:
+            condition, gym_params = self.store.in_clause('Gym', selected_gyms)
+            conditions.append(condition)
+            params.extend(gym_params)
+        if gender != "Both":
+            conditions.append("Gender = ?")
+            params.append(gender)
+        
+        totals = self.store.boxer_totals(conditions, params)
+        if totals is None:
+            # The store has moved on to a newer snapshot than this one
+            return self.get_boxers_with_gyms(selected_gyms, gender, location, self.apply_filters(filters))
+        
+        available_boxers = []
+        for boxer_name, gym, boxer_location, boxer_gender, total_wins, total_losses in totals:
+            total_fights = total_wins + total_losses
+            win_ratio = total_wins / total_fights if total_fights > 0 else 0
+            available_boxers.append({
+                'value': boxer_name,
+                'display': f"{boxer_name} ({gym}, {boxer_location})",
+                'gym': gym,
+                'location': boxer_location,
+                'gender': boxer_gender,
+                'total_wins': int(total_wins),
+                'total_losses': int(total_losses),
+                'total_fights': int(total_fights),
+                'win_ratio': float(win_ratio)
+            })
+        
+        return available_boxers
+    
     def get_boxers_with_gyms(self, selected_gyms=None, gender="Both", location="All Locations", source_data=None):
         """Get boxers list with gym names for dropdown"""
         boxer_data = source_data.copy() if source_data is not None else self.data.copy()
@@ -2,20 +2,60 @@
 import pandas as pd
 
 class ImprovementAdvisor:
-    def __init__(self, data):
+    def __init__(self, data, gym_rollup=None):
         self.data = data
+        self._gym_rows = None
+        self._boxer_rows = None
+        # Optionally reuse the per-gym rollup the data snapshot already maintains
+        self._gym_rollup = gym_rollup
+        self._gym_boxer_rollup = None
+    
+    def _get_gym_rows(self, gym_name, location):
+        """Rows of one gym in one location, looked up from a shared group index"""
+        if self._gym_rows is None:
+            self._gym_rows = self.data.groupby(['Location', 'Gym'], sort=False).indices
+        positions = self._gym_rows.get((location, gym_name))
+        if positions is None:
+            return self.data.iloc[0:0]
+        return self.data.iloc[positions]
+    
+    def _get_boxer_rows(self, boxer_name):
+        """Rows of one boxer, looked up from a shared group index"""
+        if self._boxer_rows is None:
+            self._boxer_rows = self.data.groupby('Boxer_Name', sort=False).indices
+        positions = self._boxer_rows.get(boxer_name)
+        if positions is None:
+            return self.data.iloc[0:0]
+        return self.data.iloc[positions]
+    
+    def _get_gym_rollup(self):
+        """Wins, losses and roster size per (Location, Gym), computed once per advisor"""
+        if self._gym_rollup is None:
+            self._gym_rollup = self.data.groupby(['Location', 'Gym'], sort=False).agg(
+                wins=('Wins', 'sum'),
+                losses=('Losses', 'sum'),
+                boxers=('Boxer_Name', 'nunique')
+            )
+        return self._gym_rollup
+    
+    def _get_gym_boxer_rollup(self):
+        """Wins and losses per (Gym, Boxer_Name), computed once per advisor"""
+        if self._gym_boxer_rollup is None:
+            self._gym_boxer_rollup = self.data.groupby(['Gym', 'Boxer_Name'], sort=False).agg(
+                wins=('Wins', 'sum'),
+                losses=('Losses', 'sum')
+            )
+        return self._gym_boxer_rollup
     
     def get_gym_suggestions(self, gym_name, location):
         """Get 5 personalized improvement suggestions for a specific gym"""
         if self.data.empty:
             return []
         
-        gym_data = self.data[(self.data['Gym'] == gym_name) & (self.data['Location'] == location)]
+        gym_data = self._get_gym_rows(gym_name, location)
         if gym_data.empty:
             return []
         
-        location_data = self.data[self.data['Location'] == location]
-        
         suggestions = []
         
         # Calculate gym metrics
@@ -26,17 +66,11 @@ class ImprovementAdvisor:
         total_boxers = len(gym_data['Boxer_Name'].unique())
         
         # Compare with other gyms in location
-        other_gyms_win_ratios = []
-        other_gyms_boxer_counts = []
-        for other_gym in location_data['Gym'].unique():
-            if other_gym != gym_name:
-                other_gym_data = location_data[location_data['Gym'] == other_gym]
-                other_wins = other_gym_data['Wins'].sum()
-                other_losses = other_gym_data['Losses'].sum()
-                other_fights = other_wins + other_losses
-                if other_fights > 0:
-                    other_gyms_win_ratios.append(other_wins / other_fights)
-                other_gyms_boxer_counts.append(len(other_gym_data['Boxer_Name'].unique()))
+        other_gyms = self._get_gym_rollup().loc[location]
+        other_gyms = other_gyms[other_gyms.index != gym_name]
+        other_fights = other_gyms['wins'] + other_gyms['losses']
+        other_gyms_win_ratios = list((other_gyms['wins'] / other_fights)[other_fights > 0])
+        other_gyms_boxer_counts = list(other_gyms['boxers'])
         
         avg_other_win_ratio = sum(other_gyms_win_ratios) / len(other_gyms_win_ratios) if other_gyms_win_ratios else 0
         avg_other_boxers = sum(other_gyms_boxer_counts) / len(other_gyms_boxer_counts) if other_gyms_boxer_counts else 0
@@ -132,7 +166,7 @@ class ImprovementAdvisor:
         if self.data.empty:
             return []
         
-        boxer_data = self.data[self.data['Boxer_Name'] == boxer_name]
+        boxer_data = self._get_boxer_rows(boxer_name)
         if location and location != "All Locations":
             boxer_data = boxer_data[boxer_data['Location'] == location]
         
@@ -153,16 +187,10 @@ class ImprovementAdvisor:
         weight_class = boxer_data['Weight_Class'].iloc[0] if not boxer_data.empty else 'Unknown'
         
         # Compare with other boxers in same gym
-        gym_data = self.data[self.data['Gym'] == gym_name]
-        gym_boxers_win_ratios = []
-        for other_boxer in gym_data['Boxer_Name'].unique():
-            if other_boxer != boxer_name:
-                other_boxer_data = gym_data[gym_data['Boxer_Name'] == other_boxer]
-                other_wins = other_boxer_data['Wins'].sum()
-                other_losses = other_boxer_data['Losses'].sum()
-                other_fights = other_wins + other_losses
-                if other_fights > 0:
-                    gym_boxers_win_ratios.append(other_wins / other_fights)
+        gym_boxers = self._get_gym_boxer_rollup().loc[gym_name]
+        gym_boxers = gym_boxers[gym_boxers.index != boxer_name]
+        other_fights = gym_boxers['wins'] + gym_boxers['losses']
+        gym_boxers_win_ratios = list((gym_boxers['wins'] / other_fights)[other_fights > 0])
         
         avg_gym_win_ratio = sum(gym_boxers_win_ratios) / len(gym_boxers_win_ratios) if gym_boxers_win_ratios else 0
         
@@ -170,7 +198,7 @@ class ImprovementAdvisor:
         year_progression = boxer_data.groupby('Year').apply(
             lambda x: x['Wins'].sum() / (x['Wins'].sum() + x['Losses'].sum() + 1e-8)
         )
-        years = sorted(boxer_data['Year'].unique())
+        years = sorted(boxer_data['Year'].dropna().unique())
         improving = False
         if len(years) >= 2:
             recent_ratio = year_progression[years[-1]] if years[-1] in year_progression.index else 0
@@ -232,6 +260,48 @@ class ImprovementAdvisor:
         # Ensure exactly 5 suggestions
         return suggestions[:5]
     
+    def get_bulk_suggestions(self, items):
+        """Get suggestions for many gyms/boxers, sharing one set of rollups"""
+        results = []
+        for item in items:
+            entity_type = item.get('type', 'gym')
+            entity_name = item.get('name')
+            location = item.get('location')
+            
+            if entity_type == 'gym':
+                suggestions = self.get_gym_suggestions(entity_name, location)
+            elif entity_type == 'boxer':
+                suggestions = self.get_boxer_suggestions(entity_name, location)
+            else:
+                results.append({
+                    'type': entity_type,
+                    'name': entity_name,
+                    'location': location,
+                    'error': 'Invalid entity type'
+                })
+                continue
+            
+            results.append({
+                'type': entity_type,
+                'name': entity_name,
+                'location': location,
+                'suggestions': suggestions
+            })
+        
+        return results
+    
+    def get_location_gym_suggestions(self, location):
+        """Get suggestions for every gym in a location"""
+        if self.data.empty:
+            return []
+        
+        gym_rollup = self._get_gym_rollup()
+        if location not in gym_rollup.index.get_level_values('Location'):
+            return []
+        
+        items = [{'type': 'gym', 'name': gym, 'location': location} for gym in gym_rollup.loc[location].index]
+        return self.get_bulk_suggestions(items)
+    
     def get_comprehensive_analysis(self, location, gender="Both"):
         """Get comprehensive analysis and recommendations for all gyms in a location"""
         if self.data.empty:
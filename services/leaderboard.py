@@ -0,0 +1,126 @@
+# services/leaderboard.py
+from itertools import combinations
+import pandas as pd
+
+class Leaderboard:
+    """Percentile rankings of boxers and gyms within every (gender, weight class, location, year) scope"""
+    
+    SCOPE_COLUMNS = ['Gender', 'Weight_Class', 'Location', 'Year']
+    ALL_VALUES = {
+        'Gender': "Both",
+        'Weight_Class': "All",
+        'Location': "All Locations",
+        'Year': "All Years"
+    }
+    ENTITIES = {
+        'boxer': {'keys': ['Boxer_Name'], 'attributes': ['Gym', 'Location']},
+        'gym': {'keys': ['Location', 'Gym'], 'attributes': []}
+    }
+    
+    def __init__(self, data):
+        self.data = data
+        self._tables = {}
+        self._offsets = {}
+        for entity in self.ENTITIES:
+            self._build(entity)
+    
+    def _build(self, entity):
+        """Rank every entity within every scope, including the 'All' rollups of each dimension"""
+        if self.data.empty:
+            self._tables[entity] = pd.DataFrame()
+            self._offsets[entity] = {}
+            return
+        
+        entity_keys = self.ENTITIES[entity]['keys']
+        attributes = self.ENTITIES[entity]['attributes']
+        
+        frames = []
+        for size in range(len(self.SCOPE_COLUMNS) + 1):
+            for dims in combinations(self.SCOPE_COLUMNS, size):
+                keys = list(dims) + [key for key in entity_keys if key not in dims]
+                aggregations = {
+                    'wins': ('Wins', 'sum'),
+                    'losses': ('Losses', 'sum')
+                }
+                for attribute in attributes:
+                    if attribute not in keys:
+                        aggregations[attribute] = (attribute, 'first')
+                
+                grouped = self.data.groupby(keys, sort=False).agg(**aggregations).reset_index()
+                grouped['scope_key'] = self._scope_key({
+                    column: grouped[column].astype(str) if column in dims else self.ALL_VALUES[column]
+                    for column in self.SCOPE_COLUMNS
+                })
+                frames.append(grouped[entity_keys + attributes + ['scope_key', 'wins', 'losses']])
+        
+        table = pd.concat(frames, ignore_index=True)
+        table['total_fights'] = table['wins'] + table['losses']
+        table['win_ratio'] = (table['wins'] / table['total_fights'].where(table['total_fights'] > 0)).fillna(0)
+        table['percentile'] = table.groupby('scope_key')['win_ratio'].rank(pct=True, method='max')
+        
+        name_column = entity_keys[-1]
+        table = table.sort_values(
+            ['scope_key', 'win_ratio', 'wins', name_column],
+            ascending=[True, False, False, True]
+        ).reset_index(drop=True)
+        table['rank'] = table.groupby('scope_key').cumcount() + 1
+        
+        # Each scope is a contiguous slice of the sorted table, so any page is a positional slice
+        self._tables[entity] = table
+        self._offsets[entity] = {
+            key: (positions[0], positions[-1] + 1)
+            for key, positions in table.groupby('scope_key', sort=False).indices.items()
+        }
+    
+    @classmethod
+    def _scope_key(cls, values):
+        key = None
+        for column in cls.SCOPE_COLUMNS:
+            key = values[column] if key is None else key + '|' + values[column]
+        return key
+    
+    def get_page(self, entity="gym", gender="Both", weight_class="All",
+                 location="All Locations", year="All Years", page=1, per_page=20):
+        """Get one page of the leaderboard for a scope"""
+        if entity not in self.ENTITIES:
+            raise ValueError(f"Unknown leaderboard entity: {entity}")
+        
+        scope = {
+            'Gender': str(gender),
+            'Weight_Class': str(weight_class),
+            'Location': str(location),
+            'Year': str(year)
+        }
+        page = max(1, int(page))
+        per_page = max(1, int(per_page))
+        
+        start, stop = self._offsets[entity].get(self._scope_key(scope), (0, 0))
+        total = stop - start
+        page_start = start + (page - 1) * per_page
+        page_stop = min(stop, page_start + per_page)
+        
+        items = []
+        if page_start < page_stop:
+            rows = self._tables[entity].iloc[page_start:page_stop]
+            for row in rows.itertuples(index=False):
+                items.append({
+                    'rank': row.rank,
+                    'name': row.Boxer_Name if entity == 'boxer' else row.Gym,
+                    'gym': row.Gym,
+                    'location': row.Location,
+                    'wins': row.wins,
+                    'losses': row.losses,
+                    'total_fights': row.total_fights,
+                    'win_ratio': row.win_ratio,
+                    'percentile': row.percentile
+                })
+        
+        return {
+            'entity': entity,
+            'scope': scope,
+            'page': page,
+            'per_page': per_page,
+            'total': total,
+            'total_pages': (total + per_page - 1) // per_page,
+            'items': items
+        }
@@ -0,0 +1,120 @@
+# services/metrics.py
+import bisect
+import threading
+import time
+from contextlib import nullcontext
+from contextvars import ContextVar
+
+# (metrics, route) of the request running in this context; None when not instrumented
+_active = ContextVar('metrics_active', default=None)
+_NULL_SPAN = nullcontext()
+
+def span(stage):
+    """Time `stage` of the current request; a shared no-op when metrics are off or outside a request"""
+    active = _active.get()
+    if active is None:
+        return _NULL_SPAN
+    return _Span(active[0], active[1], stage)
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+class _Span:
+    __slots__ = ('metrics', 'route', 'stage', 'start')
+    
+    def __init__(self, metrics, route, stage):
+        self.metrics = metrics
+        self.route = route
+        self.stage = stage
+    
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.metrics.observe('stage_duration_seconds', (('route', self.route), ('stage', self.stage)),
+                             time.perf_counter() - self.start)
+        return False
+
+class Metrics:
+    """Per-route stage latency histograms and counters, rendered in the Prometheus text format"""
+    
+    PREFIX = 'boxing_'
+    BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+    HELP = {
+        'stage_duration_seconds': ('histogram', 'Time spent in one stage of a route'),
+        'request_duration_seconds': ('histogram', 'Time from the start of a request to its teardown')
+    }
+    
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._histograms = {}
+        self._collectors = []
+    
+    def bind(self, route):
+        """Make span() record under `route` in this context; returns the token for unbind()"""
+        return _active.set((self, route))
+    
+    def unbind(self, token):
+        _active.reset(token)
+    
+    def observe(self, name, labels, seconds):
+        index = bisect.bisect_left(self.BUCKETS, seconds)
+        with self._lock:
+            histogram = self._histograms.get((name, labels))
+            if histogram is None:
+                # One count per bucket plus +Inf, then the sum
+                histogram = self._histograms[(name, labels)] = [0] * (len(self.BUCKETS) + 1) + [0.0]
+            histogram[index] += 1
+            histogram[-1] += seconds
+    
+    def add_collector(self, name, kind, help_text, collect):
+        """`collect()` returns [(labels, value)] at scrape time, for stats a component already keeps"""
+        self._collectors.append((name, kind, help_text, collect))
+    
+    def render(self):
+        """All metrics in the Prometheus text exposition format"""
+        with self._lock:
+            histograms = sorted((key, list(values)) for key, values in self._histograms.items())
+        
+        lines = []
+        described = set()
+        for (name, labels), values in histograms:
+            if name not in described:
+                kind, help_text = self.HELP[name]
+                lines += self._header(name, kind, help_text)
+                described.add(name)
+            cumulative = 0
+            for bound, count in zip(self.BUCKETS + (float('inf'),), values[:-1]):
+                cumulative += count
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                lines.append(f"{self.PREFIX}{name}_bucket{self._labels(labels + (('le', le),))} {cumulative}")
+            lines.append(f"{self.PREFIX}{name}_sum{self._labels(labels)} {values[-1]!r}")
+            lines.append(f"{self.PREFIX}{name}_count{self._labels(labels)} {cumulative}")
+        
+        for name, kind, help_text, collect in self._collectors:
+            try:
+                samples = collect()
+            except Exception as e:
+                print(f"Error collecting metric '{name}': {e}")
+                continue
+            lines += self._header(name, kind, help_text)
+            for labels, value in samples:
+                lines.append(f"{self.PREFIX}{name}{self._labels(tuple(labels.items()))} {value}")
+        
+        return "\n".join(lines) + "\n"
+    
+    def _header(self, name, kind, help_text):
+        return [f"# HELP {self.PREFIX}{name} {help_text}", f"# TYPE {self.PREFIX}{name} {kind}"]
+    
+    @staticmethod
+    def _labels(labels):
+        if not labels:
+            return ''
+        return '{' + ','.join(f'{key}="{_escape(value)}"' for key, value in labels) + '}'
+    
+    def after_fork(self):
+        # Each worker reports its own requests; the master's samples are not the worker's
+        self._lock = threading.Lock()
+        self._histograms = {}
@@ -0,0 +1,108 @@
+# services/report_cache.py
+import threading
+from collections import OrderedDict
+from concurrent.futures import CancelledError, ThreadPoolExecutor, wait
+from config import Config
+from services.improvement_advisor import ImprovementAdvisor
+
+class AnalysisReportCache:
+    """Location analysis reports precomputed per data version in a background thread pool"""
+
+    # Older versions whose reports are kept for requests still pinned to them, besides the current one
+    PREVIOUS_VERSIONS = 2
+
+    def __init__(self, data_loader):
+        self.data_loader = data_loader
+        self._executor = ThreadPoolExecutor(
+            max_workers=Config.REPORT_CACHE_WORKERS, thread_name_prefix="report-cache"
+        )
+        self._lock = threading.Lock()
+        self._closed = False
+        # version -> (advisor, locations, {location: future}), least recently used first
+        self._versions = OrderedDict()
+
+        # Every published snapshot, so ingests warm their version as well as reloads do
+        self.data_loader.add_publish_listener(self.warm)
+        self.warm()
+
+    def warm(self):
+        """Schedule a report for every location of the current data version"""
+        snapshot = self.data_loader.get_snapshot()
+        advisor, locations = self._version_entry(snapshot)
+        if advisor is None:
+            return
+
+        for location in locations:
+            self._get_future(snapshot.version, advisor, location)
+
+    def get(self, location, gender="Both", snapshot=None):
+        """Return the analysis, computing on demand if the report is not ready"""
+        snapshot = snapshot or self.data_loader.get_snapshot()
+        advisor, locations = self._version_entry(snapshot)
+        if advisor is None:
+            return {}
+
+        # The analysis covers every gender, so one report per location serves all of them
+        future = self._get_future(snapshot.version, advisor, location) if location in locations else None
+        if future is not None:
+            try:
+                return future.result()
+            except CancelledError:
+                # Cancelled by close() or eviction; the requesting thread computes it itself
+                pass
+        return advisor.get_comprehensive_analysis(location, gender)
+
+    def wait(self, timeout=None):
+        """Block until every report scheduled so far has finished"""
+        with self._lock:
+            futures = [future for _, _, reports in self._versions.values() for future in reports.values()]
+        wait(futures, timeout)
+    
+    def after_fork(self):
+        """Fresh lock and thread pool in a forked worker, keeping the reports the parent finished"""
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=Config.REPORT_CACHE_WORKERS, thread_name_prefix="report-cache"
+        )
+        # Reports still running in the parent never complete here
+        for _, _, reports in self._versions.values():
+            for location in [location for location, future in reports.items() if not future.done()]:
+                del reports[location]
+        self.warm()
+    
+    def close(self):
+        """Stop the thread pool; later reports are computed inline by the requesting thread"""
+        with self._lock:
+            self._closed = True
+        self._executor.shutdown(wait=False, cancel_futures=True)
+    
+    def _version_entry(self, snapshot):
+        """(advisor, locations) of the snapshot's version, keeping a bounded number of older versions"""
+        if snapshot.df.empty:
+            return None, []
+        current = self.data_loader.get_snapshot().version
+        with self._lock:
+            entry = self._versions.get(snapshot.version)
+            if entry is None:
+                entry = (ImprovementAdvisor(snapshot.df, snapshot.gym_rollup), snapshot.locations, {})
+                self._versions[snapshot.version] = entry
+            self._versions.move_to_end(snapshot.version)
+
+            # A request pinned to an old snapshot only ever evicts other old versions
+            older = [version for version in self._versions if version not in (current, snapshot.version)]
+            for version in older[:max(0, len(self._versions) - self.PREVIOUS_VERSIONS - 1)]:
+                for future in self._versions.pop(version)[2].values():
+                    future.cancel()
+            return entry[0], entry[1]
+
+    def _get_future(self, version, advisor, location):
+        with self._lock:
+            entry = self._versions.get(version)
+            reports = entry[2] if entry is not None else {}
+            future = reports.get(location)
+            if future is None and self._closed:
+                return None
+            if future is None:
+                future = self._executor.submit(advisor.get_comprehensive_analysis, location)
+                reports[location] = future
+            return future
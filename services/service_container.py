@@ -0,0 +1,75 @@
+# services/service_container.py
+import threading
+from models.gym_recommender import GymRecommender
+from models.match_maker import MatchMaker
+from models.tournament_simulator import TournamentSimulator
+from models.career_predictor import CareerPredictor
+from models.anomaly_detector import AnomalyDetector
+from models.ml_gym_recommender import MLGymRecommender
+from services.data_filter import DataFilter
+from services.chart_generator import ChartGenerator
+from services.improvement_advisor import ImprovementAdvisor
+from services.leaderboard import Leaderboard
+from services.metrics import span
+
+class ServiceContainer:
+    """One instance of each service per dataset version, built on first use and shared by every request"""
+    
+    def __init__(self):
+        self._factories = {}
+    
+    @classmethod
+    def with_defaults(cls):
+        container = cls()
+        container.register('data_filter', lambda snapshot, dataset: DataFilter(snapshot.df, snapshot.get_store()))
+        container.register('gym_recommender', lambda snapshot, dataset: GymRecommender(snapshot.df, snapshot.get_store()))
+        container.register('improvement_advisor', lambda snapshot, dataset: ImprovementAdvisor(snapshot.df, snapshot.gym_rollup))
+        container.register('chart_generator', lambda snapshot, dataset: ChartGenerator())
+        container.register('match_maker', lambda snapshot, dataset: MatchMaker(snapshot.df))
+        container.register('leaderboard', lambda snapshot, dataset: Leaderboard(snapshot.df))
+        container.register('ml_gym_recommender', lambda snapshot, dataset: MLGymRecommender(snapshot.df))
+        container.register('anomaly_detector', lambda snapshot, dataset: AnomalyDetector(snapshot.df))
+        container.register('career_predictor', lambda snapshot, dataset: CareerPredictor(snapshot.df, dataset.model_registry))
+        container.register('tournament_simulator', lambda snapshot, dataset: TournamentSimulator(snapshot.df))
+        return container
+    
+    def register(self, name, factory):
+        """`factory(snapshot, dataset)` builds the service for one data version; it must only read the snapshot"""
+        self._factories[name] = factory
+    
+    def names(self):
+        return list(self._factories)
+    
+    def prebuild(self, dataset):
+        """Build every registered service for the dataset's current snapshot, so no request pays for it"""
+        snapshot = dataset.loader.get_snapshot()
+        for name in self.names():
+            try:
+                self.get(name, dataset, snapshot)
+            except Exception as e:
+                # The service is built again, and fails visibly, on its first request
+                print(f"Error prebuilding service {name}: {e}")
+    
+    def get(self, name, dataset, snapshot=None):
+        """The `name` service for `snapshot` (default: the dataset's current one), building it once"""
+        snapshot = snapshot or dataset.loader.get_snapshot()
+        with dataset.services_lock:
+            cached = dataset.services.get(name)
+            if cached is not None and cached[0] == snapshot.version:
+                return cached[1]
+            build_lock = dataset.service_build_locks.setdefault(name, threading.Lock())
+        
+        # Build outside the shared lock so a slow service (model training) does not hold up the others
+        with build_lock:
+            with dataset.services_lock:
+                cached = dataset.services.get(name)
+                if cached is not None and cached[0] == snapshot.version:
+                    return cached[1]
+            
+            with span(f'build.{name}'):
+                service = self._factories[name](snapshot, dataset)
+            with dataset.services_lock:
+                # A request pinned to an older snapshot gets its own instance without replacing the current one
+                if snapshot is dataset.loader.get_snapshot():
+                    dataset.services[name] = (snapshot.version, service)
+            return service
@@ -0,0 +1,62 @@
+# services/single_flight.py
+import threading
+from concurrent.futures import Future
+
+class SingleFlight:
+    """Run one computation per key at a time; concurrent callers with the same key wait for it and share its result"""
+    
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._in_flight = {}
+        self._counts = {}
+    
+    def do(self, name, key, compute):
+        """Result of compute() for (name, key), joining a computation already in progress when there is one"""
+        if not self.enabled:
+            with self._lock:
+                self._count(name, 'executed')
+            return compute()
+        
+        flight_key = (name, key)
+        with self._lock:
+            future = self._in_flight.get(flight_key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._in_flight[flight_key] = future
+            self._count(name, 'executed' if leader else 'coalesced')
+        
+        if not leader:
+            # Raises the leader's exception, so waiters fail the same way it did
+            return future.result()
+        
+        try:
+            result = compute()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            # Later callers start a fresh computation; results are not cached beyond the flight
+            with self._lock:
+                del self._in_flight[flight_key]
+    
+    def _count(self, name, outcome):
+        counts = self._counts.setdefault(name, {'executed': 0, 'coalesced': 0})
+        counts[outcome] += 1
+    
+    def stats(self):
+        """Per computation name: how many calls ran it and how many shared another call's result"""
+        with self._lock:
+            return {
+                name: dict(counts, in_flight=sum(1 for key in self._in_flight if key[0] == name))
+                for name, counts in self._counts.items()
+            }
+    
+    def after_fork(self):
+        # Flights of the parent's other threads never finish in a forked worker
+        self._lock = threading.Lock()
+        self._in_flight = {}
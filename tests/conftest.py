@@ -0,0 +1,45 @@
+# tests/conftest.py
+import os
+import shutil
+import sys
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+
+SOURCE_CSV = os.path.join(Config.BASE_DIR, "data", "enhanced_boxing_data.csv")
+
+@pytest.fixture
+def data_path(tmp_path, monkeypatch):
+    """A copy of the bundled CSV, with every log, cache and model directory moved under tmp_path"""
+    path = tmp_path / "boxing.csv"
+    shutil.copyfile(SOURCE_CSV, path)
+    monkeypatch.setattr(Config, 'DATA_PATH', str(path))
+    monkeypatch.setattr(Config, 'RESULTS_LOG_PATH', str(tmp_path / "results_log.jsonl"))
+    monkeypatch.setattr(Config, 'BOUTS_DIR', str(tmp_path / "bouts"))
+    monkeypatch.setattr(Config, 'SQLITE_DIR', str(tmp_path / "sqlite"))
+    monkeypatch.setattr(Config, 'MODEL_DIR', str(tmp_path / "models"))
+    monkeypatch.setattr(Config, 'SHARED_DATA_DIR', str(tmp_path / "shared"))
+    monkeypatch.setattr(Config, 'PROFILE_DIR', str(tmp_path / "profiles"))
+    monkeypatch.setattr(Config, 'DATA_WATCH_ENABLED', False)
+    return str(path)
+
+@pytest.fixture
+def loader(data_path):
+    from models.data_loader import EnhancedDataLoader
+    return EnhancedDataLoader()
+
+@pytest.fixture
+def app(data_path):
+    from app import create_app
+    app = create_app()
+    app.config['TESTING'] = True
+    yield app
+    datasets = app.extensions['datasets']
+    for name in datasets.loaded_names():
+        datasets.peek(name).close()
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
@@ -0,0 +1,42 @@
+# tests/test_blank_cells.py
+import pandas as pd
+import pytest
+
+@pytest.fixture
+def data_path(data_path):
+    """The bundled CSV with blank Wins, Losses and Year cells, plus a boxer whose only row has no Year"""
+    df = pd.read_csv(data_path)
+    df.loc[0, 'Losses'] = None
+    df.loc[3, 'Wins'] = None
+    df.loc[5, 'Year'] = None
+    solo = pd.DataFrame([['Boudha', 'Boxmandu', 'Solo Boxer', 'Male', 21, 'Lightweight', 3, 1, None]], columns=df.columns)
+    pd.concat([df, solo], ignore_index=True).to_csv(data_path, index=False)
+    return data_path
+
+def test_blank_integers_load_as_nullable_integers(loader):
+    df = loader.get_snapshot().df
+    
+    assert str(df['Year'].dtype) == 'Int16'
+    assert str(df['Wins'].dtype) == 'Int16'
+    assert df['Year'].isna().sum() == 2
+    # As with the original float columns, a blank count leaves the row's totals blank
+    assert pd.isna(df.loc[0, 'Total_Fights'])
+    assert pd.isna(df.loc[0, 'Win_Ratio'])
+
+def test_filters_and_leaderboard_skip_blank_years(loader, client):
+    years = loader.get_snapshot().get_available_filters()['years']
+    assert all(isinstance(year, int) for year in years[1:])
+    
+    response = client.get('/api/leaderboard?entity=boxer&year=2023&per_page=5')
+    assert response.status_code == 200
+    assert response.get_json()['items']
+
+def test_results_for_a_boxer_without_a_year(loader):
+    snapshot, _ = loader.apply_results({'Boxer_Name': 'Solo Boxer', 'Year': 2024, 'Wins': 2})
+    
+    added = snapshot.df[(snapshot.df['Boxer_Name'] == 'Solo Boxer') & (snapshot.df['Year'] == 2024)]
+    assert added[['Gym', 'Age', 'Wins']].values.tolist() == [['Boxmandu', 21, 2]]
+
+def test_dashboard_and_analysis_render(client):
+    assert client.get('/').status_code == 200
+    assert client.post('/get_improvement_analysis', json={'location': 'Boudha'}).status_code == 200
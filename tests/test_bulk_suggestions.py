@@ -0,0 +1,30 @@
+# tests/test_bulk_suggestions.py
+import pytest
+
+@pytest.mark.parametrize('body', [
+    [],
+    'Boudha',
+    {},
+    {'items': 'Boxmandu'},
+    {'items': ['Boxmandu']},
+    {'items': [{'type': 'gym'}]},
+    {'items': [{'type': 'gym', 'name': 7}]},
+    {'location': ['Boudha']},
+])
+def test_malformed_requests_are_rejected(client, body):
+    response = client.post('/get_bulk_suggestions', json=body)
+    
+    assert response.status_code == 400
+    assert 'error' in response.get_json()
+
+def test_items_and_location_are_answered(client):
+    by_items = client.post('/get_bulk_suggestions', json={'items': [
+        {'type': 'gym', 'name': 'Boxmandu', 'location': 'Boudha'},
+        {'type': 'boxer', 'name': 'Aarav Shrestha'}
+    ]})
+    by_location = client.post('/get_bulk_suggestions', json={'location': 'Boudha'})
+    
+    assert by_items.status_code == 200
+    assert len(by_items.get_json()['results']) == 2
+    assert by_location.status_code == 200
+    assert by_location.get_json()['results']
@@ -0,0 +1,127 @@
+# tests/test_ingest.py
+import pandas as pd
+import pytest
+from models.data_loader import CSV_COLUMNS, DataSnapshot, EnhancedDataLoader
+
+def rebuilt(loader, snapshot):
+    """The snapshot's raw columns preprocessed from scratch, as a full reload of them would"""
+    df = snapshot.df[CSV_COLUMNS].copy()
+    loader._preprocess_data(df)
+    return df
+
+def assert_matches_rebuild(loader, snapshot):
+    pd.testing.assert_frame_equal(snapshot.df, rebuilt(loader, snapshot))
+    # A fresh rollup keeps int16 sums while they fit; the incremental one is always int64
+    pd.testing.assert_frame_equal(snapshot.gym_rollup, DataSnapshot(snapshot.df).gym_rollup, check_dtype=False)
+
+def row(snapshot, name, year):
+    rows = snapshot.df[(snapshot.df['Boxer_Name'] == name) & (snapshot.df['Year'] == year)]
+    assert len(rows) == 1
+    return rows.iloc[0]
+
+def test_result_for_existing_boxer_year_adds_to_its_row(loader):
+    before = loader.get_snapshot()
+    boxer = before.df.iloc[0]
+    
+    after, applied = loader.apply_results({
+        'Boxer_Name': boxer['Boxer_Name'], 'Year': int(boxer['Year']), 'Wins': 2, 'Losses': 1
+    })
+    
+    assert applied == 1
+    assert len(after.df) == len(before.df)
+    updated = row(after, boxer['Boxer_Name'], boxer['Year'])
+    assert updated['Wins'] == boxer['Wins'] + 2
+    assert updated['Losses'] == boxer['Losses'] + 1
+    assert updated['Total_Fights'] == boxer['Total_Fights'] + 3
+    assert_matches_rebuild(loader, after)
+    # The published snapshot is new; the one requests may still hold is untouched
+    assert after.version != before.version
+    assert row(before, boxer['Boxer_Name'], boxer['Year'])['Wins'] == boxer['Wins']
+
+def test_new_boxers_and_years_are_appended(loader):
+    before = loader.get_snapshot()
+    boxer = before.df.iloc[0]
+    
+    after, applied = loader.apply_results([
+        {'Boxer_Name': boxer['Boxer_Name'], 'Year': 2030, 'Wins': 1},
+        {'Boxer_Name': 'New Kid', 'Year': 2030, 'Losses': 2, 'Location': 'Nowhere', 'Gym': 'Fresh Gym',
+         'Gender': 'Female', 'Age': 19, 'Weight_Class': 'Flyweight'}
+    ])
+    
+    assert applied == 2
+    assert len(after.df) == len(before.df) + 2
+    # The new year of a known boxer takes the profile of their latest row
+    new_year = row(after, boxer['Boxer_Name'], 2030)
+    assert (new_year['Gym'], new_year['Wins'], new_year['Losses']) == (boxer['Gym'], 1, 0)
+    assert row(after, 'New Kid', 2030)['Gym'] == 'Fresh Gym'
+    assert 'Nowhere' in after.locations
+    assert after.gym_rollup.loc[('Nowhere', 'Fresh Gym'), 'losses'] == 2
+    assert_matches_rebuild(loader, after)
+
+def test_results_for_one_boxer_year_in_a_batch_are_summed(loader):
+    boxer = loader.get_snapshot().df.iloc[0]
+    result = {'Boxer_Name': boxer['Boxer_Name'], 'Year': int(boxer['Year']), 'Wins': 1}
+    
+    after, _ = loader.apply_results([result, result, result])
+    
+    assert row(after, boxer['Boxer_Name'], boxer['Year'])['Wins'] == boxer['Wins'] + 3
+    assert_matches_rebuild(loader, after)
+
+def test_new_maximum_rescales_every_performance_score(loader):
+    boxer = loader.get_snapshot().df.iloc[0]
+    
+    after, _ = loader.apply_results({'Boxer_Name': boxer['Boxer_Name'], 'Year': 2030, 'Wins': 1000})
+    
+    assert after.max_wins == 1000
+    assert_matches_rebuild(loader, after)
+
+@pytest.mark.parametrize('records', [
+    [],
+    {'Year': 2030, 'Wins': 1},
+    {'Boxer_Name': 'Aarav Shrestha', 'Year': 2030, 'Wins': -1},
+    {'Boxer_Name': 'Aarav Shrestha', 'Year': 2030},
+    {'Boxer_Name': 'Nobody Known', 'Year': 2030, 'Wins': 1},
+])
+def test_invalid_results_are_rejected_without_logging(loader, records):
+    before = loader.get_snapshot()
+    
+    with pytest.raises(ValueError):
+        loader.apply_results(records)
+    
+    assert loader.get_snapshot() is before
+    assert not loader.has_unapplied_records()
+    assert loader.results_log.size() == before.log_position[0]
+
+def test_logged_results_are_replayed_by_a_new_loader(loader):
+    boxer = loader.get_snapshot().df.iloc[0]
+    loader.apply_results({'Boxer_Name': boxer['Boxer_Name'], 'Year': int(boxer['Year']), 'Wins': 4})
+    loader.apply_results({'Boxer_Name': boxer['Boxer_Name'], 'Year': 2030, 'Losses': 1})
+    snapshot = loader.get_snapshot()
+    
+    restarted = EnhancedDataLoader().get_snapshot()
+    
+    assert restarted.version == snapshot.version
+    pd.testing.assert_frame_equal(restarted.df, snapshot.df)
+
+def test_another_loader_catches_up_on_the_shared_log(data_path):
+    first, second = EnhancedDataLoader(), EnhancedDataLoader()
+    boxer = first.get_snapshot().df.iloc[0]
+    first.apply_results({'Boxer_Name': boxer['Boxer_Name'], 'Year': int(boxer['Year']), 'Wins': 1})
+    
+    assert second.has_unapplied_records()
+    assert second.catch_up()
+    assert second.get_snapshot().version == first.get_snapshot().version
+    # An ingest through the second loader lands after the first one's results
+    after, _ = second.apply_results({'Boxer_Name': boxer['Boxer_Name'], 'Year': int(boxer['Year']), 'Wins': 1})
+    assert row(after, boxer['Boxer_Name'], boxer['Year'])['Wins'] == boxer['Wins'] + 2
+
+def test_ingest_route(client):
+    response = client.post('/api/results', json={'results': [
+        {'Boxer_Name': 'Aarav Shrestha', 'Year': 2023, 'Wins': 1}
+    ]})
+    assert response.status_code == 200
+    assert response.get_json()['applied'] == 1
+    
+    response = client.post('/api/results', json={'Boxer_Name': 'Aarav Shrestha', 'Year': 2023, 'Wins': 'many'})
+    assert response.status_code == 400
+    assert 'error' in response.get_json()
@@ -0,0 +1,73 @@
+# tests/test_report_cache.py
+import threading
+import pytest
+from services.improvement_advisor import ImprovementAdvisor
+from services.report_cache import AnalysisReportCache
+
+@pytest.fixture
+def computed(monkeypatch):
+    """(version rows, location) of every report computed, in order"""
+    calls = []
+    lock = threading.Lock()
+    analyse = ImprovementAdvisor.get_comprehensive_analysis
+    
+    def counting(advisor, location, gender="Both"):
+        with lock:
+            calls.append((len(advisor.data), location))
+        return analyse(advisor, location, gender)
+    
+    monkeypatch.setattr(ImprovementAdvisor, 'get_comprehensive_analysis', counting)
+    return calls
+
+@pytest.fixture
+def report_cache(loader, computed):
+    cache = AnalysisReportCache(loader)
+    cache.wait()
+    yield cache
+    cache.close()
+
+def test_every_location_is_warmed_once(loader, report_cache, computed):
+    locations = loader.get_snapshot().locations
+    
+    assert sorted(location for _, location in computed) == sorted(locations)
+    assert report_cache.get(locations[0]) is report_cache.get(locations[0])
+    assert len(computed) == len(locations)
+
+def test_one_report_serves_every_gender(loader, report_cache, computed):
+    location = loader.get_snapshot().locations[0]
+    
+    assert report_cache.get(location, 'Male') is report_cache.get(location, 'Both')
+    assert len(computed) == len(loader.get_snapshot().locations)
+
+def test_ingest_warms_the_new_version(loader, report_cache, computed):
+    before = loader.get_snapshot()
+    boxer = before.df.iloc[0]
+    old_report = report_cache.get(before.locations[0], snapshot=before)
+    
+    after, _ = loader.apply_results({'Boxer_Name': boxer['Boxer_Name'], 'Year': 2030, 'Wins': 1})
+    report_cache.wait()
+    
+    new_reports = [location for rows, location in computed if rows == len(after.df)]
+    assert sorted(new_reports) == sorted(after.locations)
+    assert report_cache.get(after.locations[0]) is not old_report
+    # A request still pinned to the old snapshot gets that version's report
+    assert report_cache.get(before.locations[0], snapshot=before) is old_report
+
+def test_older_versions_are_bounded(loader, report_cache):
+    boxer = loader.get_snapshot().df.iloc[0]
+    for year in range(2030, 2035):
+        loader.apply_results({'Boxer_Name': boxer['Boxer_Name'], 'Year': year, 'Wins': 1})
+    report_cache.wait()
+    
+    assert len(report_cache._versions) == AnalysisReportCache.PREVIOUS_VERSIONS + 1
+    assert loader.get_snapshot().version in report_cache._versions
+
+def test_closed_cache_computes_inline(loader, report_cache, computed):
+    report_cache.close()
+    boxer = loader.get_snapshot().df.iloc[0]
+    snapshot, _ = loader.apply_results({'Boxer_Name': boxer['Boxer_Name'], 'Year': 2030, 'Wins': 1})
+    
+    report = report_cache.get(snapshot.locations[0])
+    
+    assert 'error' not in report
+    assert computed[-1] == (len(snapshot.df), snapshot.locations[0])
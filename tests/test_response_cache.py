@@ -0,0 +1,80 @@
+# tests/test_response_cache.py
+from flask import Response
+from routes.response_cache import ResponseCache
+
+RECOMMENDATIONS = {'location': 'Boudha', 'gender': 'Both'}
+
+def test_get_is_tagged_and_revalidated(client):
+    response = client.get('/export_csv')
+    etag = response.headers['ETag']
+    
+    assert response.status_code == 200
+    assert response.headers['Cache-Control'] == 'no-cache'
+    assert client.get('/export_csv').headers['ETag'] == etag
+    
+    revalidated = client.get('/export_csv', headers={'If-None-Match': etag})
+    assert revalidated.status_code == 304
+    assert revalidated.headers['ETag'] == etag
+    assert revalidated.data == b''
+
+def test_export_filename_is_the_same_for_the_same_data(app, client):
+    version = app.extensions['datasets'].get().loader.get_snapshot().version
+    dispositions = {client.get('/export_csv').headers['Content-Disposition'] for _ in range(2)}
+    
+    assert dispositions == {f'attachment; filename=boxing_data_export_{version}.csv'}
+
+def test_post_is_served_from_the_cache(app, client):
+    first = client.post('/get_recommendations', json=RECOMMENDATIONS)
+    second = client.post('/get_recommendations', json=RECOMMENDATIONS)
+    
+    assert first.status_code == second.status_code == 200
+    assert first.headers['ETag'] == second.headers['ETag']
+    assert first.data == second.data
+    assert app.extensions['response_cache'].stats()['hits'] == 1
+
+def test_matching_if_none_match_fails_a_post(client):
+    etag = client.post('/get_recommendations', json=RECOMMENDATIONS).headers['ETag']
+    
+    response = client.post('/get_recommendations', json=RECOMMENDATIONS, headers={'If-None-Match': etag})
+    
+    assert response.status_code == 412
+    assert 'ETag' not in response.headers
+
+def test_tag_depends_on_parameters_and_data_version(client):
+    etag = client.post('/get_recommendations', json=RECOMMENDATIONS).headers['ETag']
+    other = client.post('/get_recommendations', json=dict(RECOMMENDATIONS, gender='Female')).headers['ETag']
+    assert other != etag
+    
+    client.post('/api/results', json={'Boxer_Name': 'Aarav Shrestha', 'Year': 2023, 'Wins': 1})
+    
+    # The ingest published a new version, so the old tag no longer validates
+    response = client.post('/get_recommendations', json=RECOMMENDATIONS, headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+
+def test_errors_are_not_tagged(client):
+    response = client.get('/export_csv?format=bogus')
+    
+    assert response.status_code == 400
+    assert 'ETag' not in response.headers
+
+def test_cache_evicts_least_recently_used_within_its_budget():
+    cache = ResponseCache(max_bytes=10)
+    cache.put('a', Response(b'aaaa'))
+    cache.put('b', Response(b'bbbb'))
+    assert cache.get('a').get_data() == b'aaaa'
+    
+    cache.put('c', Response(b'cccc'))
+    
+    assert cache.get('b') is None
+    assert cache.get('a') is not None and cache.get('c') is not None
+    assert cache.stats()['bytes'] == 8
+    assert cache.stats()['evictions'] == 1
+
+def test_cache_skips_errors_streams_and_oversized_bodies():
+    cache = ResponseCache(max_bytes=10)
+    cache.put('error', Response(b'no', status=500))
+    cache.put('large', Response(b'x' * 11))
+    cache.put('stream', Response(iter([b'chunk'])))
+    
+    assert cache.stats()['entries'] == 0
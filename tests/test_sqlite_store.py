@@ -0,0 +1,124 @@
+# tests/test_sqlite_store.py
+import math
+import os
+import shutil
+import pandas as pd
+import pytest
+from config import Config
+from models.data_loader import EnhancedDataLoader
+from models.gym_recommender import GymRecommender
+from models.sqlite_store import SQLiteStore
+from services.data_filter import DataFilter
+
+ALL_ROWS = {'location': 'All Locations', 'year': 'All Years', 'weight': 'All', 'gender': 'Both', 'gym': 'All Gyms'}
+
+@pytest.fixture
+def sqlite_backend(data_path, monkeypatch):
+    monkeypatch.setattr(Config, 'STORAGE_BACKEND', 'sqlite')
+    return data_path
+
+def databases():
+    return sorted(name for name in os.listdir(Config.SQLITE_DIR) if name.endswith('.sqlite3'))
+
+def filter_cases(snapshot):
+    options = snapshot.get_available_filters()
+    boxers = list(snapshot.df['Boxer_Name'][:5]) + ['New Kid']
+    for location in options['locations'][:3]:
+        for year in ['All Years', options['years'][-1]]:
+            for gender in options['genders']:
+                for mode, gyms, selected in [('Gym', [], []), ('Gym', options['gyms'][1:4], []), ('Boxer', [], boxers)]:
+                    yield {
+                        'location': location, 'year': year, 'weight': 'All', 'gender': gender, 'gym': 'All Gyms',
+                        'mode': mode, 'selected_gyms': gyms, 'selected_boxers': selected
+                    }
+
+def assert_backends_agree(snapshot):
+    """Filtering and gym recommendations give the same results from the store as from the frame"""
+    df, store = snapshot.df, snapshot.get_store()
+    for filters in filter_cases(snapshot):
+        pd.testing.assert_frame_equal(
+            DataFilter(df).apply_filters(filters), DataFilter(df, store).apply_filters(filters), check_exact=True
+        )
+        location, gender = filters['location'], filters['gender']
+        assert DataFilter(df).get_available_boxers(filters, None, gender, location) == \
+            DataFilter(df, store).get_available_boxers(filters, None, gender, location)
+    
+    for location in snapshot.locations:
+        expected = GymRecommender(df).recommend_gyms_by_location(location, 'Both', 'All', limit=None)
+        actual = GymRecommender(df, store).recommend_gyms_by_location(location, 'Both', 'All', limit=None)
+        assert len(expected) == len(actual)
+        for expected_gym, actual_gym in zip(expected, actual):
+            for key, value in expected_gym.items():
+                if isinstance(value, float) and math.isnan(value):
+                    assert math.isnan(actual_gym[key])
+                else:
+                    assert actual_gym[key] == value, (location, key)
+
+def test_store_is_only_opened_for_the_sqlite_backend(loader):
+    assert Config.STORAGE_BACKEND == 'pandas'
+    assert loader.get_snapshot().get_store() is None
+
+def test_store_matches_the_frame(sqlite_backend):
+    snapshot = EnhancedDataLoader().get_snapshot()
+    
+    assert snapshot.get_store().filter_rows(ALL_ROWS) is not None
+    assert_backends_agree(snapshot)
+
+def test_ingests_advance_the_store_in_place(sqlite_backend):
+    loader = EnhancedDataLoader()
+    base = loader.get_snapshot()
+    path = base.get_store().path
+    boxer = base.df.iloc[1]
+    
+    ingested, _ = loader.apply_results([
+        {'Boxer_Name': boxer['Boxer_Name'], 'Year': int(boxer['Year']), 'Wins': 2, 'Losses': 1},
+        {'Boxer_Name': 'New Kid', 'Year': 2030, 'Wins': 3, 'Location': base.df['Location'].iloc[0],
+         'Gym': base.df['Gym'].iloc[0], 'Gender': 'Male', 'Age': 20, 'Weight_Class': 'Lightweight'}
+    ])
+    # A new maximum changes every Performance_Score, which the store derives at query time
+    rescaled, _ = loader.apply_results({'Boxer_Name': boxer['Boxer_Name'], 'Year': 2030, 'Wins': 500})
+    
+    for snapshot in [ingested, rescaled]:
+        assert snapshot.get_store().path == path
+        assert_backends_agree(snapshot)
+    assert databases() == [os.path.basename(path)]
+
+def test_store_of_an_older_snapshot_falls_back_to_the_frame(sqlite_backend):
+    loader = EnhancedDataLoader()
+    base = loader.get_snapshot()
+    boxer = base.df.iloc[0]
+    loader.apply_results({'Boxer_Name': boxer['Boxer_Name'], 'Year': int(boxer['Year']), 'Wins': 1})
+    
+    # The file now holds the newer rows, so the old snapshot's store declines to answer
+    assert base.get_store().filter_rows(ALL_ROWS) is None
+    assert base.get_store().gym_stats(base.locations[0]) is None
+    assert_backends_agree(base)
+
+def test_new_loader_reuses_or_rebuilds_the_store(sqlite_backend):
+    loader = EnhancedDataLoader()
+    boxer = loader.get_snapshot().df.iloc[0]
+    snapshot, _ = loader.apply_results({'Boxer_Name': boxer['Boxer_Name'], 'Year': 2030, 'Wins': 1})
+    
+    # Another worker: the file is already at the log position it replays to
+    restarted = EnhancedDataLoader().get_snapshot()
+    assert restarted.log_position == snapshot.log_position
+    assert restarted.get_store().filter_rows(ALL_ROWS) is not None
+    assert_backends_agree(restarted)
+    
+    # No file yet: loaded from the CSV, then advanced by the replayed log
+    shutil.rmtree(Config.SQLITE_DIR)
+    rebuilt = EnhancedDataLoader().get_snapshot()
+    assert rebuilt.get_store().filter_rows(ALL_ROWS) is not None
+    assert_backends_agree(rebuilt)
+
+def test_files_of_old_csv_versions_are_removed(sqlite_backend):
+    paths = []
+    for year in [2031, 2032, 2033]:
+        with open(sqlite_backend, 'a') as csv_file:
+            # The bundled CSV has no trailing newline
+            csv_file.write(f"\nBoudha,Boxmandu,Version {year},Male,20,Lightweight,1,0,{year}")
+        paths.append(EnhancedDataLoader().get_snapshot().get_store().path)
+    
+    # The current version plus the newest previous ones, for snapshots still reading them
+    assert len(set(paths)) == 3
+    assert databases() == sorted(os.path.basename(path) for path in paths[-1 - SQLiteStore.KEEP_PREVIOUS:])
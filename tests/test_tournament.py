@@ -0,0 +1,31 @@
+# tests/test_tournament.py
+import pytest
+
+BOXERS = ['Aarav Shrestha', 'Bikash Chaudhary', 'Samir Thapa', 'Rajan Karki']
+
+@pytest.mark.parametrize('body', [
+    [],
+    {'boxers': 'Aarav Shrestha'},
+    {'boxers': [1, 2]},
+    {'boxers': BOXERS, 'seed': 'abc'},
+    {'boxers': BOXERS, 'seed': 1.5},
+    {'boxers': BOXERS, 'seed': True},
+    {'boxers': BOXERS, 'simulations': 0},
+    {'boxers': BOXERS, 'simulations': 'many'},
+    {'boxers': BOXERS[:1]},
+    {'boxers': BOXERS[:3] + ['Nobody Known']},
+])
+def test_malformed_requests_are_rejected(client, body):
+    response = client.post('/simulate_tournament', json=body)
+    
+    assert response.status_code == 400
+    assert 'error' in response.get_json()
+
+def test_same_seed_gives_the_same_result(client):
+    body = {'boxers': BOXERS, 'simulations': 2000, 'seed': 42}
+    
+    first = client.post('/simulate_tournament', json=body)
+    second = client.post('/simulate_tournament', json=body)
+    
+    assert first.status_code == 200
+    assert first.get_json() == second.get_json()